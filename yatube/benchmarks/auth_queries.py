@@ -0,0 +1,87 @@
+"""SQL и задержка запросов вошедшего пользователя по профилям сессий.
+
+    python -m benchmarks.auth_queries --requests 200
+
+Для каждого хранилища сессий (db, cached_db, signed_cookies) и загрузчика
+пользователя (ModelBackend или users.backends.CachedModelBackend)
+считаются запросы к django_session и auth_user на страницу и p50/p95.
+Первый запрос каждой пары прогревает кэш и в замер не входит.
+"""
+import argparse
+
+from benchmarks.utils import (
+    benchmark_database, measure, seed_dataset, setup_django, summarize,
+    write_report
+)
+
+SESSIONS = ('db', 'cached_db', 'signed_cookies')
+BACKENDS = {
+    'model': 'django.contrib.auth.backends.ModelBackend',
+    'cached': 'users.backends.CachedModelBackend',
+}
+
+
+def count_queries(client, url):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    with CaptureQueriesContext(connection) as queries:
+        client.get(url)
+    tables = {'django_session': 0, 'auth_user': 0}
+    for query in queries:
+        for table in tables:
+            if f'FROM "{table}"' in query['sql']:
+                tables[table] += 1
+    return {'queries': len(queries), **tables}
+
+
+def run(options):
+    from django.core.cache import cache
+    from django.test import Client, override_settings
+    from django.urls import reverse
+    from posts.models import User
+
+    seed_dataset(users=10, posts=1000)
+    user = User.objects.order_by('pk').first()
+    urls = {
+        'new_post_form': reverse('new_post'),
+        'index': reverse('index'),
+        'follow_index': reverse('follow_index'),
+    }
+    report = {}
+    for session in SESSIONS:
+        for loader, backend in BACKENDS.items():
+            with override_settings(
+                SESSION_ENGINE=f'django.contrib.sessions.backends.{session}',
+                AUTHENTICATION_BACKENDS=[backend],
+            ):
+                cache.clear()
+                client = Client()
+                client.force_login(user)
+                for name, url in urls.items():
+                    client.get(url)
+                    report[f'{session}/{loader}/{name}'] = {
+                        **count_queries(client, url),
+                        **summarize(measure(
+                            lambda: client.get(url), repeat=options.requests
+                        )),
+                    }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--output')
+    options = parser.parse_args()
+    setup_django()
+    with benchmark_database():
+        report = run(options)
+    write_report(report, options.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""Публикация N постов: по одному через new_post против /api/posts/batch/.
+
+    python -m benchmarks.batch_posts --posts 2000 --batch-size 100 500
+
+У автора --followers подписчиков, так что в замер входят и счётчики,
+и раскладка по лентам. Результат — постов в секунду для каждого пути.
+"""
+import argparse
+import json
+import time
+
+from benchmarks.utils import (
+    benchmark_database, seed_dataset, setup_django, write_report
+)
+
+
+def single(client, texts):
+    from django.urls import reverse
+
+    url = reverse('new_post')
+    for text in texts:
+        response = client.post(url, {'text': text})
+        if response.status_code != 302:
+            raise RuntimeError(f'new_post: {response.status_code}')
+
+
+def batched(client, texts, size):
+    from django.urls import reverse
+
+    url = reverse('api_post_batch')
+    for start in range(0, len(texts), size):
+        body = json.dumps({
+            'posts': [{'text': text} for text in texts[start:start + size]]
+        })
+        response = client.post(url, body, content_type='application/json')
+        if response.status_code != 201:
+            raise RuntimeError(f'batch: {response.status_code}')
+
+
+def timed(func, count):
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    return {
+        'seconds': round(elapsed, 3),
+        'posts_per_s': round(count / elapsed, 1),
+    }
+
+
+def run(options):
+    from django.test import Client
+    from posts.models import User
+    from posts.timeline import follow
+
+    seed_dataset(users=options.followers + 1, posts=0)
+    author, *followers = User.objects.order_by('pk')
+    for user in followers:
+        follow(user, author)
+    client = Client()
+    client.force_login(author)
+    texts = [f'Пост номер {i} из бенчмарка' for i in range(options.posts)]
+    report = {
+        'posts': options.posts,
+        'followers': options.followers,
+        'single': timed(lambda: single(client, texts), options.posts),
+    }
+    for size in options.batch_size:
+        report[f'batch/{size}'] = timed(
+            lambda: batched(client, texts, size), options.posts
+        )
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('--posts', type=int, default=2000)
+    parser.add_argument('--batch-size', type=int, nargs='+',
+                        default=[100, 500])
+    parser.add_argument('--followers', type=int, default=20)
+    parser.add_argument('--output')
+    options = parser.parse_args()
+    setup_django()
+    with benchmark_database():
+        report = run(options)
+    write_report(report, options.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""Рендер ленты из N карточек: {% include %} против {% post_card %}.
+
+    python -m benchmarks.card_render --cards 10 100 1000
+
+Шаблон берётся через get_template() на каждый рендер, как в render()
+во view: без кэширующего загрузчика это ещё и разбор файла. Карточка
+«до» — прежний includes/card_post.html.
+"""
+import argparse
+
+from benchmarks.utils import measure, setup_django, summarize, write_report
+
+INCLUDE_CARD = '''<div class="card mb-3 mt-1 shadow-sm">
+  <div class="card-body">
+    <p class="card-text">
+      <a href="{% url 'profile' username=username %}">
+        <strong class="d-block text-gray-dark">
+          {{ username }}
+        </strong>
+      </a>
+      {{ text|linebreaksbr }}
+    </p>
+    <div class="d-flex justify-content-between align-items-center">
+      <div class="btn-group">
+        {% if user.is_authenticated %}
+        <a class="btn btn-sm text-muted" href="{% url 'post_view' username=username post_id=id %}" role="button">
+          Добавить комментарий
+        </a>
+        {% endif %}
+        <a class="btn btn-sm text-muted" href="{% url 'post_edit' username=username post_id=id %}" role="button">
+          {% if user.username == post.author.username %}
+          Редактировать
+          {% endif %}
+        </a>
+      </div>
+      <small class="text-muted">{{ pub_date|date:"d M Y" }}</small>
+    </div>
+  </div>
+</div>'''  # noqa: E501
+
+TEMPLATES = {
+    'include.html': (
+        '{% for post in page %}{% include "card_post.html" with '
+        'username=post.author.username id=post.id pub_date=post.pub_date '
+        'text=post.text %}{% endfor %}'
+    ),
+    'tag.html': (
+        '{% load post_cards %}'
+        '{% for post in page %}{% post_card post %}{% endfor %}'
+    ),
+    'card_post.html': INCLUDE_CARD,
+}
+
+
+def engine(cached):
+    from django.template import Engine
+
+    loaders = [('django.template.loaders.locmem.Loader', TEMPLATES)]
+    if cached:
+        loaders = [('django.template.loaders.cached.Loader', loaders)]
+    return Engine(
+        loaders=loaders,
+        libraries={'post_cards': 'posts.templatetags.post_cards'},
+    )
+
+
+def run(options):
+    from django.template import Context
+    from django.utils import timezone
+    from posts.models import Post, User
+
+    author = User(pk=1, username='leo', first_name='Лев')
+    reader = User(pk=2, username='reader')
+    text = 'Строка текста поста.\n' * 5
+    posts = [
+        Post(pk=i, text=text, author=author, pub_date=timezone.now())
+        for i in range(1, max(options.cards) + 1)
+    ]
+    report = {}
+    for loader in ('plain', 'cached'):
+        renderer = engine(loader == 'cached')
+        for name in ('include', 'tag'):
+            for cards in options.cards:
+                context = {'page': posts[:cards], 'user': reader}
+
+                def render():
+                    template = renderer.get_template(f'{name}.html')
+                    return template.render(Context(context))
+
+                report[f'{loader}/{name}/{cards}'] = summarize(
+                    measure(render, repeat=options.repeat)
+                )
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        '--cards', type=int, nargs='+', default=[10, 100, 1000]
+    )
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--output')
+    options = parser.parse_args()
+    setup_django()
+    write_report(run(options), options.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+"""Сравнить два отчёта benchmarks.endpoints по p50/p95 и числу запросов.
+
+    python -m benchmarks.compare before.json after.json
+"""
+import argparse
+import json
+
+
+def load(path):
+    with open(path, encoding='utf-8') as report:
+        return json.load(report)
+
+
+def delta(old, new):
+    if not old:
+        return '   n/a'
+    return f'{(new - old) / old * 100:+6.1f}%'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('before')
+    parser.add_argument('after')
+    options = parser.parse_args()
+    before, after = load(options.before), load(options.after)
+    print(f'{before.get("revision")} -> {after.get("revision")}')
+    print(f'{"страница":<16}{"p50, мс":>18}{"p95, мс":>18}{"запросы":>10}')
+    for name, new in after['endpoints'].items():
+        old = before['endpoints'].get(name)
+        if old is None:
+            continue
+        columns = []
+        for stat in ('p50_ms', 'p95_ms'):
+            was, now = old['latency'][stat], new['latency'][stat]
+            columns.append(f'{now:>9.2f} {delta(was, now)}')
+        print(
+            f'{name:<16}{"".join(columns)}'
+            f'{old["queries"]:>5} → {new["queries"]:<3}'
+        )
+
+
+if __name__ == '__main__':
+    main()
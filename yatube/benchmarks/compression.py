@@ -0,0 +1,77 @@
+"""Сжатие ленты: размер и CPU по уровням gzip и brotli.
+
+    python -m benchmarks.compression --text-length 2000
+
+Рендерит главную с постами длиной --text-length и сжимает её тем же
+кодом, что CompressionMiddleware, на каждом уровне из --gzip-levels и
+--brotli-qualities (brotli — если установлен). Для каждого уровня: байты,
+доля от исходного и p50/p95 времени сжатия — по ним выбираются
+COMPRESSION_GZIP_LEVEL, COMPRESSION_BROTLI_QUALITY и порог
+COMPRESSION_MIN_SIZE.
+"""
+import argparse
+
+from benchmarks.utils import (
+    benchmark_database, measure, seed_dataset, setup_django, summarize,
+    write_report
+)
+
+
+def compress_once(stream, content):
+    compressor = stream()
+    return compressor.compress(content, flush=False) + compressor.finish()
+
+
+def run(options):
+    from django.test import Client, override_settings
+    from yatube import compression
+
+    seed_dataset(posts=50, text_length=options.text_length)
+    content = Client().get('/').content
+    report = {'raw_bytes': len(content), 'encodings': {}}
+    levels = [
+        ('gzip', 'COMPRESSION_GZIP_LEVEL', level,
+         compression.GzipStream)
+        for level in options.gzip_levels
+    ]
+    if compression.brotli is not None:
+        levels += [
+            ('br', 'COMPRESSION_BROTLI_QUALITY', quality,
+             compression.BrotliStream)
+            for quality in options.brotli_qualities
+        ]
+    for encoding, setting, level, stream in levels:
+        with override_settings(**{setting: level}):
+            compressed = compress_once(stream, content)
+            samples = measure(
+                lambda: compress_once(stream, content), repeat=options.repeat
+            )
+        report['encodings'][f'{encoding}/{level}'] = {
+            'bytes': len(compressed),
+            'ratio': round(len(compressed) / len(content), 3),
+            **summarize(samples),
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('--text-length', type=int, default=2000)
+    parser.add_argument('--gzip-levels', type=int, nargs='+',
+                        default=[1, 6, 9])
+    parser.add_argument('--brotli-qualities', type=int, nargs='+',
+                        default=[1, 5, 11])
+    parser.add_argument('--repeat', type=int, default=50)
+    parser.add_argument('--output')
+    options = parser.parse_args()
+    setup_django()
+    with benchmark_database():
+        report = run(options)
+    write_report(report, options.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,154 @@
+"""Нагрузочный прогон публичных страниц yatube через тестовый клиент.
+
+    python -m benchmarks.endpoints --posts 20000 --output before.json
+    python -m benchmarks.compare before.json after.json
+
+Для каждой страницы считает p50/p95/p99 задержки, число SQL-запросов
+и память на запрос. Кэш лент по умолчанию работает как в проде;
+с --cold он очищается перед каждым запросом.
+"""
+import argparse
+import platform
+
+from benchmarks.utils import (
+    benchmark_database, git_revision, measure, measure_allocations,
+    seed_dataset, setup_django, summarize, write_report
+)
+
+
+def endpoints(options):
+    from django.test import Client
+    from django.urls import reverse
+    from posts.models import Group, Post, User
+
+    author = User.objects.order_by('pk').first()
+    group = Group.objects.order_by('pk').first()
+    post = Post.objects.filter(author=author).order_by('pk').first()
+    if post is None:
+        post = Post.objects.create(text='Пост для замеров', author=author)
+    guest = Client()
+    client = Client()
+    client.force_login(author)
+    edit_url = reverse(
+        'post_edit',
+        kwargs={'username': author.username, 'post_id': post.pk}
+    )
+    return {
+        'index': (guest, 'get', reverse('index'), None),
+        'group_posts': (
+            guest, 'get',
+            reverse('group_posts', kwargs={'slug': group.slug}), None
+        ),
+        'profile': (
+            guest, 'get',
+            reverse('profile', kwargs={'username': author.username}), None
+        ),
+        'post_view': (
+            guest, 'get',
+            reverse(
+                'post_view',
+                kwargs={'username': author.username, 'post_id': post.pk}
+            ),
+            None
+        ),
+        'api_posts': (guest, 'get', reverse('api_posts'), None),
+        'api_posts_batch': (
+            guest, 'get', reverse('api_posts'),
+            {'ids': ','.join(map(str, range(post.pk, post.pk + 20)))}
+        ),
+        'new_post_form': (client, 'get', reverse('new_post'), None),
+        'new_post': (
+            client, 'post', reverse('new_post'),
+            {'text': 'Новый пост из бенчмарка', 'group': group.pk}
+        ),
+        'post_edit_form': (client, 'get', edit_url, None),
+        'post_edit': (
+            client, 'post', edit_url,
+            {'text': 'Отредактированный пост', 'group': group.pk}
+        ),
+    }
+
+
+def run_endpoint(client, method, url, data, cold):
+    from django.core.cache import cache
+
+    def request():
+        if cold:
+            cache.clear()
+        response = getattr(client, method)(url, data)
+        if response.status_code >= 400:
+            raise RuntimeError(f'{url}: {response.status_code}')
+        return response
+
+    return request
+
+
+def count_queries(request):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    with CaptureQueriesContext(connection) as queries:
+        request()
+    return len(queries)
+
+
+def run(options):
+    dataset = seed_dataset(
+        users=options.users,
+        groups=options.groups,
+        posts=options.posts,
+        text_length=options.text_length,
+    )
+    selected = set(options.only or [])
+    results = {}
+    for name, (client, method, url, data) in endpoints(options).items():
+        if selected and name not in selected:
+            continue
+        request = run_endpoint(client, method, url, data, options.cold)
+        response = request()
+        results[name] = {
+            'url': url,
+            'method': method.upper(),
+            'status': response.status_code,
+            'bytes': len(response.content),
+            'latency': summarize(
+                measure(request, repeat=options.requests, warmup=0)
+            ),
+            'queries': count_queries(request),
+            'memory': measure_allocations(request, options.alloc_requests),
+        }
+    return {
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'cold_cache': options.cold,
+        'dataset': dataset,
+        'requests': options.requests,
+        'endpoints': results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--groups', type=int, default=20)
+    parser.add_argument('--posts', type=int, default=20000)
+    parser.add_argument('--text-length', type=int, default=300)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--alloc-requests', type=int, default=5)
+    parser.add_argument('--cold', action='store_true')
+    parser.add_argument(
+        '--only', nargs='*', metavar='NAME',
+        help='Замерять только указанные страницы.'
+    )
+    parser.add_argument('--output')
+    options = parser.parse_args()
+    setup_django()
+    with benchmark_database():
+        write_report(run(options), options.output)
+
+
+if __name__ == '__main__':
+    main()
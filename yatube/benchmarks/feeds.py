@@ -0,0 +1,77 @@
+"""Выгрузка всей истории в RSS: потоковая лента против сборки в памяти.
+
+    python -m benchmarks.feeds --posts 20000
+
+* eager — как syndication.views.Feed: все посты списком в
+  Rss201rev2Feed, затем writeString();
+* stream — /feed/rss/?limit=0: iterator(chunk_size) и запись по мере
+  чтения.
+
+Для каждого режима — время выгрузки, пик памяти (tracemalloc) и размер
+ленты; пик потоковой выгрузки не должен расти вместе с --posts.
+"""
+import argparse
+
+from benchmarks.utils import (
+    benchmark_database, measure, measure_allocations, seed_dataset,
+    setup_django, summarize, write_report
+)
+
+
+def eager_export():
+    from django.test import RequestFactory
+    from django.utils.feedgenerator import Rss201rev2Feed
+    from posts.feeds import post_item
+    from posts.models import Post
+
+    request = RequestFactory().get('/feed/rss/')
+    feed = Rss201rev2Feed(
+        title='Yatube', link='http://testserver/', description='Yatube'
+    )
+    posts = Post.objects.select_related('author', 'group').order_by(
+        '-pub_date', '-pk'
+    )
+    for post in list(posts):
+        feed.add_item(**post_item(request, post))
+    return len(feed.writeString('utf-8').encode())
+
+
+def stream_export():
+    from django.test import Client
+
+    response = Client().get('/feed/rss/', {'limit': 0})
+    return sum(len(chunk) for chunk in response.streaming_content)
+
+
+def run(options):
+    from django.core.cache import cache
+
+    report = {'posts': options.posts}
+    for name, export in (('eager', eager_export), ('stream', stream_export)):
+        cache.clear()
+        report[name] = {
+            'bytes': export(),
+            **summarize(measure(export, repeat=options.repeat)),
+            **measure_allocations(export, repeat=1),
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('--posts', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output')
+    options = parser.parse_args()
+    setup_django()
+    with benchmark_database():
+        seed_dataset(posts=options.posts)
+        report = run(options)
+    write_report(report, options.output)
+
+
+if __name__ == '__main__':
+    main()
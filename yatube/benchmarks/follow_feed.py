@@ -0,0 +1,136 @@
+"""Лента подписок: fan-out-on-read (JOIN) против материализованной ленты.
+
+    python -m benchmarks.follow_feed --followers 10000
+"""
+import argparse
+
+from benchmarks.utils import (
+    benchmark_database, measure, setup_django, summarize, write_report
+)
+
+
+def seed(options):
+    from django.contrib.auth.hashers import make_password
+    from posts.models import AuthorStats, Follow, Post, TimelineEntry, User
+
+    password = make_password(None)
+    star = User.objects.create(username='star', password=password)
+    User.objects.bulk_create(
+        [
+            User(username=f'follower{i}', password=password)
+            for i in range(options.followers)
+        ],
+        batch_size=500
+    )
+    followers = list(
+        User.objects.filter(username__startswith='follower')
+        .values_list('pk', flat=True)
+    )
+    Follow.objects.bulk_create(
+        [Follow(user_id=pk, author=star) for pk in followers],
+        batch_size=500
+    )
+    AuthorStats.objects.create(author=star, follower_count=len(followers))
+
+    reader_id = followers[0]
+    User.objects.bulk_create(
+        [
+            User(username=f'author{i}', password=password)
+            for i in range(options.authors)
+        ],
+        batch_size=500
+    )
+    authors = list(
+        User.objects.filter(username__startswith='author')
+        .values_list('pk', flat=True)
+    )
+    Follow.objects.bulk_create(
+        [Follow(user_id=reader_id, author_id=pk) for pk in authors]
+    )
+    Post.objects.bulk_create(
+        [
+            Post(text=f'Пост {i} автора {pk}', author_id=pk)
+            for pk in authors
+            for i in range(options.posts_per_author)
+        ],
+        batch_size=500
+    )
+    TimelineEntry.objects.bulk_create(
+        [
+            TimelineEntry(user_id=reader_id, post_id=pk, pub_date=pub_date)
+            for pk, pub_date in Post.objects.values_list('pk', 'pub_date')
+        ],
+        batch_size=500
+    )
+    return star, User.objects.get(pk=reader_id)
+
+
+def read_pages(read, reader, pages):
+    cursor = None
+    for _ in range(pages):
+        page = read(reader, cursor=cursor)
+        cursor = page.next_cursor
+
+
+def run(options):
+    from django.test.utils import override_settings
+    from posts.models import Post
+    from posts.timeline import follow_page, pull_follow_page
+
+    star, reader = seed(options)
+    report = {
+        'followers': options.followers,
+        'followed_authors': options.authors + 1,
+        'posts': Post.objects.count(),
+        'write': {},
+        'read': {},
+    }
+    for mode, limit in (
+        ('push', options.followers + 1),
+        ('hybrid', options.followers - 1),
+    ):
+        with override_settings(POSTS_FANOUT_FOLLOWER_LIMIT=limit):
+            report['write'][mode] = summarize(measure(
+                lambda: Post.objects.create(text='Новый пост', author=star),
+                repeat=options.writes, warmup=0
+            ))
+            report['read'][mode] = {
+                'first_page': summarize(measure(
+                    lambda: read_pages(follow_page, reader, 1),
+                    repeat=options.reads
+                )),
+                f'{options.pages}_pages': summarize(measure(
+                    lambda: read_pages(follow_page, reader, options.pages),
+                    repeat=max(1, options.reads // options.pages)
+                )),
+            }
+    report['read']['pull'] = {
+        'first_page': summarize(measure(
+            lambda: read_pages(pull_follow_page, reader, 1),
+            repeat=options.reads
+        )),
+        f'{options.pages}_pages': summarize(measure(
+            lambda: read_pages(pull_follow_page, reader, options.pages),
+            repeat=max(1, options.reads // options.pages)
+        )),
+    }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--followers', type=int, default=10000)
+    parser.add_argument('--authors', type=int, default=200)
+    parser.add_argument('--posts-per-author', type=int, default=20)
+    parser.add_argument('--reads', type=int, default=200)
+    parser.add_argument('--writes', type=int, default=5)
+    parser.add_argument('--pages', type=int, default=10)
+    parser.add_argument('--output')
+    options = parser.parse_args()
+    setup_django()
+    with benchmark_database():
+        write_report(run(options), options.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""/new/ и /group/<slug>/ при большом числе групп.
+
+    python -m benchmarks.group_form --groups 10000 --requests 50
+
+Форма поста сравнивается с прежним виджетом (Select со всеми группами)
+и GroupSelect; страница группы — холодная (пустой кэш) и тёплая, когда
+группа уже в posts.groups. Для каждого случая — размер ответа, запросы
+к posts_group и задержка.
+"""
+import argparse
+from contextlib import contextmanager
+
+from benchmarks.utils import (
+    benchmark_database, measure, seed_dataset, setup_django, summarize,
+    write_report
+)
+
+
+@contextmanager
+def full_select():
+    from django.forms import Select
+    from posts.forms import PostForm
+
+    field = PostForm.base_fields['group']
+    widget = field.widget
+    field.widget = Select(choices=field.choices)
+    try:
+        yield
+    finally:
+        field.widget = widget
+
+
+def profile(client, url, repeat, before=None):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    def get():
+        if before:
+            before()
+        return client.get(url)
+
+    with CaptureQueriesContext(connection) as queries:
+        response = get()
+    assert response.status_code == 200, response.status_code
+    return {
+        'bytes': len(response.content),
+        'group_queries': sum(
+            'FROM "posts_group"' in query['sql'] for query in queries
+        ),
+        **summarize(measure(get, repeat=repeat)),
+    }
+
+
+def run(options):
+    from django.core.cache import cache
+    from django.test import Client
+    from django.urls import reverse
+    from posts.models import User
+
+    seed_dataset(users=10, groups=options.groups, posts=1000)
+    client = Client()
+    client.force_login(User.objects.order_by('pk').first())
+    new_post = reverse('new_post')
+    group = reverse('group_posts', kwargs={'slug': 'group1'})
+    report = {}
+    with full_select():
+        report['new_post/Select'] = profile(client, new_post, options.requests)
+    report['new_post/GroupSelect'] = profile(
+        client, new_post, options.requests
+    )
+    report['group/cold'] = profile(
+        client, group, options.requests, before=cache.clear
+    )
+    report['group/warm'] = profile(client, group, options.requests)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('--groups', type=int, default=10000)
+    parser.add_argument('--requests', type=int, default=50)
+    parser.add_argument('--output')
+    options = parser.parse_args()
+    setup_django()
+    with benchmark_database():
+        report = run(options)
+    write_report(report, options.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""Регистраций в секунду на ядро для разных хешеров паролей.
+
+    python -m benchmarks.signup --signups 50
+
+Каждая регистрация — POST на /auth/signup/ через тестовый клиент: форма,
+валидаторы паролей, хеш и INSERT. Процесс однопоточный, поэтому
+signups_per_s — пропускная способность одного ядра; cpu_ms — время CPU
+процесса на регистрацию. argon2 пропускается без argon2-cffi.
+"""
+import argparse
+import itertools
+import time
+
+from benchmarks.utils import (
+    benchmark_database, measure, setup_django, summarize, write_report
+)
+
+HASHERS = {
+    'md5 (settings_test)': (
+        'django.contrib.auth.hashers.MD5PasswordHasher', {}
+    ),
+    'pbkdf2 (Django)': (
+        'django.contrib.auth.hashers.PBKDF2PasswordHasher', {}
+    ),
+    'scrypt n=2**14': ('users.hashers.ScryptPasswordHasher', {}),
+    'scrypt n=2**15': (
+        'users.hashers.ScryptPasswordHasher',
+        {'PASSWORD_SCRYPT_N': 2 ** 15}
+    ),
+    'argon2 t=2 m=512': ('users.hashers.TunedArgon2PasswordHasher', {}),
+}
+
+
+def available(hasher):
+    from django.contrib.auth.hashers import import_string
+
+    try:
+        import_string(hasher)().encode('x', 'salt')
+    except (ImportError, ValueError):
+        return False
+    return True
+
+
+def run(options):
+    from django.test import Client, override_settings
+    from django.urls import reverse
+
+    url = reverse('signup')
+    counter = itertools.count()
+    report = {}
+    for name, (hasher, costs) in HASHERS.items():
+        with override_settings(PASSWORD_HASHERS=[hasher], **costs):
+            if not available(hasher):
+                report[name] = 'недоступен'
+                continue
+            client = Client()
+
+            def signup():
+                username = f'user{next(counter)}'
+                response = client.post(url, {
+                    'username': username,
+                    'email': f'{username}@example.com',
+                    'password1': 'Ne-prostoi-parol-42',
+                    'password2': 'Ne-prostoi-parol-42',
+                })
+                assert response.status_code == 302, response.status_code
+
+            cpu = time.process_time()
+            samples = measure(signup, repeat=options.signups, warmup=0)
+            cpu = time.process_time() - cpu
+            report[name] = {
+                'signups_per_s': round(len(samples) / sum(samples), 1),
+                'cpu_ms': round(cpu / len(samples) * 1000, 2),
+                **summarize(samples),
+            }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('--signups', type=int, default=50)
+    parser.add_argument('--output')
+    options = parser.parse_args()
+    setup_django()
+    with benchmark_database():
+        report = run(options)
+    write_report(report, options.output)
+
+
+if __name__ == '__main__':
+    main()
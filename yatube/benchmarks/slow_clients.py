@@ -0,0 +1,240 @@
+"""Медленные клиенты: WSGI с пулом потоков против yatube.asgi.
+
+    python -m benchmarks.slow_clients --clients 500 --trickle 1.0
+
+Оба сервера поднимаются локально с одинаковым числом потоков
+(ASGI_THREADS). Клиенты подключаются с частотой --rate в секунду,
+отправляют запрос по частям в течение --trickle секунд и так же
+медленно читают ответ, как мобильный клиент на плохой сети.
+Синхронный сервер держит поток на всё время обмена с клиентом,
+ASGI — только на время работы представления.
+"""
+import argparse
+import asyncio
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from socketserver import ThreadingMixIn
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer
+
+from benchmarks.utils import (
+    benchmark_database, seed_dataset, setup_django, summarize, write_report
+)
+
+BACKLOG = 2048
+RCVBUF = 4096
+READ_SIZE = 2048
+
+
+class QuietHandler(WSGIRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+class PooledWSGIServer(ThreadingMixIn, WSGIServer):
+    """Как gunicorn --threads: соединение целиком занимает поток пула."""
+
+    request_queue_size = BACKLOG
+
+    def __init__(self, address, threads):
+        self.pool = ThreadPoolExecutor(max_workers=threads)
+        super().__init__(address, QuietHandler)
+
+    def process_request(self, request, client_address):
+        self.pool.submit(
+            self.process_request_thread, request, client_address
+        )
+
+
+def serve_wsgi(threads):
+    from django.core.wsgi import get_wsgi_application
+
+    server = PooledWSGIServer(('127.0.0.1', 0), threads)
+    server.set_app(get_wsgi_application())
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server.server_address[1], server.shutdown
+
+
+async def handle_asgi(application, reader, writer):
+    """Минимальный HTTP/1.0-сервер для ASGI-приложения."""
+    head = await reader.readuntil(b'\r\n\r\n')
+    request_line, *header_lines = head.decode('latin1').split('\r\n')
+    method, target, version = request_line.split(' ')
+    path, _, query = target.partition('?')
+    headers = []
+    for line in filter(None, header_lines):
+        name, _, value = line.partition(':')
+        headers.append((name.strip().lower().encode('latin1'),
+                        value.strip().encode('latin1')))
+    length = int(dict(headers).get(b'content-length', 0))
+    body = await reader.readexactly(length) if length else b''
+    scope = {
+        'type': 'http',
+        'http_version': version.split('/')[1],
+        'method': method,
+        'scheme': 'http',
+        'path': path,
+        'root_path': '',
+        'query_string': query.encode('latin1'),
+        'headers': headers,
+        'server': ('127.0.0.1', 0),
+        'client': writer.get_extra_info('peername'),
+    }
+
+    async def receive():
+        return {'type': 'http.request', 'body': body}
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            writer.write(f'HTTP/1.0 {message["status"]} -\r\n'.encode())
+            for name, value in message['headers']:
+                writer.write(name + b': ' + value + b'\r\n')
+            writer.write(b'\r\n')
+        else:
+            writer.write(message.get('body', b''))
+            await writer.drain()
+
+    try:
+        await application(scope, receive, send)
+    finally:
+        writer.close()
+
+
+def serve_asgi():
+    from yatube.asgi import application
+
+    loop = asyncio.new_event_loop()
+    started = threading.Event()
+    holder = {}
+
+    async def main():
+        holder['server'] = await asyncio.start_server(
+            lambda reader, writer: handle_asgi(application, reader, writer),
+            '127.0.0.1', 0, backlog=BACKLOG
+        )
+        started.set()
+        try:
+            await holder['server'].serve_forever()
+        except asyncio.CancelledError:
+            pass
+
+    thread = threading.Thread(
+        target=loop.run_until_complete, args=(main(),), daemon=True
+    )
+    thread.start()
+    started.wait()
+
+    def stop():
+        loop.call_soon_threadsafe(holder['server'].close)
+
+    return holder['server'].sockets[0].getsockname()[1], stop
+
+
+async def slow_client(port, path, delay, trickle, parts):
+    await asyncio.sleep(delay)
+    request = (
+        f'GET {path} HTTP/1.0\r\nHost: localhost\r\n'
+        f'User-Agent: slow-client\r\nAccept: text/html\r\n\r\n'
+    ).encode()
+    start = time.perf_counter()
+    sock = socket.socket()
+    # маленький приёмный буфер: ответ не помещается в ядро целиком
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, RCVBUF)
+    sock.setblocking(False)
+    await asyncio.get_running_loop().sock_connect(sock, ('127.0.0.1', port))
+    reader, writer = await asyncio.open_connection(sock=sock)
+    step = len(request) // parts + 1
+    for offset in range(0, len(request), step):
+        writer.write(request[offset:offset + step])
+        await writer.drain()
+        await asyncio.sleep(trickle / parts)
+    chunks = []
+    while True:
+        await asyncio.sleep(trickle / parts)
+        chunk = await reader.read(READ_SIZE)
+        if not chunk:
+            break
+        chunks.append(chunk)
+    response = b''.join(chunks)
+    writer.close()
+    status = int(response.split(b' ', 2)[1]) if response else 0
+    return time.perf_counter() - start, status
+
+
+async def load(port, paths, options):
+    started = time.perf_counter()
+    results = await asyncio.gather(*(
+        slow_client(port, paths[i % len(paths)], i / options.rate,
+                    options.trickle, options.parts)
+        for i in range(options.clients)
+    ), return_exceptions=True)
+    wall = time.perf_counter() - started
+    latencies = [
+        latency for latency, status in
+        (result for result in results if not isinstance(result, Exception))
+        if status == 200
+    ]
+    return {
+        'wall_s': round(wall, 2),
+        'ok': len(latencies),
+        'errors': options.clients - len(latencies),
+        'throughput_rps': round(len(latencies) / wall, 1),
+        'latency': summarize(latencies),
+    }
+
+
+def run(options):
+    from django.conf import settings
+    from django.urls import reverse
+    from posts.models import Group, Post
+
+    dataset = seed_dataset(posts=options.posts)
+    post = Post.objects.select_related('author').order_by('pk').first()
+    author = post.author
+    group = Group.objects.order_by('pk').first()
+    paths = [
+        reverse('index'),
+        reverse('group_posts', kwargs={'slug': group.slug}),
+        reverse('profile', kwargs={'username': author.username}),
+        reverse('post_view', kwargs={
+            'username': author.username, 'post_id': post.pk
+        }),
+    ]
+    threads = settings.ASGI_THREADS
+    report = {'dataset': dataset, 'threads': threads,
+              'clients': options.clients, 'rate': options.rate,
+              'trickle_s': options.trickle}
+    servers = {'wsgi': lambda: serve_wsgi(threads), 'asgi': serve_asgi}
+    for name, serve in servers.items():
+        port, stop = serve()
+        try:
+            report[name] = asyncio.run(load(port, paths, options))
+        finally:
+            stop()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('--clients', type=int, default=500)
+    parser.add_argument('--trickle', type=float, default=1.0)
+    parser.add_argument('--parts', type=int, default=4)
+    parser.add_argument(
+        '--rate', type=float, default=100,
+        help='Сколько новых клиентов подключается в секунду.'
+    )
+    parser.add_argument('--posts', type=int, default=5000)
+    parser.add_argument('--output')
+    options = parser.parse_args()
+    socket.setdefaulttimeout(None)
+    setup_django()
+    with benchmark_database():
+        write_report(run(options), options.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,158 @@
+"""Конкурентная запись в SQLite: штатный бэкенд против yatube.sqlite.
+
+    python -m benchmarks.sqlite_writes --writers 8 --readers 4
+
+Потоки-писатели создают посты (с сигналами счётчиков и лент), потоки-
+читатели в это время листают ленту. Каждый режим запускается в
+отдельном процессе на своём файле БД:
+
+* plain — django.db.backends.sqlite3, журнал по умолчанию, запись в
+  transaction.atomic() как раньше во view;
+* tuned — yatube.sqlite (WAL и PRAGMA) и serialized_write.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from benchmarks.utils import (
+    benchmark_database, seed_dataset, setup_django, summarize, write_report
+)
+
+ENGINES = {
+    'plain': 'django.db.backends.sqlite3',
+    'tuned': 'yatube.sqlite',
+}
+
+
+def writer_loop(mode, author, deadline, result):
+    from django.db import OperationalError, connection, transaction
+    from posts.models import Post
+    from yatube.sqlite.writer import serialized_write
+
+    def create():
+        return Post.objects.create(text='Пост под нагрузкой', author=author)
+
+    try:
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                if mode == 'tuned':
+                    serialized_write(create)
+                else:
+                    with transaction.atomic():
+                        create()
+            except OperationalError as error:
+                result['errors'].append(str(error))
+                continue
+            result['writes'].append(time.perf_counter() - start)
+    finally:
+        connection.close()
+
+
+def reader_loop(deadline, result):
+    from django.db import OperationalError, connection
+    from posts.models import Post
+
+    try:
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                list(Post.objects.for_feed().order_by('-pub_date', '-pk')[:10])
+            except OperationalError as error:
+                result['errors'].append(str(error))
+                continue
+            result['reads'].append(time.perf_counter() - start)
+    finally:
+        connection.close()
+
+
+def run_mode(options):
+    from django.db import connection
+    from posts.models import User
+
+    connection.settings_dict['TEST']['NAME'] = options.database
+    with benchmark_database():
+        seed_dataset(posts=options.posts)
+        authors = list(User.objects.order_by('pk')[:options.writers])
+        connection.close()
+        result = {'writes': [], 'reads': [], 'errors': []}
+        deadline = time.perf_counter() + options.duration
+        threads = [
+            threading.Thread(
+                target=writer_loop,
+                args=(options.mode, author, deadline, result)
+            )
+            for author in authors
+        ] + [
+            threading.Thread(target=reader_loop, args=(deadline, result))
+            for _ in range(options.readers)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        journal = connection.cursor().execute(
+            'PRAGMA journal_mode'
+        ).fetchone()[0]
+    return {
+        'engine': ENGINES[options.mode],
+        'journal_mode': journal,
+        'writes_per_s': round(len(result['writes']) / options.duration, 1),
+        'write_latency': summarize(result['writes'] or [0]),
+        'read_latency': summarize(result['reads'] or [0]),
+        'lock_errors': len(result['errors']),
+        'sample_error': result['errors'][0] if result['errors'] else None,
+    }
+
+
+def run_worker(options):
+    os.environ['YATUBE_DB_ENGINE'] = ENGINES[options.mode]
+    os.environ.pop('YATUBE_REPLICA_NAMES', None)
+    setup_django('yatube.settings_production')
+    sys.stdout.write(json.dumps(run_mode(options)) + '\n')
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('--writers', type=int, default=8)
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--duration', type=float, default=5)
+    parser.add_argument('--posts', type=int, default=5000)
+    parser.add_argument('--mode', choices=ENGINES)
+    parser.add_argument('--database', help=argparse.SUPPRESS)
+    parser.add_argument('--output')
+    options = parser.parse_args()
+    if options.mode:
+        run_worker(options)
+        return
+    report = {
+        'writers': options.writers,
+        'readers': options.readers,
+        'duration_s': options.duration,
+    }
+    with tempfile.TemporaryDirectory() as directory:
+        for mode in ENGINES:
+            output = subprocess.run(
+                [sys.executable, '-m', 'benchmarks.sqlite_writes',
+                 '--mode', mode,
+                 '--database', os.path.join(directory, f'{mode}.sqlite3'),
+                 '--writers', str(options.writers),
+                 '--readers', str(options.readers),
+                 '--duration', str(options.duration),
+                 '--posts', str(options.posts)],
+                check=True, stdout=subprocess.PIPE
+            ).stdout
+            report[mode] = json.loads(output)
+    write_report(report, options.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""Вес статики на страницу: обычное хранилище против сжатых сборок.
+
+    python -m benchmarks.static_assets --assets ../node_modules
+
+Для каждого режима collectstatic собирает статику во временный
+STATIC_ROOT, затем страницы рендерятся тестовым клиентом, и по ссылкам
+/static/... считаются число запросов и байты: как есть и с лучшей
+сжатой копией из тех, что лежат рядом (.br, .gz).
+
+* before — StaticFilesStorage, файлы по одному, без сжатых копий;
+* after — CompressedManifestStorage и STATIC_USE_BUNDLES.
+
+--assets добавляет каталог в STATICFILES_DIRS: в репозитории нет
+bootstrap и jquery, без них сборки не собираются и в отчёте остаются
+только файлы админки.
+"""
+import argparse
+import os
+import re
+import tempfile
+
+from benchmarks.utils import benchmark_database, setup_django, write_report
+
+MODES = {
+    'before': {
+        'STATICFILES_STORAGE': (
+            'django.contrib.staticfiles.storage.StaticFilesStorage'
+        ),
+        'STATIC_USE_BUNDLES': False,
+    },
+    'after': {
+        'STATICFILES_STORAGE': 'yatube.staticfiles.CompressedManifestStorage',
+        'STATIC_USE_BUNDLES': True,
+    },
+}
+PAGES = ('/', '/admin/login/')
+STATIC_LINK = re.compile(r'(?:href|src)="/static/([^"?#]+)"')
+
+
+def file_size(root, name):
+    path = os.path.join(root, name)
+    return os.path.getsize(path) if os.path.exists(path) else None
+
+
+def page_weight(html, root):
+    names = sorted(set(STATIC_LINK.findall(html)))
+    raw = compressed = missing = 0
+    for name in names:
+        size = file_size(root, name)
+        if size is None:
+            missing += 1
+            continue
+        raw += size
+        compressed += min(
+            filter(None, (size, file_size(root, name + '.gz'),
+                          file_size(root, name + '.br')))
+        )
+    return {
+        'requests': len(names),
+        'missing': missing,
+        'raw_bytes': raw,
+        'transfer_bytes': compressed,
+    }
+
+
+def run_mode(mode, options, directory):
+    from django.core.management import call_command
+    from django.test import Client, override_settings
+
+    root = os.path.join(directory, mode)
+    overrides = {**MODES[mode], 'STATIC_ROOT': root, 'DEBUG': False}
+    if options.assets:
+        overrides['STATICFILES_DIRS'] = [os.path.abspath(options.assets)]
+    with override_settings(**overrides):
+        call_command('collectstatic', interactive=False, verbosity=0)
+        client = Client()
+        return {
+            page: page_weight(client.get(page).content.decode(), root)
+            for page in PAGES
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('--assets', help='каталог с bootstrap/ и jquery/')
+    parser.add_argument('--output')
+    options = parser.parse_args()
+    setup_django()
+    with benchmark_database(), tempfile.TemporaryDirectory() as directory:
+        report = {
+            mode: run_mode(mode, options, directory) for mode in MODES
+        }
+    write_report(report, options.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+"""Общая обвязка бенчмарков: Django, отдельная БД, замеры и отчёт.
+
+Бенчмарки запускаются из каталога yatube/:
+
+    python -m benchmarks.<имя> [--output report.json]
+
+и работают с тестовой базой, которую создают и удаляют сами.
+"""
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+
+def setup_django(settings_module='yatube.settings'):
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+    import django
+    django.setup()
+
+
+@contextmanager
+def benchmark_database(keepdb=False):
+    from django.db import connection
+    from django.test.utils import (
+        setup_test_environment, teardown_test_environment
+    )
+    setup_test_environment(debug=False)
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0, keepdb=keepdb)
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(
+            old_name, verbosity=0, keepdb=keepdb
+        )
+        teardown_test_environment()
+
+
+def measure(func, repeat, warmup=1):
+    """Время каждого из repeat вызовов func в секундах."""
+    for _ in range(warmup):
+        func()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def measure_allocations(func, repeat):
+    """Пик выделенной памяти (КБ) и число живых блоков за вызов."""
+    peaks = []
+    blocks = []
+    for _ in range(repeat):
+        tracemalloc.start()
+        before = len(tracemalloc.take_snapshot().traces)
+        func()
+        peaks.append(tracemalloc.get_traced_memory()[1] / 1024)
+        blocks.append(len(tracemalloc.take_snapshot().traces) - before)
+        tracemalloc.stop()
+    return {
+        'peak_kb': round(sum(peaks) / len(peaks), 1),
+        'retained_blocks': round(sum(blocks) / len(blocks), 1),
+    }
+
+
+def seed_dataset(users=100, groups=10, posts=10000, text_length=300,
+                 seed=0):
+    """Заполнить БД через bulk_create и пересчитать счётчики."""
+    from django.contrib.auth.hashers import make_password
+    from posts.counters import recount_authors, recount_groups
+    from posts.models import Group, Post, User
+
+    rnd = random.Random(seed)
+    password = make_password(None)
+    User.objects.bulk_create(
+        [
+            User(username=f'user{i}', first_name='Имя', last_name=f'{i}',
+                 password=password)
+            for i in range(users)
+        ],
+        batch_size=500
+    )
+    Group.objects.bulk_create(
+        [
+            Group(title=f'Группа {i}', slug=f'group{i}',
+                  description='Описание группы')
+            for i in range(groups)
+        ],
+        batch_size=500
+    )
+    user_ids = list(User.objects.values_list('pk', flat=True))
+    group_ids = list(Group.objects.values_list('pk', flat=True)) + [None]
+    words = 'лето море солнце город дождь книга кофе утро'.split()
+    batch = []
+    for i in range(posts):
+        text = ' '.join(rnd.choice(words) for _ in range(text_length // 6))
+        batch.append(Post(
+            text=text[:text_length],
+            author_id=rnd.choice(user_ids),
+            group_id=rnd.choice(group_ids),
+        ))
+        if len(batch) == 5000:
+            Post.objects.bulk_create(batch)
+            batch = []
+    Post.objects.bulk_create(batch)
+    recount_groups()
+    recount_authors()
+    return {'users': users, 'groups': groups, 'posts': posts}
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def percentile(samples, q):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(q / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(samples):
+    return {
+        'n': len(samples),
+        'mean_ms': round(sum(samples) / len(samples) * 1000, 3),
+        'p50_ms': round(percentile(samples, 50) * 1000, 3),
+        'p95_ms': round(percentile(samples, 95) * 1000, 3),
+        'p99_ms': round(percentile(samples, 99) * 1000, 3),
+    }
+
+
+def write_report(report, path=None):
+    data = json.dumps(report, ensure_ascii=False, indent=2)
+    if path:
+        with open(path, 'w', encoding='utf-8') as output:
+            output.write(data + '\n')
+    else:
+        sys.stdout.write(data + '\n')
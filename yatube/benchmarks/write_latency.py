@@ -0,0 +1,74 @@
+"""Задержка new_post в зависимости от числа подписчиков автора.
+
+    python -m benchmarks.write_latency --followers 0 100 1000
+
+* eager — раскладка по лентам подписчиков внутри запроса, как раньше;
+* database — запрос только ставит задачу, раскладку делает воркер
+  (manage.py run_tasks); его время указано отдельно как worker_ms.
+"""
+import argparse
+import time
+
+from benchmarks.utils import (
+    benchmark_database, measure, seed_dataset, setup_django, summarize,
+    write_report
+)
+
+
+def run(options):
+    from django.test import Client, override_settings
+    from django.urls import reverse
+    from posts.models import Follow, User
+    from tasks.queue import run_pending
+
+    seed_dataset(users=max(options.followers) + 1, posts=0)
+    author, *readers = User.objects.order_by('pk')
+    url = reverse('new_post')
+    report = {}
+    for followers in options.followers:
+        Follow.objects.all().delete()
+        Follow.objects.bulk_create(
+            Follow(user=user, author=author) for user in readers[:followers]
+        )
+        for backend in ('eager', 'database'):
+            with override_settings(TASKS_BACKEND=backend):
+                client = Client()
+                client.force_login(author)
+                samples = measure(
+                    lambda: client.post(url, {'text': 'Пост'}),
+                    repeat=options.repeat
+                )
+                start = time.perf_counter()
+                done = 0
+                while True:
+                    batch, _ = run_pending()
+                    if not batch:
+                        break
+                    done += batch
+            report[f'{backend}/{followers}'] = summarize(samples)
+            if done:
+                # время воркера на одну задачу
+                report[f'{backend}/{followers}']['worker_ms'] = round(
+                    (time.perf_counter() - start) * 1000 / done, 3
+                )
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('--followers', type=int, nargs='+',
+                        default=[0, 100, 1000])
+    parser.add_argument('--repeat', type=int, default=50)
+    parser.add_argument('--output')
+    options = parser.parse_args()
+    setup_django()
+    with benchmark_database():
+        report = run(options)
+    write_report(report, options.output)
+
+
+if __name__ == '__main__':
+    main()
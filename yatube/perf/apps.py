@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class PerfConfig(AppConfig):
+    name = 'perf'
+
+    def ready(self):
+        from .metrics import instrument_templates
+        instrument_templates()
@@ -0,0 +1,210 @@
+"""Замеры запросов: время, SQL, шаблоны и размер ответа по имени URL."""
+import threading
+import time
+from contextvars import ContextVar
+from functools import wraps
+
+# верхние границы корзин гистограммы, мс; последняя — всё, что дольше
+BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, float('inf'))
+
+current = ContextVar('perf_request_metrics', default=None)
+
+
+class RequestMetrics:
+    __slots__ = ('started', 'queries', 'db_time', 'template_time',
+                 'template_depth')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.template_time = 0.0
+        self.template_depth = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        """Обёртка для connection.execute_wrapper()."""
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - started
+            self.queries += 1
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def server_timing(self, total):
+        return ', '.join((
+            f'total;dur={total * 1000:.1f}',
+            f'db;dur={self.db_time * 1000:.1f};desc="{self.queries} queries"',
+            f'tpl;dur={self.template_time * 1000:.1f}',
+        ))
+
+
+class Histogram:
+    def __init__(self):
+        self.count = 0
+        self.buckets = [0] * len(BUCKETS_MS)
+        self.total_ms = 0.0
+        self.db_ms = 0.0
+        self.template_ms = 0.0
+        self.queries = 0
+        self.bytes = 0
+        self.max_ms = 0.0
+
+    def add(self, total_ms, metrics, size):
+        self.count += 1
+        for index, bound in enumerate(BUCKETS_MS):
+            if total_ms <= bound:
+                self.buckets[index] += 1
+                break
+        self.total_ms += total_ms
+        self.db_ms += metrics.db_time * 1000
+        self.template_ms += metrics.template_time * 1000
+        self.queries += metrics.queries
+        self.bytes += size
+        self.max_ms = max(self.max_ms, total_ms)
+
+    def percentile(self, share):
+        """Верхняя граница корзины, в которую попадает доля share."""
+        rank = share * self.count
+        seen = 0
+        for bound, hits in zip(BUCKETS_MS, self.buckets):
+            seen += hits
+            if hits and seen >= rank:
+                return min(bound, self.max_ms)
+        return self.max_ms
+
+    def as_dict(self):
+        count = self.count or 1
+        return {
+            'count': self.count,
+            'mean_ms': round(self.total_ms / count, 2),
+            'p50_ms': round(self.percentile(0.50), 2),
+            'p95_ms': round(self.percentile(0.95), 2),
+            'p99_ms': round(self.percentile(0.99), 2),
+            'max_ms': round(self.max_ms, 2),
+            'db_ms': round(self.db_ms / count, 2),
+            'template_ms': round(self.template_ms / count, 2),
+            'queries': round(self.queries / count, 2),
+            'bytes': round(self.bytes / count),
+            'histogram': {
+                str(bound): hits
+                for bound, hits in zip(BUCKETS_MS, self.buckets)
+            },
+        }
+
+
+class CompressionStats:
+    def __init__(self):
+        self.count = 0
+        self.raw_bytes = 0
+        self.compressed_bytes = 0
+        self.cpu = 0.0
+
+    def add(self, raw, compressed, cpu):
+        self.count += 1
+        self.raw_bytes += raw
+        self.compressed_bytes += compressed
+        self.cpu += cpu
+
+    def as_dict(self):
+        return {
+            'count': self.count,
+            'raw_bytes': self.raw_bytes,
+            'compressed_bytes': self.compressed_bytes,
+            'ratio': round(
+                self.compressed_bytes / (self.raw_bytes or 1), 3
+            ),
+            'cpu_ms': round(self.cpu * 1000, 2),
+            'cpu_ms_per_kb': round(
+                self.cpu * 1000 / ((self.raw_bytes or 1) / 1024), 4
+            ),
+        }
+
+
+class Registry:
+    """Гистограммы процесса; у каждого воркера своя копия."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.views = {}
+        self.compression = {}
+        self.compression_skipped = {}
+
+    def record(self, name, total, metrics, size):
+        with self.lock:
+            histogram = self.views.get(name)
+            if histogram is None:
+                histogram = self.views[name] = Histogram()
+            histogram.add(total * 1000, metrics, size)
+
+    def record_compression(self, encoding, raw=0, compressed=0, cpu=0.0,
+                           skipped=None):
+        """Сжатый ответ по кодировке или причина, по которой его не сжали."""
+        with self.lock:
+            if skipped:
+                self.compression_skipped[skipped] = (
+                    self.compression_skipped.get(skipped, 0) + 1
+                )
+                return
+            stats = self.compression.get(encoding)
+            if stats is None:
+                stats = self.compression[encoding] = CompressionStats()
+            stats.add(raw, compressed, cpu)
+
+    def compression_snapshot(self):
+        with self.lock:
+            return {
+                'encodings': {
+                    encoding: stats.as_dict()
+                    for encoding, stats in sorted(self.compression.items())
+                },
+                'skipped': dict(sorted(self.compression_skipped.items())),
+            }
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                name: histogram.as_dict()
+                for name, histogram in sorted(self.views.items())
+            }
+
+    def reset(self):
+        with self.lock:
+            self.views.clear()
+            self.compression.clear()
+            self.compression_skipped.clear()
+
+
+registry = Registry()
+
+
+def instrument_templates():
+    """Учитывать время render() шаблонов Django в текущем запросе.
+
+    Оборачивается шаблон бэкенда: include и наследование рендерятся
+    внутри него, поэтому вложенные вызовы не считаются повторно.
+    """
+    from django.template.backends.django import Template
+
+    render = Template.render
+    if getattr(render, 'perf_instrumented', False):
+        return
+
+    @wraps(render)
+    def timed_render(self, context=None, request=None):
+        metrics = current.get()
+        if metrics is None:
+            return render(self, context, request)
+        metrics.template_depth += 1
+        started = time.perf_counter()
+        try:
+            return render(self, context, request)
+        finally:
+            metrics.template_depth -= 1
+            if not metrics.template_depth:
+                metrics.template_time += time.perf_counter() - started
+
+    timed_render.perf_instrumented = True
+    Template.render = timed_render
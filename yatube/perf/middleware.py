@@ -0,0 +1,37 @@
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from .metrics import RequestMetrics, current, registry
+
+UNRESOLVED = '<unresolved>'
+
+
+class PerfMiddleware:
+    """Время ответа, SQL и рендер шаблонов по имени URL.
+
+    Ставится первым в MIDDLEWARE, чтобы замер охватывал весь стек.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        metrics = RequestMetrics()
+        token = current.set(metrics)
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(metrics))
+                response = self.get_response(request)
+        finally:
+            current.reset(token)
+        total = metrics.elapsed()
+        match = getattr(request, 'resolver_match', None)
+        name = match.view_name if match else UNRESOLVED
+        size = 0 if response.streaming else len(response.content)
+        registry.record(name, total, metrics, size)
+        if settings.PERF_SERVER_TIMING:
+            response['Server-Timing'] = metrics.server_timing(total)
+        return response
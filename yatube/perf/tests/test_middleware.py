@@ -0,0 +1,69 @@
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Post, User
+
+from ..metrics import Histogram, RequestMetrics, registry
+
+
+class PerfMiddlewareTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='test_user')
+        cls.staff = User.objects.create_user(
+            username='test_staff', is_staff=True
+        )
+        Post.objects.create(text='Тестовый текст', author=cls.user)
+
+    def setUp(self):
+        cache.clear()
+        registry.reset()
+        self.guest_client = Client()
+        self.staff_client = Client()
+        self.staff_client.force_login(self.staff)
+
+    def test_server_timing_header(self):
+        response = self.guest_client.get(reverse('index'))
+        self.assertRegex(
+            response['Server-Timing'],
+            r'^total;dur=[\d.]+, db;dur=[\d.]+;desc="1 queries", '
+            r'tpl;dur=[\d.]+$'
+        )
+
+    @override_settings(PERF_SERVER_TIMING=False)
+    def test_server_timing_can_be_disabled(self):
+        response = self.guest_client.get(reverse('index'))
+        self.assertFalse(response.has_header('Server-Timing'))
+
+    def test_metrics_grouped_by_url_name(self):
+        for _ in range(2):
+            self.guest_client.get(
+                reverse('profile', kwargs={'username': 'test_user'})
+            )
+        self.guest_client.get('/group/missing/')
+        views = registry.snapshot()
+        self.assertEqual(views['profile']['count'], 2)
+        self.assertGreater(views['profile']['template_ms'], 0)
+        self.assertGreater(views['profile']['bytes'], 0)
+        self.assertEqual(views['group_posts']['count'], 1)
+
+    def test_stats_endpoint_is_staff_only(self):
+        self.guest_client.get(reverse('index'))
+        response = self.guest_client.get(reverse('perf:stats'))
+        self.assertEqual(response.status_code, 302)
+        response = self.staff_client.get(reverse('perf:stats'))
+        self.assertEqual(response.json()['views']['index']['count'], 1)
+
+
+class HistogramTests(TestCase):
+    def test_percentiles_use_bucket_bounds(self):
+        histogram = Histogram()
+        for total_ms in [0.5] * 90 + [30] * 9 + [700]:
+            histogram.add(total_ms, RequestMetrics(), 0)
+        stats = histogram.as_dict()
+        self.assertEqual(stats['p50_ms'], 1)
+        self.assertEqual(stats['p95_ms'], 50)
+        self.assertEqual(stats['p99_ms'], 50)
+        self.assertEqual(stats['max_ms'], 700)
+        self.assertEqual(stats['histogram']['inf'], 0)
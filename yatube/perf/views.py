@@ -0,0 +1,15 @@
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import JsonResponse
+from django.views.decorators.cache import never_cache
+
+from .metrics import BUCKETS_MS, registry
+
+
+@never_cache
+@staff_member_required
+def stats(request):
+    return JsonResponse({
+        'buckets_ms': [str(bound) for bound in BUCKETS_MS],
+        'views': registry.snapshot(),
+        'compression': registry.compression_snapshot(),
+    }, json_dumps_params={'ensure_ascii': False, 'indent': 2})
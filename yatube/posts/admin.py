@@ -1,6 +1,7 @@
 from django.contrib import admin
 
 from .models import Post, Group
+from .search import filter_matching, fts_available
 
 
 @admin.register(Post)
@@ -10,7 +11,13 @@ class PostAdmin(admin.ModelAdmin):
     list_filter = ('pub_date',)
     empty_value_display = '-пусто-'
 
+    def get_search_results(self, request, queryset, search_term):
+        # Поиск по FTS5-индексу вместо LIKE '%...%' по всей таблице.
+        if not search_term or not fts_available():
+            return super().get_search_results(request, queryset, search_term)
+        return filter_matching(queryset, search_term), False
+
 
 @admin.register(Group)
 class GroupAdmin(admin.ModelAdmin):
-    list_display = ('title', 'slug', 'description')
+    list_display = ('title', 'slug', 'description', 'post_count')
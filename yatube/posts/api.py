@@ -0,0 +1,236 @@
+"""JSON API: чтение постов и групп, пакетная публикация постов.
+
+Строки читаются через .values() только с запрошенными (?fields=)
+колонками и сразу отдаются в JSON, без моделей и шаблонов; JOIN с
+автором или группой появляется, лишь когда нужны их поля. Список постов
+пагинируется курсором, как HTML-ленты; ?ids=1,2,3 выбирает посты одним
+запросом. POST /api/posts/batch/ публикует список постов одной
+транзакцией.
+"""
+import json
+from functools import wraps
+
+from django.conf import settings
+from django.http import Http404, JsonResponse
+from django.views.decorators.http import require_POST, require_safe
+
+from yatube.replicas import use_replica
+from yatube.sqlite.writer import serialized_write
+
+from .forms import PostForm
+from .models import Group, Post
+from .paginators import CursorPaginator
+from .services import publish_posts
+
+# поле ответа -> колонка для .values()
+POST_FIELDS = {
+    'id': 'id',
+    'text': 'text',
+    'pub_date': 'pub_date',
+    'updated_at': 'updated_at',
+    'author': 'author__username',
+    'group': 'group__slug',
+}
+GROUP_FIELDS = {
+    'id': 'id',
+    'title': 'title',
+    'slug': 'slug',
+    'description': 'description',
+    'post_count': 'post_count',
+}
+
+
+class BadRequest(Exception):
+    status = 400
+
+
+class NotAuthenticated(BadRequest):
+    status = 401
+
+
+def json_response(data, status=200):
+    return JsonResponse(
+        data, status=status, json_dumps_params={'ensure_ascii': False}
+    )
+
+
+def json_api(view):
+    """Ответ view — данные или (данные, статус); ошибки — JSON."""
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        try:
+            data = view(request, *args, **kwargs)
+        except BadRequest as error:
+            return json_response({'error': str(error)}, status=error.status)
+        except Http404:
+            return json_response({'error': 'Не найдено'}, status=404)
+        if isinstance(data, tuple):
+            return json_response(*data)
+        return json_response(data)
+    return wrapper
+
+
+def api_view(view):
+    """Чтение: только GET/HEAD, с реплики."""
+    return require_safe(use_replica(json_api(view)))
+
+
+def requested_fields(request, available):
+    """Поля из ?fields=a,b в порядке available; без параметра — все."""
+    names = request.GET.get('fields')
+    if not names:
+        return list(available)
+    names = {name.strip() for name in names.split(',') if name.strip()}
+    unknown = names - set(available)
+    if unknown:
+        raise BadRequest(f'Неизвестные поля: {", ".join(sorted(unknown))}')
+    return [name for name in available if name in names]
+
+
+def page_size(request):
+    try:
+        size = int(request.GET.get('limit', settings.POSTS_API_PAGE_SIZE))
+    except ValueError:
+        raise BadRequest('limit должен быть числом')
+    return min(max(size, 1), settings.POSTS_API_MAX_PAGE_SIZE)
+
+
+def select(queryset, fields, mapping, extra=()):
+    """.values() под поля ответа; extra — колонки для курсора."""
+    columns = {mapping[name] for name in fields} | set(extra)
+    return queryset.values(*columns)
+
+
+def rows(items, fields, mapping):
+    return [{name: item[mapping[name]] for name in fields} for item in items]
+
+
+def paginate(request, queryset, fields, mapping, ordering):
+    key_columns = [
+        'id' if name == 'pk' else name
+        for name in (field.lstrip('-') for field in ordering)
+    ]
+    paginator = CursorPaginator(
+        select(queryset, fields, mapping, key_columns),
+        page_size(request), ordering=ordering
+    )
+    page = paginator.get_cursor_page(request.GET.get('cursor'))
+    return {
+        'results': rows(page.object_list, fields, mapping),
+        'next': page.next_cursor,
+        'previous': page.previous_cursor,
+    }
+
+
+def parse_ids(value):
+    try:
+        ids = [int(pk) for pk in value.split(',') if pk.strip()]
+    except ValueError:
+        raise BadRequest('ids — числа через запятую')
+    if len(ids) > settings.POSTS_API_MAX_PAGE_SIZE:
+        raise BadRequest(
+            f'Не больше {settings.POSTS_API_MAX_PAGE_SIZE} ids за запрос'
+        )
+    return ids
+
+
+@api_view
+def post_list(request):
+    """Лента постов; ?group=slug, ?author=username, ?ids=1,2,3."""
+    fields = requested_fields(request, POST_FIELDS)
+    queryset = Post.objects.all()
+    if 'ids' in request.GET:
+        ids = parse_ids(request.GET['ids'])
+        found = {
+            item['id']: item
+            for item in select(
+                queryset.filter(pk__in=ids), fields, POST_FIELDS, ['id']
+            )
+        }
+        return {
+            'results': rows(
+                [found[pk] for pk in ids if pk in found], fields, POST_FIELDS
+            ),
+            'missing': [pk for pk in ids if pk not in found],
+        }
+    if request.GET.get('group'):
+        queryset = queryset.filter(group__slug=request.GET['group'])
+    if request.GET.get('author'):
+        queryset = queryset.filter(author__username=request.GET['author'])
+    return paginate(
+        request, queryset, fields, POST_FIELDS, ('-pub_date', '-pk')
+    )
+
+
+@api_view
+def post_detail(request, post_id):
+    fields = requested_fields(request, POST_FIELDS)
+    item = select(
+        Post.objects.filter(pk=post_id), fields, POST_FIELDS
+    ).first()
+    if item is None:
+        raise Http404
+    return rows([item], fields, POST_FIELDS)[0]
+
+
+@api_view
+def group_list(request):
+    """Группы по id; ?q= — только с этой подстрокой в названии."""
+    fields = requested_fields(request, GROUP_FIELDS)
+    groups = Group.objects.all()
+    query = request.GET.get('q', '').strip()
+    if query:
+        groups = groups.filter(title__icontains=query)
+    return paginate(request, groups, fields, GROUP_FIELDS, ('pk',))
+
+
+@api_view
+def group_detail(request, slug):
+    fields = requested_fields(request, GROUP_FIELDS)
+    item = select(
+        Group.objects.filter(slug=slug), fields, GROUP_FIELDS
+    ).first()
+    if item is None:
+        raise Http404
+    return rows([item], fields, GROUP_FIELDS)[0]
+
+
+def create_posts(author, forms):
+    """bulk_create валидных форм и то, что сделали бы сигналы post_save."""
+    return publish_posts(author, [form.save(commit=False) for form in forms])
+
+
+@require_POST
+@json_api
+def post_batch(request):
+    """Опубликовать {"posts": [{"text": ..., "group": id}, ...]}.
+
+    Каждый элемент проверяется PostForm; валидные вставляются одним
+    bulk_create, по остальным в results возвращаются ошибки формы.
+    """
+    if not request.user.is_authenticated:
+        raise NotAuthenticated('Нужна авторизация')
+    try:
+        items = json.loads(request.body)['posts']
+    except (ValueError, KeyError, TypeError):
+        raise BadRequest('Ожидается JSON {"posts": [...]}')
+    if not isinstance(items, list) or not items:
+        raise BadRequest('posts — непустой список')
+    if len(items) > settings.POSTS_API_MAX_BATCH_SIZE:
+        raise BadRequest(
+            f'Не больше {settings.POSTS_API_MAX_BATCH_SIZE} постов за запрос'
+        )
+    forms = [
+        PostForm(item if isinstance(item, dict) else {}) for item in items
+    ]
+    valid = [form for form in forms if form.is_valid()]
+    posts = iter(
+        serialized_write(lambda: create_posts(request.user, valid))
+        if valid else ()
+    )
+    results = [
+        {'id': next(posts).pk} if form.is_valid()
+        else {'errors': form.errors.get_json_data()}
+        for form in forms
+    ]
+    return {'results': results}, 201 if valid else 400
@@ -0,0 +1,100 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from yatube.replicas import read_primary
+
+FEED_VERSION_KEY = 'posts:feed-version:{}'
+# метка «лента менялась последние DATABASE_REPLICA_PIN_SECONDS секунд»
+FEED_BUMPED_KEY = 'posts:feed-bumped:{}'
+INDEX_FEED = 'index'
+
+
+def group_feed(group_id):
+    return f'group:{group_id}'
+
+
+def author_feed(author_id):
+    return f'author:{author_id}'
+
+
+def _initial_version():
+    # Счётчик мог вытесниться из кэша вместе со старыми страницами или
+    # без них: стартуем с отметки времени, чтобы не совпасть с прошлыми
+    # версиями, чьи фрагменты ещё могут лежать в кэше.
+    return time.time_ns()
+
+
+def get_feed_version(feed):
+    """Версия ленты; недавно изменённая лента читается из основной базы.
+
+    Реплика могла ещё не получить запись, поднявшую версию, а фрагмент и
+    ETag под новой версией, собранные из её старых строк, жили бы до
+    следующей записи.
+    """
+    key = FEED_VERSION_KEY.format(feed)
+    bumped_key = FEED_BUMPED_KEY.format(feed)
+    values = cache.get_many([key, bumped_key])
+    if bumped_key in values:
+        read_primary()
+    version = values.get(key)
+    if version is None:
+        cache.add(key, _initial_version(), None)
+        version = cache.get(key)
+    return version
+
+
+def _bump(feeds):
+    for feed in feeds:
+        key = FEED_VERSION_KEY.format(feed)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, _initial_version(), None)
+    if settings.DATABASE_REPLICAS:
+        cache.set_many(
+            {FEED_BUMPED_KEY.format(feed): True for feed in feeds},
+            settings.DATABASE_REPLICA_PIN_SECONDS
+        )
+
+
+def bump_feed_versions(*feeds):
+    """Поднять версии лент; внутри транзакции — ещё раз после коммита.
+
+    Читатель, пришедший между записью и коммитом, видит старые строки и
+    кладёт их в кэш под уже поднятую версию; второй подъём из on_commit
+    их отменяет. Первый нужен самой транзакции: остаток запроса (и тест
+    в TestCase, где коммита нет) видит новую версию.
+    """
+    _bump(feeds)
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(lambda: _bump(feeds))
+
+
+def feed_cache(feed):
+    """Параметры тега {% cache %} для фрагмента ленты."""
+    return {
+        'key': f'{feed}:{get_feed_version(feed)}',
+        'timeout': settings.POSTS_FEED_CACHE_TIMEOUT,
+    }
+
+
+def page_etag(request, *parts):
+    """ETag страницы без рендера шаблона.
+
+    parts — всё, от чего зависит страница: версии лент, updated_at,
+    счётчики. К ним добавляются параметры запроса и зритель, потому
+    что навигация и кнопки подписки у каждого свои. Версии лент лежат в
+    кэше default, поэтому ETag верен, только если этот кэш общий для
+    всех процессов: это проверяет manage.py check --deploy (posts.E001).
+    """
+    user = request.user
+    key = '|'.join(str(part) for part in (
+        *parts,
+        request.GET.urlencode(),
+        user.pk if user.is_authenticated else '',
+    ))
+    return hashlib.md5(key.encode()).hexdigest()
@@ -0,0 +1,42 @@
+"""Проверки настроек для manage.py check --deploy."""
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+# кэши, которые видит только свой процесс (или никто)
+PROCESS_LOCAL_CACHES = {
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+}
+# общие, но incr в них — get и set: два воркера могут поднять версию
+# ленты до одного и того же числа
+NON_ATOMIC_INCR_CACHES = {
+    'django.core.cache.backends.filebased.FileBasedCache',
+    'django.core.cache.backends.db.DatabaseCache',
+}
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    """Версии лент (posts.cache) должны быть общими для всех процессов.
+
+    Из них собираются ключи фрагментов и ETag страниц. С кэшем процесса
+    запись, обработанная одним воркером, не поднимает версию в других,
+    и те без срока отдают старые фрагменты и 304 Not Modified.
+    """
+    backend = settings.CACHES['default']['BACKEND']
+    if backend in PROCESS_LOCAL_CACHES:
+        return [Error(
+            'Кэш default не общий для процессов: версии лент и ETag '
+            'страниц в каждом воркере будут свои.',
+            hint='Подключите memcached (см. yatube.settings_production).',
+            id='posts.E001',
+        )]
+    if backend in NON_ATOMIC_INCR_CACHES:
+        return [Error(
+            'incr кэша default не атомарный: одновременные записи '
+            'сольются в одну версию ленты, и останутся старые фрагменты '
+            'и ETag.',
+            hint='Подключите memcached (см. yatube.settings_production).',
+            id='posts.E002',
+        )]
+    return []
@@ -0,0 +1,111 @@
+from django.db.models import Count, F
+from django.db.models.functions import Greatest
+
+from .cache import author_feed, bump_feed_versions, group_feed
+from .models import AuthorStats, Follow, Group, Post, User
+
+
+def shifted(field, delta):
+    # Счётчик мог отстать от постов (bulk_create мимо сигналов,
+    # import_posts --no-recount): не опускаем его ниже нуля, иначе
+    # удаление упрётся в CHECK положительного поля. Точное значение
+    # вернёт recount_posts.
+    return Greatest(F(field) + delta, 0)
+
+
+def add_group_posts(group_id, delta):
+    Group.objects.filter(pk=group_id).update(
+        post_count=shifted('post_count', delta)
+    )
+
+
+def add_author_stat(author_id, field, delta):
+    updated = AuthorStats.objects.filter(author_id=author_id).update(
+        **{field: shifted(field, delta)}
+    )
+    if not updated and delta > 0:
+        stats, created = AuthorStats.objects.get_or_create(
+            author_id=author_id, defaults={field: delta}
+        )
+        if not created:
+            add_author_stat(author_id, field, delta)
+
+
+def add_author_posts(author_id, delta):
+    add_author_stat(author_id, 'post_count', delta)
+
+
+def recount_groups(dry_run=False, batch_size=500):
+    """Пересчитать Group.post_count, вернуть [(группа, было, стало)]."""
+    drift = []
+    stale = []
+    groups = Group.objects.annotate(actual=Count('posts')).only(
+        'pk', 'slug', 'post_count'
+    )
+    for group in groups.iterator():
+        if group.post_count != group.actual:
+            drift.append((group.slug, group.post_count, group.actual))
+            group.post_count = group.actual
+            stale.append(group)
+    if stale and not dry_run:
+        Group.objects.bulk_update(stale, ['post_count'], batch_size)
+        # post_count виден на странице группы и в posts.groups
+        bump_feed_versions(*(group_feed(group.pk) for group in stale))
+    return drift
+
+
+# счётчик AuthorStats -> (модель, поле автора, подпись в отчёте)
+AUTHOR_COUNTERS = {
+    'post_count': (Post, 'author_id', ''),
+    'follower_count': (Follow, 'author_id', ', подписчики'),
+    'following_count': (Follow, 'user_id', ', подписки'),
+}
+
+
+def count_by(model, field):
+    return dict(
+        model.objects.order_by().values(field).annotate(
+            total=Count('pk')
+        ).values_list(field, 'total')
+    )
+
+
+def recount_authors(dry_run=False, batch_size=500):
+    """Пересчитать AuthorStats, вернуть [(автор, было, стало)].
+
+    Ленты авторов с исправленными счётчиками получают новую версию:
+    счётчики видны на странице профиля.
+    """
+    fields = list(AUTHOR_COUNTERS)
+    actual = {
+        name: count_by(model, field)
+        for name, (model, field, _) in AUTHOR_COUNTERS.items()
+    }
+    stored = {
+        row[0]: list(row[1:])
+        for row in AuthorStats.objects.values_list('author_id', *fields)
+    }
+    drift = []
+    stale = []
+    missing = []
+    for author_id, username in User.objects.values_list(
+        'pk', 'username'
+    ).iterator():
+        counts = [actual[name].get(author_id, 0) for name in fields]
+        current = stored.get(author_id)
+        if current == counts or (current is None and not any(counts)):
+            continue
+        for name, was, now in zip(fields, current or [0] * len(fields),
+                                  counts):
+            if was != now:
+                label = AUTHOR_COUNTERS[name][2]
+                drift.append((f'{username}{label}', was, now))
+        stats = AuthorStats(author_id=author_id, **dict(zip(fields, counts)))
+        (missing if current is None else stale).append(stats)
+    if not dry_run:
+        AuthorStats.objects.bulk_create(missing, batch_size)
+        AuthorStats.objects.bulk_update(stale, fields, batch_size)
+        bump_feed_versions(*(
+            author_feed(stats.author_id) for stats in missing + stale
+        ))
+    return drift
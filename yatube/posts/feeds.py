@@ -0,0 +1,237 @@
+"""Потоковые RSS, Atom и JSON Feed для лент с ограниченной памятью.
+
+Посты читаются queryset.iterator(chunk_size) и пишутся в ответ по мере
+чтения, поэтому выгрузка всей истории не держит её в памяти. Для
+инкрементальной загрузки ответ несёт в заголовке SINCE_HEADER курсор
+самого нового поста: с ?since=<курсор> лента отдаёт только то, что
+опубликовано после него.
+"""
+import io
+import json
+
+from django.conf import settings
+from django.db.models import Q
+from django.urls import reverse
+from django.template.defaultfilters import linebreaksbr
+from django.utils.feedgenerator import (
+    Atom1Feed, Rss201rev2Feed, SyndicationFeed
+)
+from django.utils.text import Truncator
+from django.utils.xmlutils import SimplerXMLGenerator
+
+from .models import Post
+from .paginators import dump_cursor, load_cursor
+
+SINCE_HEADER = 'X-Feed-Since'
+JSON_FEED_VERSION = 'https://jsonfeed.org/version/1.1'
+
+
+def dump_since(post):
+    return dump_cursor([
+        Post._meta.get_field('pub_date').value_to_string(post), post.pk
+    ])
+
+
+def load_since(since):
+    """(pub_date, pk) из курсора; None для битого, как у пагинатора."""
+    try:
+        pub_date, pk = load_cursor(since)
+        pub_date = Post._meta.get_field('pub_date').to_python(pub_date)
+    except (TypeError, ValueError):
+        return None
+    if pub_date is None or not isinstance(pk, int):
+        return None
+    return pub_date, pk
+
+
+def feed_posts(queryset, since=None, limit=None):
+    """Посты от новых к старым; с since — все, что новее курсора.
+
+    limit к инкрементальной выборке не применяется: срезались бы самые
+    старые из новых постов, и в ленте клиента осталась бы дыра.
+    """
+    queryset = queryset.select_related('author', 'group').order_by(
+        '-pub_date', '-pk'
+    )
+    since = load_since(since) if since else None
+    if since is not None:
+        pub_date, pk = since
+        queryset = queryset.filter(
+            Q(pub_date__gt=pub_date) | Q(pub_date=pub_date, pk__gt=pk)
+        )
+    elif limit:
+        queryset = queryset[:limit]
+    return queryset.iterator(settings.POSTS_FEED_CHUNK_SIZE)
+
+
+class Buffered(io.StringIO):
+    """Копит вывод и отдаёт его кусками не меньше POSTS_FEED_FLUSH_SIZE.
+
+    Мелкие куски по посту раздули бы ответ: CompressionMiddleware
+    сбрасывает сжатие после каждого куска.
+    """
+
+    def drain(self, force=False):
+        if not force and self.tell() < settings.POSTS_FEED_FLUSH_SIZE:
+            return ''
+        data = self.getvalue()
+        self.seek(0)
+        self.truncate()
+        return data
+
+
+class XMLFeedStream:
+    """Потоковая запись через генераторы Django (feedgenerator).
+
+    SyndicationFeed.write() требует все элементы в self.items; здесь
+    используются те же методы для корня и элементов, но элементы
+    пишутся по одному.
+    """
+    item_tag = None
+
+    def __init__(self, latest=None, **kwargs):
+        super().__init__(**kwargs)
+        self.latest = latest
+
+    def latest_post_date(self):
+        # без перебора self.items: новейший пост известен заранее
+        return self.latest or super().latest_post_date()
+
+    def stream(self, items):
+        output = Buffered()
+        handler = SimplerXMLGenerator(output, 'utf-8')
+        self.open(handler)
+        for item in items:
+            self.add_item(**item)
+            item = self.items.pop()
+            handler.startElement(self.item_tag, self.item_attributes(item))
+            self.add_item_elements(handler, item)
+            handler.endElement(self.item_tag)
+            data = output.drain()
+            if data:
+                yield data
+        self.close(handler)
+        yield output.drain(force=True)
+
+
+class RssStream(XMLFeedStream, Rss201rev2Feed):
+    item_tag = 'item'
+
+    def open(self, handler):
+        handler.startDocument()
+        handler.startElement('rss', self.rss_attributes())
+        handler.startElement('channel', self.root_attributes())
+        self.add_root_elements(handler)
+
+    def close(self, handler):
+        self.endChannelElement(handler)
+        handler.endElement('rss')
+
+
+class AtomStream(XMLFeedStream, Atom1Feed):
+    item_tag = 'entry'
+
+    def open(self, handler):
+        handler.startDocument()
+        handler.startElement('feed', self.root_attributes())
+        self.add_root_elements(handler)
+
+    def close(self, handler):
+        handler.endElement('feed')
+
+
+class JSONFeedStream(SyndicationFeed):
+    """JSON Feed 1.1: https://www.jsonfeed.org/version/1.1/"""
+    content_type = 'application/feed+json; charset=utf-8'
+
+    def __init__(self, latest=None, **kwargs):
+        # даты всей ленты в JSON Feed нет
+        super().__init__(**kwargs)
+
+    def stream(self, items):
+        output = Buffered()
+        header = json.dumps({
+            'version': JSON_FEED_VERSION,
+            'title': self.feed['title'],
+            'home_page_url': self.feed['link'],
+            'feed_url': self.feed['feed_url'],
+            'description': self.feed['description'],
+        }, ensure_ascii=False)
+        # заголовок без закрывающей скобки: дальше идёт массив items
+        output.write(header[:-1] + ', "items": [')
+        separator = ''
+        for item in items:
+            output.write(separator + json.dumps({
+                'id': item['unique_id'],
+                'url': item['link'],
+                'title': item['title'],
+                'content_html': item['description'],
+                'date_published': item['pubdate'].isoformat(),
+                'date_modified': item['updateddate'].isoformat(),
+                'authors': [{'name': item['author_name'],
+                             'url': item['author_link']}],
+                'tags': item['categories'],
+            }, ensure_ascii=False))
+            separator = ', '
+            data = output.drain()
+            if data:
+                yield data
+        output.write(']}')
+        yield output.drain(force=True)
+
+
+FORMATS = {
+    'rss': RssStream,
+    'atom': AtomStream,
+    'json': JSONFeedStream,
+}
+
+
+def post_item(request, post):
+    author = post.author
+    link = request.build_absolute_uri(reverse(
+        'post_view',
+        kwargs={'username': author.username, 'post_id': post.pk}
+    ))
+    return {
+        'title': Truncator(post.text.split('\n', 1)[0]).chars(80),
+        'link': link,
+        'unique_id': link,
+        # описание в RSS и Atom — HTML, как у карточки поста
+        'description': linebreaksbr(post.text, autoescape=True),
+        'author_name': author.get_full_name() or author.username,
+        'author_link': request.build_absolute_uri(
+            reverse('profile', kwargs={'username': author.username})
+        ),
+        'pubdate': post.pub_date,
+        'updateddate': post.updated_at,
+        'categories': [post.group.title] if post.group_id else [],
+    }
+
+
+def stream_feed(request, fmt, title, link, description, posts):
+    """Генератор тела ответа и курсор since для заголовка.
+
+    Первый пост читается заранее: из него берутся дата ленты и курсор,
+    которые нужны до того, как начнётся запись тела.
+    """
+    posts = iter(posts)
+    newest = next(posts, None)
+    feed = FORMATS[fmt](
+        title=title,
+        link=request.build_absolute_uri(link),
+        description=description,
+        feed_url=request.build_absolute_uri(request.path),
+        language=settings.LANGUAGE_CODE,
+        latest=newest.updated_at if newest else None,
+    )
+
+    def items():
+        if newest is None:
+            return
+        yield post_item(request, newest)
+        for post in posts:
+            yield post_item(request, post)
+
+    since = dump_since(newest) if newest else request.GET.get('since', '')
+    return feed.content_type, feed.stream(items()), since
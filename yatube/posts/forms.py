@@ -1,9 +1,74 @@
-from django.forms import ModelForm
+from django.forms import ModelForm, Select
+from django.urls import reverse
+from django.utils.html import format_html
 from django.utils.translation import gettext_lazy as _
 
+from .groups import get_group, get_group_by_slug
 from .models import Post
 
 
+class GroupSelect(Select):
+    """Select группы, в котором отрисован только выбранный вариант.
+
+    Обычный Select выводит все группы, и с тысячами групп страница формы
+    растёт вместе с таблицей. Остальные варианты подгружает
+    posts/group_select.js из /api/groups/?q= по мере ввода. Без
+    JavaScript группу можно указать по slug в поле из <noscript>: оно
+    важнее выбора в списке.
+    """
+    slug_suffix = '_slug'
+
+    class Media:
+        js = ('posts/group_select.js',)
+
+    def get_context(self, name, value, attrs):
+        context = super().get_context(name, value, attrs)
+        context['widget']['attrs']['data-autocomplete'] = reverse(
+            'api_groups'
+        )
+        return context
+
+    def render(self, name, value, attrs=None, renderer=None):
+        html = super().render(name, value, attrs, renderer)
+        return html + format_html(
+            '<noscript><input type="text" name="{}" class="{}" '
+            'placeholder="slug группы" aria-label="slug группы"></noscript>',
+            name + self.slug_suffix, (attrs or {}).get('class', ''),
+        )
+
+    def value_from_datadict(self, data, files, name):
+        slug = data.get(name + self.slug_suffix, '').strip()
+        if not slug:
+            return super().value_from_datadict(data, files, name)
+        group = get_group_by_slug(slug)
+        # неизвестный slug поле отклонит как недопустимый вариант
+        return str(group.pk) if group is not None else slug
+
+    def value_omitted_from_data(self, data, files, name):
+        return (
+            super().value_omitted_from_data(data, files, name)
+            and name + self.slug_suffix not in data
+        )
+
+    def selected_choices(self, value):
+        for pk in value:
+            group = get_group(int(pk)) if pk.isdigit() else None
+            if group is not None:
+                yield pk, str(group)
+
+    def optgroups(self, name, value, attrs=None):
+        choices = list(self.selected_choices(value))
+        field = getattr(self.choices, 'field', None)
+        if field is not None and field.empty_label is not None:
+            choices.insert(0, ('', field.empty_label))
+        return [
+            (None, [self.create_option(
+                name, choice, label, choice in value, index, attrs=attrs
+            )], index)
+            for index, (choice, label) in enumerate(choices)
+        ]
+
+
 class PostForm(ModelForm):
     class Meta:
         model = Post
@@ -16,3 +81,6 @@ class PostForm(ModelForm):
             'text': _('Поле для ввода содержимого поста.'),
             'group': _('Выбрать группу, где будет запощен пост'),
         }
+        widgets = {
+            'group': GroupSelect,
+        }
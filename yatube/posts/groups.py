@@ -0,0 +1,100 @@
+"""Справочник групп: Group по slug или id без запроса к БД.
+
+Группа нужна странице группы, её лентам, поиску и полю группы в форме
+поста. Записи лежат в памяти процесса и в общем кэше под версией ленты
+группы (posts.cache): её поднимают сигналы при сохранении и удалении
+группы и при каждом посте в ней, так что ни один процесс не отдаст
+устаревший заголовок или post_count. Соответствие slug -> id
+проверяется по загруженной группе: переименованная или удалённая группа
+ищется по slug заново.
+"""
+import copy
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import Http404
+
+from .cache import get_feed_version, group_feed
+from .models import Group
+
+GROUP_SLUG_KEY = 'posts:group-slug:{}'
+GROUP_KEY = 'posts:group:{}:{}'
+
+# в памяти процесса: slug -> id и id -> (версия, Group)
+_slugs = {}
+_groups = {}
+
+
+def remember(group, version=None, shared=True):
+    if version is None:
+        version = get_feed_version(group_feed(group.pk))
+    if shared:
+        cache.set(
+            GROUP_KEY.format(group.pk, version), group,
+            settings.POSTS_GROUPS_CACHE_TIMEOUT
+        )
+    _groups[group.pk] = (version, group)
+    return copy.copy(group)
+
+
+def forget_slug(slug):
+    _slugs.pop(slug, None)
+    cache.delete(GROUP_SLUG_KEY.format(slug))
+
+
+def get_group(pk):
+    """Group по id или None; копия, чтобы запросы не делили объект."""
+    version = get_feed_version(group_feed(pk))
+    entry = _groups.get(pk)
+    if entry is not None and entry[0] == version:
+        return copy.copy(entry[1])
+    group = cache.get(GROUP_KEY.format(pk, version))
+    if group is not None:
+        return remember(group, version, shared=False)
+    group = Group.objects.filter(pk=pk).first()
+    if group is None:
+        _groups.pop(pk, None)
+        return None
+    return remember(group, version)
+
+
+def load_by_slug(slug):
+    """Промах по slug: id группы, а саму группу — через get_group().
+
+    Версия ленты группы читается до строки группы: иначе старая строка
+    с реплики попала бы в кэш под новой версией.
+    """
+    pk = Group.objects.filter(slug=slug).values_list('pk', flat=True).first()
+    if pk is None:
+        return None
+    _slugs[slug] = pk
+    cache.set(
+        GROUP_SLUG_KEY.format(slug), pk, settings.POSTS_GROUPS_CACHE_TIMEOUT
+    )
+    group = get_group(pk)
+    if group is None or group.slug != slug:
+        # переименовали между двумя запросами
+        return None
+    return group
+
+
+def get_group_by_slug(slug):
+    pk = _slugs.get(slug)
+    if pk is None:
+        pk = cache.get(GROUP_SLUG_KEY.format(slug))
+        if pk is None:
+            return load_by_slug(slug)
+        _slugs[slug] = pk
+    group = get_group(pk)
+    if group is not None and group.slug == slug:
+        return group
+    # группу переименовали или удалили: slug ищется заново
+    forget_slug(slug)
+    return load_by_slug(slug)
+
+
+def get_group_or_404(slug):
+    group = get_group_by_slug(slug)
+    if group is None:
+        raise Http404('Группа не найдена')
+    return group
@@ -0,0 +1,42 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from posts.transfer import (
+    FORMATS, export_rows, guess_format, peak_memory_mb, write_rows
+)
+
+
+class Command(BaseCommand):
+    help = 'Выгрузить посты потоком в JSON Lines или CSV'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output', '-o',
+            default='-',
+            help='Файл для выгрузки, «-» — stdout.',
+        )
+        parser.add_argument('--format', choices=FORMATS)
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=2000,
+            help='Сколько строк за раз читать из БД.',
+        )
+
+    def handle(self, *args, **options):
+        path = options['output']
+        fmt = guess_format(path, options['format'])
+        start = time.perf_counter()
+        rows = export_rows(chunk_size=options['chunk_size'])
+        if path == '-':
+            count = write_rows(rows, self.stdout, fmt)
+        else:
+            with open(path, 'w', encoding='utf-8', newline='') as stream:
+                count = write_rows(rows, stream, fmt)
+        elapsed = time.perf_counter() - start
+        self.stderr.write(
+            f'Выгружено постов: {count} за {elapsed:.1f} с '
+            f'({count / elapsed if elapsed else 0:.0f} строк/с), '
+            f'пик памяти {peak_memory_mb()} МБ'
+        )
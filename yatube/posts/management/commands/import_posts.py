@@ -0,0 +1,100 @@
+import sys
+import time
+from collections import Counter
+
+from django.core.management.base import BaseCommand
+
+from posts.cache import (
+    INDEX_FEED, author_feed, bump_feed_versions, group_feed
+)
+from posts.counters import recount_authors, recount_groups
+from posts.transfer import (
+    FORMATS, guess_format, import_rows, peak_memory_mb, read_rows
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Загрузить посты из JSON Lines или CSV пачками через bulk_create. '
+        'В ленты подписок уже подписанных читателей загруженные посты не '
+        'раскладываются: это архив, а не новые публикации; новые '
+        'подписчики получат последние из них при подписке.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Файл с постами, «-» — stdin.')
+        parser.add_argument('--format', choices=FORMATS)
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Постов в одной транзакции.',
+        )
+        parser.add_argument(
+            '--create-authors',
+            action='store_true',
+            help='Создавать неизвестных авторов без пароля.',
+        )
+        parser.add_argument(
+            '--create-groups',
+            action='store_true',
+            help='Создавать неизвестные группы по slug.',
+        )
+        parser.add_argument(
+            '--no-recount',
+            action='store_true',
+            help='Не пересчитывать счётчики постов после загрузки.',
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = guess_format(path, options['format'])
+        start = time.perf_counter()
+
+        def progress(imported, skipped):
+            if options['verbosity'] > 1:
+                elapsed = time.perf_counter() - start
+                self.stderr.write(
+                    f'{imported} загружено, {skipped} пропущено, '
+                    f'{imported / elapsed:.0f} строк/с, '
+                    f'пик памяти {peak_memory_mb()} МБ'
+                )
+
+        reasons = Counter()
+
+        def skipped_row(number, reason):
+            reasons[reason] += 1
+            if options['verbosity'] > 1:
+                self.stderr.write(f'строка {number} пропущена: {reason}')
+
+        import_options = {
+            'batch_size': options['batch_size'],
+            'create_authors': options['create_authors'],
+            'create_groups': options['create_groups'],
+            'on_batch': progress,
+            'on_skip': skipped_row,
+        }
+        if path == '-':
+            result = import_rows(read_rows(sys.stdin, fmt), **import_options)
+        else:
+            with open(path, encoding='utf-8', newline='') as stream:
+                result = import_rows(read_rows(stream, fmt), **import_options)
+        imported, skipped, authors, groups = result
+        elapsed = time.perf_counter() - start
+
+        if imported:
+            if not options['no_recount']:
+                recount_groups()
+                recount_authors()
+            bump_feed_versions(
+                INDEX_FEED,
+                *(author_feed(pk) for pk in authors),
+                *(group_feed(pk) for pk in groups)
+            )
+        self.stdout.write(
+            f'Загружено постов: {imported}, пропущено: {skipped}, '
+            f'{elapsed:.1f} с ({imported / elapsed if elapsed else 0:.0f} '
+            f'строк/с), пик памяти {peak_memory_mb()} МБ'
+        )
+        for reason, count in reasons.most_common():
+            self.stderr.write(f'пропущено ({reason}): {count}')
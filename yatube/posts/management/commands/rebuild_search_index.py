@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from posts.search import (
+    fts_available, install_search_index, rebuild_search_index
+)
+
+
+class Command(BaseCommand):
+    help = 'Перестроить полнотекстовый индекс постов (SQLite FTS5)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--optimize',
+            action='store_true',
+            help='После перестройки слить сегменты индекса.',
+        )
+
+    def handle(self, *args, **options):
+        if not fts_available():
+            raise CommandError('Полнотекстовый индекс есть только на SQLite.')
+        install_search_index(connection)
+        rebuild_search_index(connection, optimize=options['optimize'])
+        self.stdout.write(self.style.SUCCESS('Поисковый индекс перестроен.'))
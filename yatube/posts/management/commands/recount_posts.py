@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+
+from posts.counters import recount_authors, recount_groups
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитать счётчики постов групп и авторов, подписчиков и '
+        'подписок и показать расхождения'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Только показать расхождения, ничего не записывая.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Размер пачки для bulk_update/bulk_create.',
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+        batch_size = options['batch_size']
+        for title, recount in (
+            ('Группы', recount_groups),
+            ('Авторы', recount_authors),
+        ):
+            drift = recount(dry_run=dry_run, batch_size=batch_size)
+            for name, stored, actual in drift:
+                self.stdout.write(f'  {name}: {stored} -> {actual}')
+            self.stdout.write(f'{title}: расхождений {len(drift)}')
+        if dry_run:
+            self.stdout.write('Счётчики не изменены (--dry-run).')
+        else:
+            self.stdout.write(self.style.SUCCESS('Счётчики пересчитаны.'))
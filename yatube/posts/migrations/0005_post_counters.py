@@ -0,0 +1,56 @@
+# Generated by Django 2.2.28 on 2026-10-18 17:52
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+import django.db.models.deletion
+
+
+def fill_post_counters(apps, schema_editor):
+    Group = apps.get_model('posts', 'Group')
+    AuthorStats = apps.get_model('posts', 'AuthorStats')
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split('.'))
+    groups = list(Group.objects.annotate(actual=Count('posts')))
+    for group in groups:
+        group.post_count = group.actual
+    Group.objects.bulk_update(groups, ['post_count'], batch_size=500)
+    AuthorStats.objects.bulk_create(
+        [
+            AuthorStats(author_id=author['id'], post_count=author['actual'])
+            for author in User.objects.annotate(
+                actual=Count('posts')
+            ).filter(actual__gt=0).values('id', 'actual').iterator()
+        ],
+        batch_size=500
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('posts', '0004_feed_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuthorStats',
+            fields=[
+                (
+                    'author',
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name='stats',
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL)),
+                ('post_count', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='group',
+            name='post_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_post_counters, migrations.RunPython.noop),
+    ]
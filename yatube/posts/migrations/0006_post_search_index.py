@@ -0,0 +1,24 @@
+from django.db import migrations
+
+
+def install(apps, schema_editor):
+    from posts.search import install_search_index, rebuild_search_index
+    install_search_index(schema_editor.connection)
+    if schema_editor.connection.vendor == 'sqlite':
+        rebuild_search_index(schema_editor.connection)
+
+
+def uninstall(apps, schema_editor):
+    from posts.search import uninstall_search_index
+    uninstall_search_index(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0005_post_counters'),
+    ]
+
+    operations = [
+        migrations.RunPython(install, uninstall),
+    ]
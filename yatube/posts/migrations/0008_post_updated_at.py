@@ -0,0 +1,44 @@
+from django.db import migrations, models
+from django.db.models import F
+import django.utils.timezone
+
+
+def copy_pub_date(apps, schema_editor):
+    Post = apps.get_model('posts', 'Post')
+    Post.objects.using(schema_editor.connection.alias).update(
+        updated_at=F('pub_date')
+    )
+
+
+def reinstall_search_index(apps, schema_editor):
+    # AddField/RemoveField на SQLite пересоздают posts_post вместе
+    # с триггерами FTS
+    from posts.search import install_search_index
+    install_search_index(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0007_follow_timeline'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            migrations.RunPython.noop, reinstall_search_index
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='updated_at',
+            field=models.DateTimeField(
+                auto_now=True,
+                default=django.utils.timezone.now,
+                verbose_name='date updated'
+            ),
+            preserve_default=False,
+        ),
+        migrations.RunPython(
+            reinstall_search_index, migrations.RunPython.noop
+        ),
+        migrations.RunPython(copy_pub_date, migrations.RunPython.noop),
+    ]
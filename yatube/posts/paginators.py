@@ -0,0 +1,176 @@
+import base64
+import binascii
+import json
+from types import SimpleNamespace
+
+from django.core.exceptions import ValidationError
+from django.core.paginator import Page, Paginator
+from django.db.models import Q
+
+
+def dump_cursor(values):
+    """Упаковать JSON-сериализуемые значения в непрозрачный токен."""
+    raw = json.dumps(values).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def load_cursor(cursor):
+    """Распаковать токен; ValueError, если он битый."""
+    try:
+        padding = '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(cursor + padding))
+    except (TypeError, ValueError, binascii.Error):
+        raise ValueError('Некорректный курсор')
+    if not isinstance(values, list):
+        raise ValueError('Некорректный курсор')
+    return values
+
+
+class CursorPage(Page):
+    """Страница keyset-пагинации: вместо номера хранит курсоры соседей."""
+
+    def __init__(self, object_list, paginator, next_cursor, previous_cursor):
+        super().__init__(object_list, None, paginator)
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __repr__(self):
+        return '<Cursor page>'
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+
+class CursorPaginator(Paginator):
+    """Keyset-пагинатор по (pub_date, id): без COUNT(*) и OFFSET.
+
+    Любая страница выбирается одним запросом
+    `WHERE key < cursor ORDER BY key LIMIT per_page + 1`.
+    """
+    NEXT = 'n'
+    PREVIOUS = 'p'
+    # предел ?page=N, когда счётчик постов ленты не передан
+    MAX_LEGACY_PAGE = 1000
+
+    def __init__(self, object_list, per_page, ordering=('-pub_date', '-pk'),
+                 count=None):
+        directions = {field.startswith('-') for field in ordering}
+        if len(directions) != 1:
+            raise ValueError('Поля ключа должны сортироваться в одну сторону')
+        self.descending = directions.pop()
+        self.key_fields = [field.lstrip('-') for field in ordering]
+        self.ordering = list(ordering)
+        super().__init__(object_list.order_by(*ordering), per_page)
+        if count is not None:
+            # готовый счётчик вместо SELECT COUNT(*) в Paginator.count
+            self.count = count
+
+    def _reverse_ordering(self):
+        return [
+            field[1:] if field.startswith('-') else f'-{field}'
+            for field in self.ordering
+        ]
+
+    def _model_field(self, name):
+        opts = self.object_list.model._meta
+        return opts.pk if name == 'pk' else opts.get_field(name)
+
+    def _key(self, obj):
+        if isinstance(obj, dict):
+            # строка .values(): поля ключа читаются по attname
+            obj = SimpleNamespace(**obj)
+        return [
+            self._model_field(name).value_to_string(obj)
+            for name in self.key_fields
+        ]
+
+    def encode_cursor(self, direction, obj):
+        return dump_cursor([direction] + self._key(obj))
+
+    def decode_cursor(self, cursor):
+        """Вернуть (направление, значения ключа) или None для битого токена."""
+        try:
+            direction, *raw = load_cursor(cursor)
+            if (direction not in (self.NEXT, self.PREVIOUS)
+                    or len(raw) != len(self.key_fields)):
+                return None
+            values = [
+                self._model_field(name).to_python(value)
+                for name, value in zip(self.key_fields, raw)
+            ]
+        except (TypeError, ValueError, ValidationError):
+            return None
+        if any(value is None for value in values):
+            return None
+        return direction, values
+
+    def _after(self, values, forward):
+        """Условие «строго за ключом» в порядке обхода."""
+        lookup = 'lt' if self.descending == forward else 'gt'
+        condition = Q()
+        for i, name in enumerate(self.key_fields):
+            step = Q(**{f'{name}__{lookup}': values[i]})
+            for prev_name, prev_value in zip(self.key_fields[:i], values):
+                step &= Q(**{prev_name: prev_value})
+            condition |= step
+        return condition
+
+    def cursor_for_page(self, number):
+        """Курсор страницы number (с 1); None — первая или за концом ленты.
+
+        Нужен только старым ссылкам ?page=N: последний пост предыдущей
+        страницы выбирается одним запросом с OFFSET. Номер ограничен
+        числом страниц по готовому счётчику, а без него —
+        MAX_LEGACY_PAGE, чтобы ссылка не заставляла базу листать
+        миллионы строк.
+        """
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            return None
+        last = (
+            self.num_pages if 'count' in self.__dict__
+            else self.MAX_LEGACY_PAGE
+        )
+        if not 1 < number <= last:
+            return None
+        offset = (number - 1) * self.per_page - 1
+        items = list(self.object_list[offset:offset + 1])
+        if not items:
+            return None
+        return self.encode_cursor(self.NEXT, items[0])
+
+    def get_cursor_page(self, cursor=None):
+        """Вернуть страницу по курсору; пустой или битый курсор — первая."""
+        decoded = self.decode_cursor(cursor) if cursor else None
+        if decoded is None:
+            items = list(self.object_list[:self.per_page + 1])
+            has_more = len(items) > self.per_page
+            items = items[:self.per_page]
+            return self._build_page(items, has_next=has_more,
+                                    has_previous=False)
+
+        direction, values = decoded
+        forward = direction == self.NEXT
+        queryset = self.object_list.filter(self._after(values, forward))
+        if not forward:
+            queryset = queryset.order_by(*self._reverse_ordering())
+        items = list(queryset[:self.per_page + 1])
+        has_more = len(items) > self.per_page
+        items = items[:self.per_page]
+        if forward:
+            return self._build_page(items, has_next=has_more,
+                                    has_previous=True)
+        items.reverse()
+        return self._build_page(items, has_next=True, has_previous=has_more)
+
+    def _build_page(self, items, has_next, has_previous):
+        next_cursor = previous_cursor = None
+        if items and has_next:
+            next_cursor = self.encode_cursor(self.NEXT, items[-1])
+        if items and has_previous:
+            previous_cursor = self.encode_cursor(self.PREVIOUS, items[0])
+        return CursorPage(items, self, next_cursor, previous_cursor)
@@ -0,0 +1,196 @@
+import re
+
+from django.db import connection
+
+from .models import Post
+from .paginators import CursorPage, dump_cursor, load_cursor
+
+FTS_TABLE = 'posts_post_fts'
+
+# Внешний контент: FTS5 хранит только индекс, текст берётся из posts_post.
+# Триггеры ловят и bulk_create, и QuerySet.update, минуя сигналы.
+# Перестройка posts_post миграцией на SQLite удаляет триггеры —
+# после таких миграций нужно снова вызвать install_search_index().
+FTS_SQL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        text, content='posts_post', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai
+        AFTER INSERT ON posts_post BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, text) VALUES (new.id, new.text);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad
+        AFTER DELETE ON posts_post BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, text)
+        VALUES ('delete', old.id, old.text);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au
+        AFTER UPDATE OF text ON posts_post BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, text)
+        VALUES ('delete', old.id, old.text);
+        INSERT INTO {FTS_TABLE}(rowid, text) VALUES (new.id, new.text);
+    END""",
+]
+DROP_FTS_SQL = [
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_ai',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_ad',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_au',
+    f'DROP TABLE IF EXISTS {FTS_TABLE}',
+]
+
+WORD = re.compile(r'\w+')
+NEXT = 'n'
+PREVIOUS = 'p'
+
+
+def fts_available(using=connection):
+    return using.vendor == 'sqlite'
+
+
+def install_search_index(using=connection):
+    if not fts_available(using):
+        return
+    with using.cursor() as cursor:
+        for statement in FTS_SQL:
+            cursor.execute(statement)
+
+
+def uninstall_search_index(using=connection):
+    if not fts_available(using):
+        return
+    with using.cursor() as cursor:
+        for statement in DROP_FTS_SQL:
+            cursor.execute(statement)
+
+
+def rebuild_search_index(using=connection, optimize=False):
+    with using.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"
+        )
+        if optimize:
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')"
+            )
+
+
+def build_match(query):
+    """Запрос пользователя → выражение MATCH: все слова, по префиксу.
+
+    Каждое слово берётся в кавычки, чтобы операторы и знаки FTS5 из
+    ввода не ломали синтаксис.
+    """
+    return ' '.join(f'"{word}"*' for word in WORD.findall(query))
+
+
+def filter_matching(queryset, query):
+    """Оставить в queryset постов только совпавшие с запросом."""
+    match = build_match(query)
+    if not match:
+        return queryset.none()
+    # RawSQL в `pk__in` SQLite читает как список из одного скалярного
+    # подзапроса, поэтому условие добавляется через extra().
+    return queryset.extra(
+        where=[
+            f'"posts_post"."id" IN (SELECT rowid FROM {FTS_TABLE} '
+            f'WHERE {FTS_TABLE} MATCH %s)'
+        ],
+        params=[match]
+    )
+
+
+def search_posts(query, group=None, author=None, cursor=None, per_page=10):
+    """Страница постов по релевантности (bm25), затем по id.
+
+    Курсор — направление и пара (id, rank) крайнего поста, поэтому
+    соседняя страница в любую сторону стоит столько же, сколько первая.
+    """
+    match = build_match(query)
+    if not match:
+        return CursorPage([], None, None, None)
+    if not fts_available():
+        return _search_posts_like(query, group, author, cursor, per_page)
+
+    where = [f'{FTS_TABLE} MATCH %s']
+    params = [match]
+    if group is not None:
+        where.append('p.group_id = %s')
+        params.append(group.pk)
+    if author is not None:
+        where.append('p.author_id = %s')
+        params.append(author.pk)
+    after = _load_search_cursor(cursor)
+    forward = after is None or after[0] == NEXT
+    if after is not None:
+        op = '>' if forward else '<'
+        where.append(f'(bm25({FTS_TABLE}) {op} %s '
+                     f'OR (bm25({FTS_TABLE}) = %s AND p.id {op} %s))')
+        params += [after[1], after[1], after[2]]
+    order = 'rank, p.id' if forward else 'rank DESC, p.id DESC'
+    sql = (
+        f'SELECT p.id, bm25({FTS_TABLE}) AS rank FROM {FTS_TABLE} '
+        f'JOIN posts_post p ON p.id = {FTS_TABLE}.rowid '
+        f'WHERE {" AND ".join(where)} '
+        f'ORDER BY {order} LIMIT %s'
+    )
+    with connection.cursor() as db:
+        db.execute(sql, params + [per_page + 1])
+        rows = db.fetchall()
+    return _search_page(rows, per_page, after, forward)
+
+
+def _search_page(rows, per_page, after, forward):
+    """rows — пары (id, rank) в порядке обхода, на одну больше страницы."""
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    if not forward:
+        rows.reverse()
+    has_next = has_more if forward else True
+    has_previous = after is not None if forward else has_more
+    posts = Post.objects.for_feed().in_bulk([pk for pk, rank in rows])
+    next_cursor = previous_cursor = None
+    if rows and has_next:
+        next_cursor = dump_cursor([NEXT, *rows[-1]])
+    if rows and has_previous:
+        previous_cursor = dump_cursor([PREVIOUS, *rows[0]])
+    return CursorPage(
+        [posts[pk] for pk, rank in rows if pk in posts],
+        None, next_cursor, previous_cursor
+    )
+
+
+def _load_search_cursor(cursor):
+    """(направление, rank, id); курсор без направления ведёт вперёд."""
+    if not cursor:
+        return None
+    try:
+        values = load_cursor(cursor)
+        direction = values.pop(0) if len(values) == 3 else NEXT
+        pk, rank = values
+        if direction not in (NEXT, PREVIOUS):
+            return None
+        return direction, float(rank), int(pk)
+    except (TypeError, ValueError):
+        return None
+
+
+def _search_posts_like(query, group, author, cursor, per_page):
+    # Запасной путь для СУБД без FTS5: подстрока по всем словам.
+    post_list = Post.objects.all()
+    for word in WORD.findall(query):
+        post_list = post_list.filter(text__icontains=word)
+    if group is not None:
+        post_list = post_list.filter(group=group)
+    if author is not None:
+        post_list = post_list.filter(author=author)
+    after = _load_search_cursor(cursor)
+    forward = after is None or after[0] == NEXT
+    if after is not None:
+        lookup = 'pk__lt' if forward else 'pk__gt'
+        post_list = post_list.filter(**{lookup: after[2]})
+    post_list = post_list.order_by('-pk' if forward else 'pk')
+    rows = [(pk, 0) for pk in post_list.values_list(
+        'pk', flat=True
+    )[:per_page + 1]]
+    return _search_page(rows, per_page, after, forward)
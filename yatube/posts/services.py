@@ -0,0 +1,29 @@
+"""Публикация постов пачкой в обход post_save.
+
+Нужна и API, и тестовым фабрикам, и всем, кто сохраняет много постов
+сразу: один bulk_create, а счётчики, версии лент и раздачу подписчикам
+делает posts_bulk_created() — то же, что сигналы для одиночного поста.
+"""
+from django.db import transaction
+
+from .models import Post
+from .signals import posts_bulk_created
+
+
+def publish_posts(author, posts):
+    """Сохранить посты автора одним bulk_create, с id и сигналами."""
+    for post in posts:
+        post.author = author
+    with transaction.atomic():
+        Post.objects.bulk_create(posts)
+        if posts and posts[0].pk is None:
+            # SQLite не возвращает id из bulk_create. Транзакция держит
+            # блокировку записи с первой вставки, поэтому последние id
+            # автора — наши.
+            ids = Post.objects.filter(author=author).order_by(
+                '-pk'
+            ).values_list('pk', flat=True)[:len(posts)]
+            for post, pk in zip(posts, reversed(ids)):
+                post.pk = pk
+        posts_bulk_created(author.pk, posts)
+    return posts
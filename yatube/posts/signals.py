@@ -0,0 +1,78 @@
+from collections import Counter
+
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from .cache import INDEX_FEED, author_feed, bump_feed_versions, group_feed
+from .counters import add_author_posts, add_author_stat, add_group_posts
+from .groups import forget_slug
+from .models import Follow, Group, Post
+from .tasks import schedule_fan_out
+
+
+@receiver(post_init, sender=Post)
+def remember_post_group(sender, instance, **kwargs):
+    # group_id на момент загрузки: при переносе поста в другую группу
+    # нужно поправить счётчики и сбросить ленты обеих групп.
+    instance._loaded_group_id = instance.__dict__.get('group_id')
+
+
+def invalidate_post_feeds(post):
+    feeds = {INDEX_FEED, author_feed(post.author_id)}
+    for group_id in (post._loaded_group_id, post.group_id):
+        if group_id is not None:
+            feeds.add(group_feed(group_id))
+    bump_feed_versions(*feeds)
+
+
+@receiver(post_save, sender=Post)
+def post_saved(sender, instance, created, **kwargs):
+    old_group_id = instance._loaded_group_id
+    if created:
+        add_author_posts(instance.author_id, 1)
+        if instance.group_id is not None:
+            add_group_posts(instance.group_id, 1)
+        schedule_fan_out([instance.pk])
+    elif old_group_id != instance.group_id:
+        if old_group_id is not None:
+            add_group_posts(old_group_id, -1)
+        if instance.group_id is not None:
+            add_group_posts(instance.group_id, 1)
+    invalidate_post_feeds(instance)
+    instance._loaded_group_id = instance.group_id
+
+
+def posts_bulk_created(author_id, posts):
+    """Что сделал бы post_saved, для постов автора из bulk_create."""
+    add_author_posts(author_id, len(posts))
+    groups = Counter(post.group_id for post in posts if post.group_id)
+    for group_id, count in groups.items():
+        add_group_posts(group_id, count)
+    schedule_fan_out([post.pk for post in posts])
+    bump_feed_versions(
+        INDEX_FEED, author_feed(author_id),
+        *(group_feed(group_id) for group_id in groups)
+    )
+
+
+@receiver(post_delete, sender=Post)
+def post_deleted(sender, instance, **kwargs):
+    add_author_posts(instance.author_id, -1)
+    if instance.group_id is not None:
+        add_group_posts(instance.group_id, -1)
+    invalidate_post_feeds(instance)
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def invalidate_group_feed(sender, instance, **kwargs):
+    # версия ленты группы — она же версия записи в posts.groups
+    bump_feed_versions(group_feed(instance.pk))
+    forget_slug(instance.slug)
+
+
+@receiver(post_delete, sender=Follow)
+def follow_deleted(sender, instance, **kwargs):
+    # и unfollow(), и каскад при удалении любого из двух пользователей
+    add_author_stat(instance.author_id, 'follower_count', -1)
+    add_author_stat(instance.user_id, 'following_count', -1)
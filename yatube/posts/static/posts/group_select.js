@@ -0,0 +1,56 @@
+// Подгрузка вариантов для select[data-autocomplete] (posts.forms.GroupSelect):
+// сервер отдаёт только выбранную группу, остальные ищутся через JSON API.
+(function () {
+  'use strict';
+
+  function setup(select) {
+    var search = document.createElement('input');
+    search.type = 'search';
+    search.className = select.className;
+    search.placeholder = 'Найти группу';
+    search.setAttribute('aria-controls', select.id);
+    select.parentNode.insertBefore(search, select);
+
+    var timer = null;
+    var request = 0;
+
+    function load() {
+      var current = ++request;
+      var url = select.dataset.autocomplete + '?fields=id,title&limit=20&q=' +
+        encodeURIComponent(search.value.trim());
+      fetch(url, {credentials: 'same-origin'})
+        .then(function (response) { return response.json(); })
+        .then(function (data) {
+          if (current !== request) {
+            return;
+          }
+          // пустой вариант и выбранная группа остаются на месте
+          Array.prototype.slice.call(select.options).forEach(function (option) {
+            if (option.value && !option.selected) {
+              select.removeChild(option);
+            }
+          });
+          data.results.forEach(function (group) {
+            if (String(group.id) === select.value) {
+              return;
+            }
+            select.appendChild(new Option(group.title, group.id));
+          });
+        });
+    }
+
+    search.addEventListener('input', function () {
+      clearTimeout(timer);
+      timer = setTimeout(load, 250);
+    });
+    select.addEventListener('focus', function () {
+      if (select.options.length <= 2) {
+        load();
+      }
+    });
+  }
+
+  document.addEventListener('DOMContentLoaded', function () {
+    document.querySelectorAll('select[data-autocomplete]').forEach(setup);
+  });
+})();
@@ -0,0 +1,23 @@
+"""Фоновые задачи постов: то, что не должно удлинять запрос на запись."""
+from tasks.queue import enqueue, task
+
+from .models import Post
+from .timeline import fan_out_posts
+
+
+@task('posts.fan_out', batch=True)
+def fan_out(payloads):
+    """Разложить посты по лентам подписчиков, по автору за раз."""
+    posts = Post.objects.filter(
+        pk__in={payload['post_id'] for payload in payloads}
+    ).only('pk', 'author_id', 'pub_date')
+    by_author = {}
+    for post in posts:
+        by_author.setdefault(post.author_id, []).append(post)
+    for author_id, author_posts in by_author.items():
+        fan_out_posts(author_id, author_posts)
+
+
+def schedule_fan_out(post_ids):
+    for post_id in post_ids:
+        enqueue(fan_out, {'post_id': post_id}, key=f'fan-out:{post_id}')
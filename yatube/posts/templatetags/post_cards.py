@@ -0,0 +1,102 @@
+"""Карточка поста без {% include %}.
+
+Карточка рендерится на каждый пост ленты. Шаблон через include
+проходит по дереву узлов и кладёт в стек контекста словарь на каждую
+карточку (~250 мкс на карточку), поэтому разметка собирается здесь
+одной format_html.
+"""
+from django import template
+from django.template.defaultfilters import date, linebreaksbr
+from django.urls import reverse
+from django.utils.html import format_html
+from django.utils.timezone import template_localtime
+
+register = template.Library()
+
+CARD_HTML = '''<div class="card mb-3 mt-1 shadow-sm">
+  <div class="card-body">
+    <p class="card-text">
+      <a href="{profile_url}">
+        <strong class="d-block text-gray-dark">
+          {username}
+        </strong>
+      </a>
+      {text}
+    </p>
+    <div class="d-flex justify-content-between align-items-center">
+      <div class="btn-group">
+        {comment_link}
+        <a class="btn btn-sm text-muted" href="{edit_url}" role="button">
+          {edit_label}
+        </a>
+      </div>
+      <small class="text-muted">{pub_date}</small>
+    </div>
+  </div>
+</div>
+'''
+COMMENT_HTML = (
+    '<a class="btn btn-sm text-muted" href="{}" role="button">'
+    ' Добавить комментарий </a>'
+)
+
+
+# post_id в образце URL, который затем заменяется настоящим
+POST_ID_SENTINEL = 2 ** 31 - 1
+
+
+def post_url_parts(name, username):
+    url = reverse(
+        name, kwargs={'username': username, 'post_id': POST_ID_SENTINEL}
+    )
+    prefix, _, suffix = url.rpartition(str(POST_ID_SENTINEL))
+    return prefix, suffix
+
+
+def author_urls(context, username):
+    """URL автора и образцы URL его постов: reverse() раз на автора.
+
+    Лента часто целиком из постов одного автора, а reverse() — самая
+    дорогая часть карточки.
+    """
+    urls = context.render_context.setdefault('post_card_authors', {})
+    if username not in urls:
+        urls[username] = (
+            reverse('profile', kwargs={'username': username}),
+            post_url_parts('post_view', username),
+            post_url_parts('post_edit', username),
+        )
+    return urls[username]
+
+
+def pub_date(context, value):
+    dates = context.render_context.setdefault('post_card_dates', {})
+    day = template_localtime(value).date()
+    if day not in dates:
+        dates[day] = date(day, 'd M Y')
+    return dates[day]
+
+
+@register.simple_tag(takes_context=True)
+def post_card(context, post):
+    """{% post_card post %} — карточка поста, автор берётся из post."""
+    user = context.get('user')
+    username = post.author.username
+    profile_url, view_url, edit_url = author_urls(context, username)
+    authenticated = user is not None and user.is_authenticated
+    return format_html(
+        CARD_HTML,
+        profile_url=profile_url,
+        username=username,
+        text=linebreaksbr(post.text, autoescape=context.autoescape),
+        comment_link=(
+            format_html(COMMENT_HTML, f'{view_url[0]}{post.pk}{view_url[1]}')
+            if authenticated else ''
+        ),
+        edit_url=f'{edit_url[0]}{post.pk}{edit_url[1]}',
+        edit_label=(
+            'Редактировать'
+            if authenticated and user.username == username else ''
+        ),
+        pub_date=pub_date(context, post.pub_date),
+    )
@@ -0,0 +1,27 @@
+"""Наборы данных для тестов одной вставкой вместо create() в цикле.
+
+Посты сохраняются через publish_posts(): счётчики, версии лент и
+раздача подписчикам те же, что у сигналов post_save.
+"""
+from django.contrib.auth.hashers import make_password
+
+from ..services import publish_posts
+from ..models import Post, User
+
+
+def make_posts(author, count, group=None, text='Тестовый текст {}'):
+    return publish_posts(author, [
+        Post(text=text.format(i), group=group) for i in range(count)
+    ])
+
+
+def make_users(count, username='test_user_{}', **fields):
+    names = [username.format(i) for i in range(count)]
+    password = make_password(None)
+    User.objects.bulk_create([
+        User(username=name, password=password, **{
+            field: value.format(i) for field, value in fields.items()
+        })
+        for i, name in enumerate(names)
+    ])
+    return list(User.objects.filter(username__in=names).order_by('pk'))
@@ -0,0 +1,192 @@
+import json
+from http import HTTPStatus
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from ..cache import INDEX_FEED, get_feed_version
+from ..models import AuthorStats, Group, Post, TimelineEntry, User
+from ..search import search_posts
+from ..timeline import follow
+
+
+class PostsApiTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='test_user')
+        cls.group = Group.objects.create(
+            title='Тестовый title',
+            slug='test',
+            description='описание'
+        )
+        Group.objects.create(title='Вторая', slug='second')
+        cls.posts = [
+            Post.objects.create(
+                text=f'Пост {i}', author=cls.user,
+                group=cls.group if i % 2 else None
+            )
+            for i in range(5)
+        ]
+
+    def setUp(self):
+        self.client = Client()
+
+    def get(self, name, queries=1, kwargs=None, **params):
+        with self.assertNumQueries(queries):
+            response = self.client.get(reverse(name, kwargs=kwargs), params)
+        return response
+
+    def test_list_is_cursor_paginated(self):
+        data = self.get('api_posts', limit=3).json()
+        self.assertEqual(
+            [post['text'] for post in data['results']],
+            ['Пост 4', 'Пост 3', 'Пост 2']
+        )
+        self.assertIsNone(data['previous'])
+        data = self.get('api_posts', limit=3, cursor=data['next']).json()
+        self.assertEqual(
+            [post['text'] for post in data['results']], ['Пост 1', 'Пост 0']
+        )
+        self.assertIsNone(data['next'])
+
+    def test_sparse_fieldsets(self):
+        data = self.get('api_posts', fields='id,author').json()
+        self.assertEqual(
+            data['results'][0],
+            {'id': self.posts[4].pk, 'author': 'test_user'}
+        )
+        response = self.get('api_posts', queries=0, fields='id,password')
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+        self.assertIn('password', response.json()['error'])
+
+    def test_filters(self):
+        data = self.get('api_posts', group='test', fields='text').json()
+        self.assertEqual(
+            data['results'], [{'text': 'Пост 3'}, {'text': 'Пост 1'}]
+        )
+        data = self.get('api_posts', author='nobody').json()
+        self.assertEqual(data['results'], [])
+
+    def test_batch_get_keeps_order(self):
+        ids = [self.posts[2].pk, 9999, self.posts[0].pk]
+        data = self.get(
+            'api_posts', ids=','.join(map(str, ids)), fields='id,group'
+        ).json()
+        self.assertEqual(data['results'], [
+            {'id': self.posts[2].pk, 'group': None},
+            {'id': self.posts[0].pk, 'group': None},
+        ])
+        self.assertEqual(data['missing'], [9999])
+
+    @override_settings(POSTS_API_MAX_PAGE_SIZE=2)
+    def test_batch_limits(self):
+        for ids in ('1,2,3', '1,x'):
+            with self.subTest(ids=ids):
+                response = self.get('api_posts', queries=0, ids=ids)
+                self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+
+    def test_post_detail(self):
+        post = self.posts[1]
+        data = self.get('api_post', kwargs={'post_id': post.pk}).json()
+        self.assertEqual(data['text'], 'Пост 1')
+        self.assertEqual(data['group'], 'test')
+        self.assertEqual(data['author'], 'test_user')
+        response = self.get('api_post', kwargs={'post_id': 9999})
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+
+    def test_groups(self):
+        data = self.get('api_groups', fields='slug,post_count').json()
+        self.assertEqual(data['results'], [
+            {'slug': 'test', 'post_count': 2},
+            {'slug': 'second', 'post_count': 0},
+        ])
+        data = self.get('api_group', kwargs={'slug': 'test'}).json()
+        self.assertEqual(data['title'], 'Тестовый title')
+
+    def test_read_only(self):
+        response = self.client.post(reverse('api_posts'))
+        self.assertEqual(response.status_code, HTTPStatus.METHOD_NOT_ALLOWED)
+
+
+class PostBatchApiTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='test_user')
+        cls.follower = User.objects.create_user(username='test_follower')
+        cls.group = Group.objects.create(title='Тестовый title', slug='test')
+        follow(cls.follower, cls.user)
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.client.force_login(self.user)
+
+    def post(self, posts, client=None):
+        return (client or self.client).post(
+            reverse('api_post_batch'),
+            json.dumps({'posts': posts}),
+            content_type='application/json'
+        )
+
+    def test_creates_posts_with_side_effects(self):
+        index_version = get_feed_version(INDEX_FEED)
+        response = self.post([
+            {'text': 'Первый', 'group': self.group.pk},
+            {'text': ''},
+            {'text': 'Второй'},
+        ])
+        self.assertEqual(response.status_code, HTTPStatus.CREATED)
+        results = response.json()['results']
+        self.assertIn('text', results[1]['errors'])
+        created = Post.objects.order_by('pk')
+        self.assertEqual(
+            [results[0]['id'], results[2]['id']],
+            list(created.values_list('pk', flat=True))
+        )
+        self.assertEqual(
+            [post.text for post in created], ['Первый', 'Второй']
+        )
+        self.assertEqual(AuthorStats.objects.get(author=self.user).post_count,
+                         2)
+        self.group.refresh_from_db()
+        self.assertEqual(self.group.post_count, 1)
+        self.assertEqual(
+            TimelineEntry.objects.filter(user=self.follower).count(), 2
+        )
+        self.assertNotEqual(get_feed_version(INDEX_FEED), index_version)
+        self.assertEqual(search_posts('Второй').object_list[0].text, 'Второй')
+
+    def test_batch_is_a_single_transaction(self):
+        posts = [{'text': f'Пост {i}'} for i in range(50)]
+        with CaptureQueriesContext(connection) as queries:
+            self.post(posts)
+        inserts = [
+            query for query in queries
+            if query['sql'].startswith('INSERT INTO "posts_post"')
+        ]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(Post.objects.count(), 50)
+
+    def test_rejected_requests(self):
+        cases = {
+            HTTPStatus.UNAUTHORIZED: (Client(), [{'text': 'Текст'}]),
+            HTTPStatus.BAD_REQUEST: (self.client, [{'group': 9999}]),
+        }
+        for status, (client, posts) in cases.items():
+            with self.subTest(status=status):
+                self.assertEqual(self.post(posts, client).status_code, status)
+        response = self.client.post(
+            reverse('api_post_batch'), 'не json',
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+        self.assertFalse(Post.objects.exists())
+
+    @override_settings(POSTS_API_MAX_BATCH_SIZE=2)
+    def test_batch_size_limit(self):
+        response = self.post([{'text': 'Текст'}] * 3)
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+        self.assertFalse(Post.objects.exists())
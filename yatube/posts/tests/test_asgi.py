@@ -0,0 +1,65 @@
+import asyncio
+
+from django.core.handlers.wsgi import WSGIRequest
+from django.test import SimpleTestCase
+from django.urls import reverse
+
+from yatube.asgi import application
+
+
+class AsgiApplicationTests(SimpleTestCase):
+    def call(self, scope, messages):
+        sent = []
+
+        async def receive():
+            return messages.pop(0)
+
+        async def send(message):
+            sent.append(message)
+
+        asyncio.run(application(scope, receive, send))
+        return sent
+
+    def test_http_request_is_served_from_thread_pool(self):
+        sent = self.call({
+            'type': 'http',
+            'http_version': '1.1',
+            'method': 'GET',
+            'path': reverse('about:author'),
+            'query_string': b'',
+            'headers': [(b'host', b'testserver')],
+        }, [{'type': 'http.request', 'body': b''}])
+        start, body = sent
+        self.assertEqual(start['status'], 200)
+        self.assertIn(
+            (b'content-type', b'text/html; charset=utf-8'), start['headers']
+        )
+        self.assertIn('Об авторе'.encode(), body['body'])
+
+    def test_repeated_headers(self):
+        environ = application.environ({
+            'method': 'GET',
+            'path': '/',
+            'query_string': b'',
+            'http_version': '1.1',
+            'headers': [
+                (b'cookie', b'a=1'),
+                (b'cookie', b'b=2'),
+                (b'accept', b'text/html'),
+                (b'accept', b'*/*'),
+            ],
+        }, b'')
+        self.assertEqual(environ['HTTP_COOKIE'], 'a=1; b=2')
+        self.assertEqual(environ['HTTP_ACCEPT'], 'text/html,*/*')
+        self.assertEqual(
+            WSGIRequest(environ).COOKIES, {'a': '1', 'b': '2'}
+        )
+
+    def test_lifespan(self):
+        sent = self.call({'type': 'lifespan'}, [
+            {'type': 'lifespan.startup'}, {'type': 'lifespan.shutdown'}
+        ])
+        self.assertEqual(
+            [message['type'] for message in sent],
+            ['lifespan.startup.complete', 'lifespan.shutdown.complete']
+        )
@@ -0,0 +1,199 @@
+import shutil
+import tempfile
+
+from django.core.cache import cache
+from django.db import transaction
+from django.test import (
+    Client, TestCase, TransactionTestCase, override_settings
+)
+from django.urls import reverse
+
+from ..cache import INDEX_FEED, author_feed, get_feed_version, group_feed
+from ..models import Post, Group, User
+
+
+class FeedCacheTestsMixin:
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='test_user')
+        cls.other_user = User.objects.create_user(username='test_user1')
+        cls.group = Group.objects.create(
+            title='Тестовый title',
+            slug='test',
+            description='описание'
+        )
+        cls.group1 = Group.objects.create(
+            title='Тестовый title1',
+            slug='test1',
+            description='описание1'
+        )
+        cls.group2 = Group.objects.create(
+            title='Тестовый title2',
+            slug='test2',
+            description='описание2'
+        )
+        cls.post = Post.objects.create(
+            text='Тестовый текст',
+            author=cls.user,
+            group=cls.group
+        )
+        Post.objects.create(
+            text='Чужой текст',
+            author=cls.other_user,
+            group=cls.group2
+        )
+        cls.index_url = reverse('index')
+        cls.group_url = reverse('group_posts', kwargs={'slug': 'test'})
+        cls.profile_url = reverse(
+            'profile', kwargs={'username': cls.user.username}
+        )
+        cls.edit_url = reverse(
+            'post_edit',
+            kwargs={'username': cls.user.username, 'post_id': cls.post.id}
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def feed_versions(self):
+        feeds = [
+            INDEX_FEED,
+            group_feed(self.group.pk),
+            group_feed(self.group1.pk),
+            group_feed(self.group2.pk),
+            author_feed(self.user.pk),
+            author_feed(self.other_user.pk),
+        ]
+        return {feed: get_feed_version(feed) for feed in feeds}
+
+    def assert_bumped(self, before, feeds):
+        after = self.feed_versions()
+        for feed, version in before.items():
+            with self.subTest(feed=feed):
+                if feed in feeds:
+                    self.assertNotEqual(after[feed], version)
+                else:
+                    self.assertEqual(after[feed], version)
+
+    def test_repeated_hits_skip_feed_query(self):
+        # адрес ленты: запросы при попадании в кэш
+        cached_queries = {
+            self.index_url: 0,
+            # группа берётся из posts.groups
+            self.group_url: 0,
+            self.profile_url: 1,
+        }
+        for adress, queries in cached_queries.items():
+            with self.subTest(adress=adress):
+                first = self.guest_client.get(adress)
+                with self.assertNumQueries(queries):
+                    second = self.guest_client.get(adress)
+                self.assertEqual(first.content, second.content)
+
+    def test_new_post_invalidates_feeds(self):
+        for adress in (self.index_url, self.group_url, self.profile_url):
+            self.guest_client.get(adress)
+        self.authorized_client.post(
+            reverse('new_post'),
+            data={'text': 'Совсем новый текст', 'group': self.group.id}
+        )
+        for adress in (self.index_url, self.group_url, self.profile_url):
+            with self.subTest(adress=adress):
+                response = self.guest_client.get(adress)
+                self.assertContains(response, 'Совсем новый текст')
+
+    def test_new_post_bumps_only_affected_feeds(self):
+        before = self.feed_versions()
+        self.authorized_client.post(
+            reverse('new_post'),
+            data={'text': 'Совсем новый текст', 'group': self.group1.id}
+        )
+        self.assert_bumped(before, {
+            INDEX_FEED,
+            group_feed(self.group1.pk),
+            author_feed(self.user.pk),
+        })
+
+    def test_post_edit_bumps_old_and_new_group(self):
+        before = self.feed_versions()
+        self.authorized_client.post(
+            self.edit_url,
+            data={'text': 'Тестовый другой текст', 'group': self.group1.id}
+        )
+        self.assert_bumped(before, {
+            INDEX_FEED,
+            group_feed(self.group.pk),
+            group_feed(self.group1.pk),
+            author_feed(self.user.pk),
+        })
+
+    def test_post_delete_bumps_feeds(self):
+        before = self.feed_versions()
+        Post.objects.get(pk=self.post.pk).delete()
+        self.assert_bumped(before, {
+            INDEX_FEED,
+            group_feed(self.group.pk),
+            author_feed(self.user.pk),
+        })
+
+    def test_group_change_bumps_only_group_feed(self):
+        self.guest_client.get(self.group_url)
+        before = self.feed_versions()
+        self.group.description = 'новое описание'
+        self.group.save()
+        self.assert_bumped(before, {group_feed(self.group.pk)})
+        self.assertContains(
+            self.guest_client.get(self.group_url), 'новое описание'
+        )
+
+    def test_fragments_are_not_shared_between_users(self):
+        self.authorized_client.get(self.profile_url)
+        response = self.guest_client.get(self.profile_url)
+        self.assertNotContains(response, 'Добавить комментарий')
+
+
+@override_settings(CACHES={
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'feed-cache-tests',
+    }
+})
+class LocMemFeedCacheTests(FeedCacheTestsMixin, TestCase):
+    pass
+
+
+class FileBasedFeedCacheTests(FeedCacheTestsMixin, TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.cache_dir = tempfile.mkdtemp()
+        cls.cache_settings = override_settings(CACHES={
+            'default': {
+                'BACKEND': 'django.core.cache.backends.filebased.'
+                           'FileBasedCache',
+                'LOCATION': cls.cache_dir,
+            }
+        })
+        cls.cache_settings.enable()
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        cls.cache_settings.disable()
+        shutil.rmtree(cls.cache_dir, ignore_errors=True)
+
+
+class BumpOnCommitTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='test_user')
+
+    def test_version_bumps_again_after_commit(self):
+        with transaction.atomic():
+            Post.objects.create(text='Текст', author=self.user)
+            # читатель до коммита ещё видит старые строки
+            during = get_feed_version(INDEX_FEED)
+        self.assertNotEqual(get_feed_version(INDEX_FEED), during)
@@ -0,0 +1,130 @@
+import gzip
+import zlib
+from unittest import mock, skipIf
+
+from django.core.cache import cache
+from django.http import HttpResponse, StreamingHttpResponse
+from django.middleware.csrf import get_token
+from django.test import Client, RequestFactory, TestCase
+from django.urls import reverse
+
+from perf.metrics import registry
+from yatube import compression
+from yatube.compression import CompressionMiddleware, accepted_encodings
+
+from ..models import Post, User
+
+LONG_TEXT = 'Длинный текст поста для проверки сжатия ответа. ' * 40
+
+
+def middleware(response):
+    return CompressionMiddleware(lambda request: response)
+
+
+class CompressionMiddlewareTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='test_user')
+        Post.objects.bulk_create(
+            Post(text=LONG_TEXT, author=cls.user) for _ in range(10)
+        )
+
+    def setUp(self):
+        cache.clear()
+        registry.reset()
+        self.factory = RequestFactory()
+
+    def gzip_request(self):
+        return self.factory.get('/', HTTP_ACCEPT_ENCODING='gzip')
+
+    def test_feed_is_gzipped(self):
+        client = Client()
+        plain = client.get(reverse('index'))
+        response = client.get(reverse('index'), HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertTrue(response['ETag'].startswith('W/"'))
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+        self.assertLess(len(response.content), len(plain.content) / 4)
+        stats = registry.compression_snapshot()['encodings']['gzip']
+        self.assertEqual(stats['count'], 1)
+        self.assertLess(stats['ratio'], 0.25)
+
+    def test_weak_etag_revalidates(self):
+        client = Client(HTTP_ACCEPT_ENCODING='gzip')
+        etag = client.get(reverse('index'))['ETag']
+        response = client.get(reverse('index'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_skipped_responses(self):
+        cases = {
+            'small': HttpResponse('коротко'),
+            'type': HttpResponse(b'\x89PNG' * 500, content_type='image/png'),
+            'encoded': HttpResponse('x' * 1000),
+        }
+        cases['encoded']['Content-Encoding'] = 'gzip'
+        for reason, response in cases.items():
+            with self.subTest(reason=reason):
+                content = response.content
+                response = middleware(response)(self.gzip_request())
+                self.assertEqual(response.content, content)
+                self.assertEqual(
+                    registry.compression_snapshot()['skipped'][reason], 1
+                )
+        self.assertFalse(
+            registry.compression_snapshot()['encodings']
+        )
+
+    def test_pages_with_csrf_token_are_not_compressed(self):
+        request = self.gzip_request()
+        get_token(request)
+        response = middleware(HttpResponse('x' * 1000))(request)
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(
+            registry.compression_snapshot()['skipped']['csrf'], 1
+        )
+        client = Client(HTTP_ACCEPT_ENCODING='gzip')
+        client.force_login(self.user)
+        response = client.get(reverse('new_post'))
+        self.assertContains(response, 'csrfmiddlewaretoken')
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_zero_quality_is_not_accepted(self):
+        self.assertEqual(
+            accepted_encodings('gzip;q=0, br;q=0.5, identity'),
+            {'br', 'identity'}
+        )
+        request = self.factory.get('/', HTTP_ACCEPT_ENCODING='gzip;q=0')
+        with mock.patch.object(compression, 'brotli', None):
+            response = middleware(HttpResponse('x' * 1000))(request)
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_streaming_chunks_are_flushed(self):
+        chunks = ['<p>%d %s</p>' % (i, LONG_TEXT) for i in range(3)]
+        with mock.patch.object(compression, 'brotli', None):
+            response = middleware(StreamingHttpResponse(chunks))(
+                self.gzip_request()
+            )
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertFalse(response.has_header('Content-Length'))
+        parts = list(response.streaming_content)
+        self.assertEqual(len(parts), len(chunks) + 1)
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        for expected, data in zip(chunks, parts):
+            # каждая часть разжимается сразу, без ожидания конца потока
+            self.assertEqual(
+                decompressor.decompress(data).decode(), expected
+            )
+        stats = registry.compression_snapshot()['encodings']['gzip']
+        self.assertEqual(
+            stats['raw_bytes'], sum(len(c.encode()) for c in chunks)
+        )
+
+    @skipIf(compression.brotli is None, 'brotli не установлен')
+    def test_brotli_preferred(self):
+        request = self.factory.get('/', HTTP_ACCEPT_ENCODING='gzip, br')
+        response = middleware(HttpResponse('x' * 1000))(request)
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(
+            compression.brotli.decompress(response.content), b'x' * 1000
+        )
@@ -0,0 +1,145 @@
+from http import HTTPStatus
+
+from django.core.cache import cache
+from django.test import Client, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from ..checks import check_shared_cache
+from ..models import Group, Post, User
+from ..timeline import follow
+
+
+class ConditionalGetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='test_user')
+        cls.reader = User.objects.create_user(username='test_reader')
+        cls.group = Group.objects.create(
+            title='Тестовый title',
+            slug='test',
+            description='описание'
+        )
+        cls.post = Post.objects.create(
+            text='Тестовый текст',
+            author=cls.user,
+            group=cls.group
+        )
+        cls.urls = {
+            'index': reverse('index'),
+            'group': reverse('group_posts', kwargs={'slug': 'test'}),
+            'profile': reverse('profile', kwargs={'username': 'test_user'}),
+            'post': reverse(
+                'post_view',
+                kwargs={'username': 'test_user', 'post_id': cls.post.pk}
+            ),
+        }
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def etags(self, client=None):
+        client = client or self.guest_client
+        return {
+            name: client.get(url)['ETag'] for name, url in self.urls.items()
+        }
+
+    def test_unchanged_page_is_not_modified(self):
+        for name, etag in self.etags().items():
+            with self.subTest(page=name):
+                response = self.guest_client.get(
+                    self.urls[name], HTTP_IF_NONE_MATCH=etag
+                )
+                self.assertEqual(response.status_code,
+                                 HTTPStatus.NOT_MODIFIED)
+                self.assertEqual(response.content, b'')
+
+    def test_index_revalidation_skips_database(self):
+        etag = self.guest_client.get(self.urls['index'])['ETag']
+        with self.assertNumQueries(0):
+            self.guest_client.get(
+                self.urls['index'], HTTP_IF_NONE_MATCH=etag
+            )
+
+    def test_new_post_changes_feed_etags(self):
+        before = self.etags()
+        Post.objects.create(text='Новый текст', author=self.user,
+                            group=self.group)
+        after = self.etags()
+        for name in ('index', 'group', 'profile'):
+            with self.subTest(page=name):
+                self.assertNotEqual(before[name], after[name])
+
+    def test_edit_changes_post_etag(self):
+        before = self.etags()['post']
+        self.authorized_client.post(
+            reverse(
+                'post_edit',
+                kwargs={'username': 'test_user', 'post_id': self.post.pk}
+            ),
+            {'text': 'Отредактированный текст'}
+        )
+        response = self.guest_client.get(
+            self.urls['post'], HTTP_IF_NONE_MATCH=before
+        )
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertContains(response, 'Отредактированный текст')
+
+    def test_follow_changes_author_pages(self):
+        before = self.etags()
+        follow(self.reader, self.user)
+        after = self.etags()
+        for name in ('profile', 'post'):
+            with self.subTest(page=name):
+                self.assertNotEqual(before[name], after[name])
+
+    def test_etag_depends_on_viewer_and_cursor(self):
+        guest = self.etags()
+        authorized = self.etags(self.authorized_client)
+        for name in self.urls:
+            with self.subTest(page=name):
+                self.assertNotEqual(guest[name], authorized[name])
+        self.assertNotEqual(
+            self.guest_client.get(self.urls['index'], {'cursor': 'x'})['ETag'],
+            guest['index']
+        )
+
+    def test_updated_at_follows_edits(self):
+        created = self.post.updated_at
+        self.post.text = 'Новый текст'
+        self.post.save()
+        self.assertGreater(self.post.updated_at, created)
+
+
+class SharedCacheCheckTests(SimpleTestCase):
+    def test_process_local_cache_is_an_error(self):
+        for backend in ('locmem.LocMemCache', 'dummy.DummyCache'):
+            with self.subTest(backend=backend), override_settings(CACHES={
+                'default': {
+                    'BACKEND': f'django.core.cache.backends.{backend}'
+                }
+            }):
+                errors = check_shared_cache(None)
+                self.assertEqual([error.id for error in errors],
+                                 ['posts.E001'])
+
+    def test_non_atomic_incr_is_an_error(self):
+        for backend in ('filebased.FileBasedCache', 'db.DatabaseCache'):
+            with self.subTest(backend=backend), override_settings(CACHES={
+                'default': {
+                    'BACKEND': f'django.core.cache.backends.{backend}',
+                    'LOCATION': 'yatube_cache',
+                }
+            }):
+                errors = check_shared_cache(None)
+                self.assertEqual([error.id for error in errors],
+                                 ['posts.E002'])
+
+    @override_settings(CACHES={'default': {
+        'BACKEND': 'django.core.cache.backends.memcached.MemcachedCache',
+        'LOCATION': '127.0.0.1:11211',
+    }})
+    def test_shared_cache_passes(self):
+        self.assertEqual(check_shared_cache(None), [])
@@ -0,0 +1,165 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from ..cache import author_feed, get_feed_version
+from ..models import AuthorStats, Follow, Post, Group, User
+
+
+class PostCountersTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='test_user')
+        cls.group = Group.objects.create(
+            title='Тестовый title',
+            slug='test',
+            description='описание'
+        )
+        cls.group1 = Group.objects.create(
+            title='Тестовый title1',
+            slug='test1',
+            description='описание1'
+        )
+
+    def setUp(self):
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+        self.post = Post.objects.create(
+            text='Тестовый текст',
+            author=self.user,
+            group=self.group
+        )
+
+    def assert_counts(self, author, group, group1):
+        self.assertEqual(
+            AuthorStats.objects.get(author=self.user).post_count, author
+        )
+        self.assertEqual(Group.objects.get(pk=self.group.pk).post_count, group)
+        self.assertEqual(
+            Group.objects.get(pk=self.group1.pk).post_count, group1
+        )
+
+    def test_new_post_increments_counters(self):
+        self.authorized_client.post(
+            reverse('new_post'),
+            data={'text': 'Новый текст', 'group': self.group1.id}
+        )
+        self.assert_counts(author=2, group=1, group1=1)
+
+    def test_post_edit_moves_group_count(self):
+        self.authorized_client.post(
+            reverse(
+                'post_edit',
+                kwargs={
+                    'username': self.user.username,
+                    'post_id': self.post.id,
+                }
+            ),
+            data={'text': 'Другой текст', 'group': self.group1.id}
+        )
+        self.assert_counts(author=1, group=0, group1=1)
+
+    def test_post_delete_decrements_counters(self):
+        self.post.delete()
+        self.assert_counts(author=0, group=0, group1=0)
+
+    def test_delete_with_drifted_counters(self):
+        # bulk_create мимо сигналов: счётчики уже нулевые
+        Post.objects.bulk_create([
+            Post(text='Без сигналов', author=self.user, group=self.group1)
+        ])
+        Post.objects.get(text='Без сигналов').delete()
+        self.post.delete()
+        self.assert_counts(author=0, group=0, group1=0)
+
+    def test_group_delete_keeps_author_count(self):
+        Group.objects.get(pk=self.group.pk).delete()
+        self.assertIsNone(Post.objects.get(pk=self.post.pk).group)
+        self.assertEqual(
+            AuthorStats.objects.get(author=self.user).post_count, 1
+        )
+
+    def test_group_save_keeps_post_count(self):
+        stale_group = Group.objects.get(pk=self.group1.pk)
+        Post.objects.create(text='Текст', author=self.user, group=self.group1)
+        stale_group.title = 'Новый title'
+        stale_group.save()
+        self.assert_counts(author=2, group=1, group1=1)
+
+    def test_pages_read_counters_without_count_query(self):
+        urls = [
+            reverse('profile', kwargs={'username': self.user.username}),
+            reverse(
+                'post_view',
+                kwargs={
+                    'username': self.user.username,
+                    'post_id': self.post.id,
+                }
+            ),
+        ]
+        for adress in urls:
+            with self.subTest(adress=adress):
+                with CaptureQueriesContext(connection) as queries:
+                    response = Client().get(adress)
+                self.assertEqual(response.context['stats'].post_count, 1)
+                sql = ' '.join(query['sql'] for query in queries)
+                self.assertNotIn('COUNT(', sql.upper())
+
+
+class RecountPostsCommandTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='test_user')
+        cls.group = Group.objects.create(
+            title='Тестовый title',
+            slug='test',
+            description='описание'
+        )
+        Post.objects.bulk_create([
+            Post(text=f'Текст {i}', author=cls.user, group=cls.group)
+            for i in range(3)
+        ])
+
+    def recount(self, *args):
+        out = StringIO()
+        call_command('recount_posts', *args, stdout=out)
+        return out.getvalue()
+
+    def test_dry_run_reports_drift_only(self):
+        output = self.recount('--dry-run')
+        self.assertIn('test: 0 -> 3', output)
+        self.assertIn('test_user: 0 -> 3', output)
+        self.assertEqual(Group.objects.get(pk=self.group.pk).post_count, 0)
+        self.assertFalse(AuthorStats.objects.exists())
+
+    def test_recount_fixes_drift(self):
+        self.recount()
+        self.assertEqual(Group.objects.get(pk=self.group.pk).post_count, 3)
+        self.assertEqual(
+            AuthorStats.objects.get(author=self.user).post_count, 3
+        )
+        output = self.recount('--dry-run')
+        self.assertIn('Группы: расхождений 0', output)
+        self.assertIn('Авторы: расхождений 0', output)
+
+    def test_recount_fixes_follow_counters(self):
+        reader = User.objects.create_user(username='test_reader')
+        # подписка мимо follow(): счётчики не тронуты
+        Follow.objects.bulk_create([Follow(user=reader, author=self.user)])
+        version = get_feed_version(author_feed(self.user.pk))
+        output = self.recount()
+        self.assertIn('test_user, подписчики: 0 -> 1', output)
+        self.assertIn('test_reader, подписки: 0 -> 1', output)
+        self.assertEqual(
+            AuthorStats.objects.get(author=self.user).follower_count, 1
+        )
+        self.assertEqual(
+            AuthorStats.objects.get(author=reader).following_count, 1
+        )
+        self.assertNotEqual(
+            get_feed_version(author_feed(self.user.pk)), version
+        )
@@ -0,0 +1,134 @@
+import json
+from http import HTTPStatus
+from xml.etree import ElementTree
+
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from ..feeds import SINCE_HEADER
+from ..models import Group, Post, User
+
+ATOM = '{http://www.w3.org/2005/Atom}'
+
+
+class FeedTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='test_user', first_name='Лев', last_name='Толстой'
+        )
+        cls.other = User.objects.create_user(username='other_user')
+        cls.group = Group.objects.create(
+            title='Тестовый title',
+            slug='test',
+            description='описание'
+        )
+        for i in range(3):
+            Post.objects.create(
+                text=f'Пост {i} <b>&</b>\nвторая строка',
+                author=cls.user,
+                group=cls.group
+            )
+        Post.objects.create(text='Пост другого автора', author=cls.other)
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+
+    def url(self, feed, fmt, **kwargs):
+        return reverse(feed, kwargs={'fmt': fmt, **kwargs})
+
+    def get(self, url, **params):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertTrue(response.streaming)
+        return response, b''.join(response.streaming_content).decode()
+
+    def items(self, fmt, body):
+        if fmt == 'json':
+            return [item['title'] for item in json.loads(body)['items']]
+        root = ElementTree.fromstring(body)
+        if fmt == 'rss':
+            return [item.findtext('title') for item in root.iter('item')]
+        return [
+            entry.findtext(f'{ATOM}title')
+            for entry in root.iter(f'{ATOM}entry')
+        ]
+
+    def test_formats(self):
+        content_types = {
+            'rss': 'application/rss+xml; charset=utf-8',
+            'atom': 'application/atom+xml; charset=utf-8',
+            'json': 'application/feed+json; charset=utf-8',
+        }
+        for fmt, content_type in content_types.items():
+            with self.subTest(fmt=fmt):
+                response, body = self.get(self.url('index_feed', fmt))
+                self.assertEqual(response['Content-Type'], content_type)
+                self.assertEqual(self.items(fmt, body), [
+                    'Пост другого автора',
+                    'Пост 2 <b>&</b>',
+                    'Пост 1 <b>&</b>',
+                    'Пост 0 <b>&</b>',
+                ])
+
+    def test_group_and_author_feeds(self):
+        urls = {
+            'group': self.url('group_posts_feed', 'rss', slug='test'),
+            'profile': self.url(
+                'profile_feed', 'rss', username='other_user'
+            ),
+        }
+        _, body = self.get(urls['group'])
+        self.assertEqual(len(self.items('rss', body)), 3)
+        _, body = self.get(urls['profile'])
+        self.assertEqual(self.items('rss', body), ['Пост другого автора'])
+
+    def test_missing_feeds(self):
+        for url in (
+            '/feed/xml/',
+            self.url('group_posts_feed', 'rss', slug='missing'),
+            self.url('profile_feed', 'rss', username='missing'),
+        ):
+            with self.subTest(url=url):
+                self.assertEqual(
+                    self.client.get(url).status_code, HTTPStatus.NOT_FOUND
+                )
+
+    @override_settings(POSTS_FEED_LIMIT=2)
+    def test_limit(self):
+        _, body = self.get(self.url('index_feed', 'json'))
+        self.assertEqual(len(self.items('json', body)), 2)
+        _, body = self.get(self.url('index_feed', 'json'), limit=0)
+        self.assertEqual(len(self.items('json', body)), 4)
+
+    def test_since_returns_only_newer_posts(self):
+        url = self.url('index_feed', 'json')
+        response, _ = self.get(url)
+        since = response[SINCE_HEADER]
+        _, body = self.get(url, since=since)
+        self.assertEqual(self.items('json', body), [])
+        Post.objects.create(text='Новый пост', author=self.user)
+        response, body = self.get(url, since=since)
+        self.assertEqual(self.items('json', body), ['Новый пост'])
+        self.assertNotEqual(response[SINCE_HEADER], since)
+
+    def test_conditional_get(self):
+        url = self.url('index_feed', 'atom')
+        etag = self.client.get(url)['ETag']
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
+        Post.objects.create(text='Новый пост', author=self.user)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+
+    @override_settings(POSTS_FEED_FLUSH_SIZE=1, POSTS_FEED_CHUNK_SIZE=2)
+    def test_streamed_in_chunks(self):
+        response = self.client.get(self.url('index_feed', 'rss'), {
+            'limit': 0
+        })
+        chunks = list(response.streaming_content)
+        # по куску на пост и закрывающий
+        self.assertEqual(len(chunks), 5)
+        ElementTree.fromstring(b''.join(chunks))
@@ -0,0 +1,153 @@
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from tasks.queue import run_pending
+
+from ..models import AuthorStats, Follow, Post, TimelineEntry, User
+from ..timeline import follow, follow_page, pull_follow_page
+
+
+class FollowViewsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='test_user')
+        cls.author = User.objects.create_user(username='test_author')
+        cls.stranger = User.objects.create_user(username='test_stranger')
+        cls.old_post = Post.objects.create(
+            text='Старый текст', author=cls.author
+        )
+
+    def setUp(self):
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+        self.stranger_client = Client()
+        self.stranger_client.force_login(self.stranger)
+
+    def follow_author(self):
+        self.authorized_client.post(
+            reverse('profile_follow', kwargs={'username': 'test_author'})
+        )
+
+    def follow_feed(self, client):
+        return list(client.get(reverse('follow_index')).context['page'])
+
+    def test_follow_creates_link_and_backfills(self):
+        self.follow_author()
+        self.follow_author()
+        self.assertEqual(Follow.objects.count(), 1)
+        self.assertEqual(self.follow_feed(self.authorized_client),
+                         [self.old_post])
+        self.assertEqual(
+            AuthorStats.objects.get(author=self.author).follower_count, 1
+        )
+        self.assertEqual(
+            AuthorStats.objects.get(author=self.user).following_count, 1
+        )
+
+    def test_follow_requires_post(self):
+        for name in ('profile_follow', 'profile_unfollow'):
+            with self.subTest(name=name):
+                response = self.authorized_client.get(
+                    reverse(name, kwargs={'username': 'test_author'})
+                )
+                self.assertEqual(response.status_code, 405)
+        self.assertFalse(Follow.objects.exists())
+
+    def test_cannot_follow_self(self):
+        self.authorized_client.post(
+            reverse('profile_follow', kwargs={'username': 'test_user'})
+        )
+        self.assertFalse(Follow.objects.exists())
+
+    def test_new_post_fans_out_to_followers_only(self):
+        self.follow_author()
+        post = Post.objects.create(text='Новый текст', author=self.author)
+        self.assertEqual(self.follow_feed(self.authorized_client),
+                         [post, self.old_post])
+        self.assertEqual(self.follow_feed(self.stranger_client), [])
+
+    @override_settings(TASKS_BACKEND='database')
+    def test_fan_out_runs_in_background(self):
+        self.follow_author()
+        post = Post.objects.create(text='Новый текст', author=self.author)
+        self.assertEqual(self.follow_feed(self.authorized_client),
+                         [self.old_post])
+        self.assertEqual(run_pending(), (1, 0))
+        self.assertEqual(self.follow_feed(self.authorized_client),
+                         [post, self.old_post])
+
+    def test_unfollow_clears_timeline(self):
+        self.follow_author()
+        self.authorized_client.post(
+            reverse('profile_unfollow', kwargs={'username': 'test_author'})
+        )
+        self.assertFalse(Follow.objects.exists())
+        self.assertFalse(TimelineEntry.objects.exists())
+        self.assertEqual(
+            AuthorStats.objects.get(author=self.author).follower_count, 0
+        )
+
+    def test_deleted_user_releases_follow_counters(self):
+        self.follow_author()
+        self.stranger_client.post(
+            reverse('profile_follow', kwargs={'username': 'test_user'})
+        )
+        User.objects.filter(pk=self.user.pk).delete()
+        self.assertEqual(
+            AuthorStats.objects.get(author=self.author).follower_count, 0
+        )
+        self.assertEqual(
+            AuthorStats.objects.get(author=self.stranger).following_count, 0
+        )
+
+    def test_profile_shows_follow_counters(self):
+        self.follow_author()
+        response = self.authorized_client.get(
+            reverse('profile', kwargs={'username': 'test_author'})
+        )
+        self.assertTrue(response.context['following'])
+        self.assertContains(response, 'Подписчиков: 1')
+        self.assertContains(response, 'Отписаться')
+
+    def test_follow_index_requires_login(self):
+        response = Client().get(reverse('follow_index'))
+        self.assertRedirects(
+            response, f'{reverse("login")}?next={reverse("follow_index")}'
+        )
+
+
+@override_settings(POSTS_FANOUT_FOLLOWER_LIMIT=1)
+class HybridTimelineTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.reader = User.objects.create_user(username='test_reader')
+        cls.fan = User.objects.create_user(username='test_fan')
+        cls.star = User.objects.create_user(username='test_star')
+        cls.author = User.objects.create_user(username='test_author')
+        for user in (cls.reader, cls.fan):
+            follow(user, cls.star)
+        follow(cls.reader, cls.author)
+
+    def test_popular_author_is_not_fanned_out(self):
+        post = Post.objects.create(text='Текст звезды', author=self.star)
+        self.assertFalse(TimelineEntry.objects.filter(post=post).exists())
+        self.assertEqual(list(follow_page(self.reader)), [post])
+
+    def test_merged_pages_match_pull_strategy(self):
+        for i in range(12):
+            Post.objects.create(text=f'Звезда {i}', author=self.star)
+            Post.objects.create(text=f'Автор {i}', author=self.author)
+        for read in (follow_page, pull_follow_page):
+            with self.subTest(read=read.__name__):
+                seen = []
+                cursor = None
+                while True:
+                    page = read(self.reader, cursor=cursor)
+                    seen += list(page)
+                    if not page.has_next():
+                        break
+                    cursor = page.next_cursor
+                self.assertEqual(
+                    seen,
+                    list(Post.objects.order_by('-pub_date', '-pk'))
+                )
@@ -8,8 +8,7 @@ from ..models import Post, Group, User
 
 class PostFormTests(TestCase):
     @classmethod
-    def setUpClass(cls):
-        super().setUpClass()
+    def setUpTestData(cls):
         cls.user = User.objects.create_user(username='test_user')
         cls.group = Group.objects.create(
             title='Test_group',
@@ -0,0 +1,139 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from ..groups import get_group, get_group_by_slug
+from ..models import Group, Post, User
+
+
+class GroupRegistryTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='test_user')
+        cls.group = Group.objects.create(
+            title='Тестовый title',
+            slug='test',
+            description='описание'
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def group_queries(self, func):
+        with CaptureQueriesContext(connection) as queries:
+            result = func()
+        return result, [
+            query for query in queries
+            if 'FROM "posts_group" WHERE' in query['sql']
+        ]
+
+    def test_lookups_are_cached(self):
+        group, queries = self.group_queries(lambda: get_group_by_slug('test'))
+        self.assertEqual(group, self.group)
+        # id по slug, затем группа — после версии её ленты
+        self.assertEqual(len(queries), 2)
+        for lookup in (lambda: get_group_by_slug('test'),
+                       lambda: get_group(self.group.pk)):
+            group, queries = self.group_queries(lookup)
+            self.assertEqual(group.title, 'Тестовый title')
+            self.assertEqual(queries, [])
+
+    def test_rename_and_delete(self):
+        get_group_by_slug('test')
+        group = Group.objects.get(pk=self.group.pk)
+        group.slug = 'renamed'
+        group.title = 'Новый title'
+        group.save()
+        self.assertIsNone(get_group_by_slug('test'))
+        self.assertEqual(get_group_by_slug('renamed').title, 'Новый title')
+        group.delete()
+        self.assertIsNone(get_group_by_slug('renamed'))
+        self.assertIsNone(get_group(self.group.pk))
+        response = Client().get(
+            reverse('group_posts', kwargs={'slug': 'renamed'})
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_new_post_refreshes_post_count(self):
+        self.assertEqual(get_group_by_slug('test').post_count, 0)
+        Post.objects.create(text='Текст', author=self.user, group=self.group)
+        self.assertEqual(get_group_by_slug('test').post_count, 1)
+
+
+class GroupSelectTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='test_user')
+        Group.objects.bulk_create([
+            Group(title=f'Группа {i}', slug=f'group{i}') for i in range(50)
+        ])
+        cls.group = Group.objects.get(slug='group7')
+        cls.post = Post.objects.create(
+            text='Текст', author=cls.user, group=cls.group
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def test_new_post_renders_no_group_options(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.authorized_client.get(reverse('new_post'))
+        self.assertNotIn('posts_group', ' '.join(q['sql'] for q in queries))
+        self.assertContains(response, '<option', count=1)
+        self.assertContains(
+            response, f'data-autocomplete="{reverse("api_groups")}"'
+        )
+        self.assertContains(response, 'posts/group_select.js')
+
+    def test_edit_renders_selected_group(self):
+        response = self.authorized_client.get(reverse(
+            'post_edit',
+            kwargs={'username': 'test_user', 'post_id': self.post.pk}
+        ))
+        self.assertContains(response, '<option', count=2)
+        self.assertContains(
+            response,
+            f'<option value="{self.group.pk}" selected>Группа 7</option>',
+            html=True
+        )
+
+    def test_any_group_can_be_submitted(self):
+        group = Group.objects.get(slug='group42')
+        self.authorized_client.post(
+            reverse('new_post'), {'text': 'Новый пост', 'group': group.pk}
+        )
+        self.assertTrue(
+            Post.objects.filter(text='Новый пост', group=group).exists()
+        )
+
+    def test_api_search(self):
+        response = self.authorized_client.get(
+            reverse('api_groups'), {'q': 'уппа 4', 'fields': 'slug'}
+        )
+        slugs = [item['slug'] for item in response.json()['results']]
+        self.assertEqual(
+            slugs, ['group4'] + [f'group{i}' for i in range(40, 50)]
+        )
+
+    def test_group_by_slug_without_javascript(self):
+        response = self.authorized_client.get(reverse('new_post'))
+        self.assertContains(response, '<noscript>')
+        self.assertContains(response, 'name="group_slug"')
+        group = Group.objects.get(slug='group42')
+        self.authorized_client.post(reverse('new_post'), {
+            'text': 'Пост без JS', 'group': self.group.pk,
+            'group_slug': 'group42',
+        })
+        self.assertTrue(
+            Post.objects.filter(text='Пост без JS', group=group).exists()
+        )
+        response = self.authorized_client.post(reverse('new_post'), {
+            'text': 'Пост в никуда', 'group_slug': 'missing',
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('group', response.context['form'].errors)
+        self.assertFalse(Post.objects.filter(text='Пост в никуда').exists())
@@ -5,8 +5,7 @@ from ..models import Post, Group, User
 
 class PostModelTest(TestCase):
     @classmethod
-    def setUpClass(cls):
-        super().setUpClass()
+    def setUpTestData(cls):
         cls.user = User.objects.create_user(username='test_user')
         cls.post = Post.objects.create(
             text='Тестовый текст',
@@ -22,8 +21,7 @@ class PostModelTest(TestCase):
 
 class GroupModelTest(TestCase):
     @classmethod
-    def setUpClass(cls):
-        super().setUpClass()
+    def setUpTestData(cls):
         cls.group = Group.objects.create(
             title='Тестовый title',
             slug='test'
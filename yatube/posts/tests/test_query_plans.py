@@ -0,0 +1,102 @@
+import re
+from unittest import skipUnless
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from ..models import Post, Group, User
+
+FULL_SCAN = re.compile(r'\bSCAN (TABLE )?(?P<table>\w+)\b(?! USING)')
+TEMP_SORT = 'USE TEMP B-TREE'
+
+
+@skipUnless(connection.vendor == 'sqlite', 'EXPLAIN QUERY PLAN для SQLite')
+class FeedQueryPlanTests(TestCase):
+    """Ленты не должны сканировать posts_post целиком или сортировать."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='test_user')
+        cls.group = Group.objects.create(
+            title='Тестовый title',
+            slug='test',
+            description='описание'
+        )
+        for i in range(25):
+            Post.objects.create(
+                text=f'Тестовый текст {i}',
+                author=cls.user,
+                group=cls.group
+            )
+        cls.post = Post.objects.first()
+        cls.feeds = [
+            reverse('index'),
+            reverse('group_posts', kwargs={'slug': cls.group.slug}),
+            reverse('profile', kwargs={'username': cls.user.username}),
+        ]
+
+    def setUp(self):
+        self.guest_client = Client()
+
+    def explain(self, sql, params):
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            return [row[-1] for row in cursor.fetchall()]
+
+    def capture(self, adress, data=None):
+        # иначе ленты отдаются из кэша фрагментов без запросов к БД
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.guest_client.get(adress, data)
+        return response, [
+            query for query in queries.captured_queries
+            if '"posts_post"' in query['sql']
+        ]
+
+    def assert_plans_indexed(self, adress, data=None):
+        response, queries = self.capture(adress, data)
+        self.assertTrue(queries)
+        for query in queries:
+            # captured_queries хранит SQL уже с подставленными значениями
+            plan = self.explain(query['sql'], ())
+            for step in plan:
+                with self.subTest(adress=adress, step=step):
+                    match = FULL_SCAN.search(step)
+                    self.assertFalse(
+                        match and match.group('table') == 'posts_post',
+                        f'Полный проход по posts_post: {query["sql"]}'
+                    )
+                    self.assertNotIn(
+                        TEMP_SORT, step,
+                        f'Сортировка во временном B-дереве: {query["sql"]}'
+                    )
+        return response
+
+    def test_feed_first_pages_use_indexes(self):
+        for adress in self.feeds:
+            self.assert_plans_indexed(adress)
+
+    def test_feed_cursor_pages_use_indexes(self):
+        for adress in self.feeds:
+            page = self.guest_client.get(adress).context['page']
+            response = self.assert_plans_indexed(
+                adress, {'cursor': page.next_cursor}
+            )
+            page = response.context['page']
+            self.assert_plans_indexed(
+                adress, {'cursor': page.previous_cursor}
+            )
+
+    def test_post_view_uses_indexes(self):
+        self.assert_plans_indexed(
+            reverse(
+                'post_view',
+                kwargs={
+                    'username': self.user.username,
+                    'post_id': self.post.id,
+                }
+            )
+        )
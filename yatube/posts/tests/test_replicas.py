@@ -0,0 +1,151 @@
+from django.core.cache import cache
+from django.db import router
+from django.http import HttpResponse
+from django.test import Client, RequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from yatube.replicas import PIN_COOKIE, PinPrimaryMiddleware, use_replica
+
+from ..cache import FEED_BUMPED_KEY, INDEX_FEED
+from ..models import Post, User
+
+
+@use_replica
+def read_aliases(request):
+    return router.db_for_read(Post), router.db_for_read(User)
+
+
+@use_replica
+def post_read_aliases(request):
+    return {router.db_for_read(Post) for _ in range(20)}
+
+
+@override_settings(DATABASE_REPLICAS=['replica'])
+class ReplicaRoutingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='test_user')
+        cls.author = User.objects.create_user(username='test_author')
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    @staticmethod
+    def write_on_get(request):
+        router.db_for_write(Post)
+        return HttpResponse()
+
+    def test_feed_reads_go_to_replica(self):
+        self.assertEqual(
+            read_aliases(self.factory.get('/')), ('replica', 'default')
+        )
+        self.assertEqual(router.db_for_read(Post), 'default')
+        self.assertEqual(router.db_for_write(Post), 'default')
+
+    @override_settings(DATABASE_REPLICAS=['replica', 'replica2'])
+    def test_one_replica_per_request(self):
+        for _ in range(5):
+            self.assertEqual(
+                len(post_read_aliases(self.factory.get('/'))), 1
+            )
+
+    def test_pinned_and_unsafe_requests_read_primary(self):
+        pinned = self.factory.get('/')
+        pinned.COOKIES[PIN_COOKIE] = '1'
+        for request in (pinned, self.factory.post('/')):
+            with self.subTest(method=request.method):
+                self.assertEqual(
+                    read_aliases(request), ('default', 'default')
+                )
+
+    def test_writes_pin_client_to_primary(self):
+        responses = {
+            'post': self.authorized_client.post(
+                reverse('new_post'), {'text': 'Текст'}
+            ),
+            'write on get': PinPrimaryMiddleware(self.write_on_get)(
+                self.factory.get('/')
+            ),
+        }
+        for name, response in responses.items():
+            with self.subTest(name=name):
+                self.assertIn(PIN_COOKIE, response.cookies)
+        response = self.authorized_client.get(reverse('follow_index'))
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+
+
+@override_settings(DATABASE_REPLICAS=['replica'])
+class ReplicaDatabaseTests(TestCase):
+    """Две настоящие базы: реплика отстаёт от основной на одну запись."""
+    databases = {'default', 'replica'}
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(username='test_author')
+        User.objects.using('replica').create(
+            pk=cls.author.pk, username='test_author'
+        )
+        # пост, который есть только на реплике: по нему видно, откуда
+        # читал запрос; id далеко от тех, что выдаст основная база
+        Post.objects.using('replica').bulk_create([
+            Post(pk=1000, text='Только на реплике', author_id=cls.author.pk)
+        ])
+        cls.replica_post = Post.objects.using('replica').get()
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+        self.author_client = Client()
+        self.author_client.force_login(self.author)
+
+    def post_url(self, post_id):
+        return reverse(
+            'post_view',
+            kwargs={'username': 'test_author', 'post_id': post_id}
+        )
+
+    def test_unpinned_reads_go_to_replica(self):
+        response = self.guest_client.get(self.post_url(self.replica_post.pk))
+        self.assertContains(response, 'Только на реплике')
+        self.assertFalse(Post.objects.using('default').exists())
+
+    def test_read_after_write_uses_primary(self):
+        response = self.author_client.post(
+            reverse('new_post'), {'text': 'Свежий пост'}
+        )
+        self.assertIn(PIN_COOKIE, response.cookies)
+        post = Post.objects.using('default').get(text='Свежий пост')
+        self.assertFalse(
+            Post.objects.using('replica').filter(pk=post.pk,
+                                                 text='Свежий пост').exists()
+        )
+        # автор с кукой читает основную базу и видит свою запись
+        response = self.author_client.get(self.post_url(post.pk))
+        self.assertContains(response, 'Свежий пост')
+        # без куки — реплика, которая запись ещё не получила
+        response = self.guest_client.get(self.post_url(post.pk))
+        self.assertNotContains(response, 'Свежий пост', status_code=404)
+
+    def test_recently_changed_feed_reads_primary(self):
+        response = self.guest_client.get(reverse('index'))
+        self.assertContains(response, 'Только на реплике')
+        self.author_client.post(reverse('new_post'), {'text': 'Свежий пост'})
+        # реплика отстаёт, но лента только что изменилась: страницу под
+        # новой версией собирает основная база
+        response = self.guest_client.get(reverse('index'))
+        self.assertContains(response, 'Свежий пост')
+        self.assertNotContains(response, 'Только на реплике')
+        etag = response['ETag']
+        # метка истекла, реплика догнала запись: кэш и ETag не устарели
+        cache.delete(FEED_BUMPED_KEY.format(INDEX_FEED))
+        Post.objects.using('replica').bulk_create([
+            Post(text='Свежий пост', author_id=self.author.pk)
+        ])
+        response = self.guest_client.get(reverse('index'))
+        self.assertContains(response, 'Свежий пост')
+        response = self.guest_client.get(
+            reverse('index'), HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, 304)
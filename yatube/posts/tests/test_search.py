@@ -0,0 +1,165 @@
+from io import StringIO
+from unittest import mock, skipUnless
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from ..models import Post, Group, User
+from ..search import FTS_TABLE, search_posts
+
+
+@skipUnless(connection.vendor == 'sqlite', 'FTS5 есть только на SQLite')
+class PostSearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='test_user')
+        cls.user1 = User.objects.create_user(username='test_user1')
+        cls.group = Group.objects.create(
+            title='Тестовый title',
+            slug='test',
+            description='описание'
+        )
+        cls.rare = Post.objects.create(
+            text='Котики и длинный текст про погоду, новости и прочее',
+            author=cls.user
+        )
+        cls.frequent = Post.objects.create(
+            text='Котики, котики, котики!',
+            author=cls.user1,
+            group=cls.group
+        )
+        Post.objects.bulk_create([
+            Post(text=f'Собаки номер {i}', author=cls.user, group=cls.group)
+            for i in range(25)
+        ])
+
+    def setUp(self):
+        self.guest_client = Client()
+
+    def search(self, **params):
+        response = self.guest_client.get(reverse('search'), params)
+        return response, list(response.context['page'])
+
+    def test_results_are_ranked(self):
+        response, posts = self.search(q='КОТИКИ')
+        self.assertEqual(posts, [self.frequent, self.rare])
+        self.assertTemplateUsed(response, 'search.html')
+
+    def test_prefix_and_all_words(self):
+        _, posts = self.search(q='кот погод')
+        self.assertEqual(posts, [self.rare])
+
+    def test_filters_by_group_and_author(self):
+        _, posts = self.search(q='котики', group=self.group.slug)
+        self.assertEqual(posts, [self.frequent])
+        _, posts = self.search(q='котики', author=self.user.username)
+        self.assertEqual(posts, [self.rare])
+
+    def test_unknown_group_is_404(self):
+        response = self.guest_client.get(
+            reverse('search'), {'q': 'котики', 'group': 'nope'}
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_fts_syntax_in_query_is_escaped(self):
+        for query in ('"котики', 'котики OR', 'NEAR(', '*', 'text:котики'):
+            with self.subTest(query=query):
+                response = self.guest_client.get(
+                    reverse('search'), {'q': query}
+                )
+                self.assertEqual(response.status_code, 200)
+
+    def test_cursor_pages_cover_all_results_once(self):
+        seen = []
+        cursor = ''
+        while True:
+            page = search_posts('собаки', cursor=cursor)
+            seen += [post.pk for post in page]
+            if not page.has_next():
+                break
+            cursor = page.next_cursor
+        self.assertEqual(len(seen), 25)
+        self.assertEqual(len(set(seen)), 25)
+
+    def test_previous_cursor_returns_previous_page(self):
+        # в нижнем регистре: LIKE в SQLite не сравнивает кириллицу
+        # без учёта регистра
+        for fts in (True, False):
+            with self.subTest(fts=fts), mock.patch(
+                'posts.search.fts_available', return_value=fts
+            ):
+                pages = [search_posts('номер')]
+                while pages[-1].has_next():
+                    pages.append(search_posts(
+                        'номер', cursor=pages[-1].next_cursor
+                    ))
+                self.assertEqual(len(pages), 3)
+                self.assertFalse(pages[0].has_previous())
+                page = pages[-1]
+                for expected in reversed(pages[:-1]):
+                    page = search_posts(
+                        'номер', cursor=page.previous_cursor
+                    )
+                    self.assertEqual(list(page), list(expected))
+                    self.assertTrue(page.has_next())
+                self.assertFalse(page.has_previous())
+
+    def test_page_links_keep_filters(self):
+        response, _ = self.search(q='собаки', group='test')
+        next_cursor = response.context['page'].next_cursor
+        self.assertContains(
+            response, f'?q=%D1%81%D0%BE%D0%B1%D0%B0%D0%BA%D0%B8&amp;'
+                      f'group=test&cursor={next_cursor}'
+        )
+        response, _ = self.search(q='собаки', group='test',
+                                  cursor=next_cursor)
+        self.assertContains(response, 'Предыдущая')
+
+    def test_index_follows_writes(self):
+        post = Post.objects.create(text='Ежики в тумане', author=self.user)
+        self.assertEqual(list(search_posts('ежики')), [post])
+        Post.objects.filter(pk=post.pk).update(text='Лисички в лесу')
+        self.assertEqual(list(search_posts('ежики')), [])
+        self.assertEqual(list(search_posts('лисички')), [post])
+        post.delete()
+        self.assertEqual(list(search_posts('лисички')), [])
+
+    def test_search_does_not_scan_posts(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'EXPLAIN QUERY PLAN SELECT p.id FROM {FTS_TABLE} '
+                f'JOIN posts_post p ON p.id = {FTS_TABLE}.rowid '
+                f'WHERE {FTS_TABLE} MATCH %s',
+                ['"котики"*']
+            )
+            plan = ' '.join(row[-1] for row in cursor.fetchall())
+        self.assertIn('VIRTUAL TABLE INDEX', plan)
+        self.assertNotRegex(plan, r'SCAN (TABLE )?p\b(?! USING)')
+
+    def test_admin_search_uses_index(self):
+        admin = User.objects.create_superuser(
+            username='admin', email='admin@example.com', password='pass'
+        )
+        client = Client()
+        client.force_login(admin)
+        response = client.get(
+            reverse('admin:posts_post_changelist'), {'q': 'котики'}
+        )
+        self.assertEqual(
+            set(response.context['cl'].result_list),
+            {self.rare, self.frequent}
+        )
+
+    def test_rebuild_command(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('delete-all')"
+            )
+        self.assertEqual(list(search_posts('котики')), [])
+        out = StringIO()
+        call_command('rebuild_search_index', '--optimize', stdout=out)
+        self.assertEqual(
+            list(search_posts('котики')), [self.frequent, self.rare]
+        )
@@ -0,0 +1,132 @@
+import os
+import shutil
+import tempfile
+import threading
+from unittest import mock
+
+from django.db import OperationalError, connection
+from django.test import SimpleTestCase
+
+from yatube.sqlite.base import DatabaseWrapper
+from yatube.sqlite.writer import retry_locked, serialized_write
+
+
+class SqliteBackendTests(SimpleTestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def wrapper(self, options, close=True):
+        settings_dict = {
+            **connection.settings_dict,
+            'ENGINE': 'yatube.sqlite',
+            'NAME': os.path.join(self.tmp_dir, 'db.sqlite3'),
+            'OPTIONS': options,
+        }
+        wrapper = DatabaseWrapper(settings_dict, alias='sqlite_test')
+        if close:
+            self.addCleanup(wrapper.close)
+        return wrapper
+
+    def pragma(self, wrapper, name):
+        with wrapper.cursor() as cursor:
+            cursor.execute(f'PRAGMA {name}')
+            return cursor.fetchone()[0]
+
+    def test_default_pragmas(self):
+        wrapper = self.wrapper({})
+        self.assertEqual(self.pragma(wrapper, 'journal_mode'), 'wal')
+        # synchronous=NORMAL
+        self.assertEqual(self.pragma(wrapper, 'synchronous'), 1)
+        self.assertTrue(wrapper.write_queue)
+
+    def test_pragmas_from_options(self):
+        wrapper = self.wrapper({
+            'pragmas': {'cache_size': -1024}, 'write_queue': False,
+        })
+        # остальные PRAGMAS на месте
+        self.assertEqual(self.pragma(wrapper, 'journal_mode'), 'wal')
+        self.assertEqual(self.pragma(wrapper, 'busy_timeout'), 5000)
+        self.assertEqual(self.pragma(wrapper, 'cache_size'), -1024)
+        self.assertFalse(wrapper.write_queue)
+
+    def test_journal_mode_can_be_overridden(self):
+        wrapper = self.wrapper({'pragmas': {'journal_mode': 'delete'}})
+        self.assertEqual(self.pragma(wrapper, 'journal_mode'), 'delete')
+
+    def test_concurrent_writers_wait_instead_of_failing(self):
+        threads, writes = 8, 25
+        with self.wrapper({}).cursor() as cursor:
+            cursor.execute('CREATE TABLE item (id INTEGER PRIMARY KEY, n)')
+        errors = []
+
+        def write():
+            # у каждого потока своё соединение, как у потоков запросов;
+            # закрыть его можно только в этом же потоке
+            wrapper = self.wrapper({}, close=False)
+            try:
+                for i in range(writes):
+                    with wrapper.cursor() as cursor:
+                        cursor.execute('BEGIN')
+                        cursor.execute('INSERT INTO item (n) VALUES (%s)', [i])
+                        cursor.execute('INSERT INTO item (n) VALUES (%s)', [i])
+                        cursor.execute('COMMIT')
+            except OperationalError as error:
+                errors.append(str(error))
+            finally:
+                wrapper.close()
+
+        workers = [threading.Thread(target=write) for _ in range(threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(
+            self.pragma(self.wrapper({}), 'journal_mode'), 'wal'
+        )
+        with self.wrapper({}).cursor() as cursor:
+            cursor.execute('SELECT COUNT(*) FROM item')
+            self.assertEqual(cursor.fetchone()[0], threads * writes * 2)
+
+
+class WriteQueueTests(SimpleTestCase):
+    @mock.patch('yatube.sqlite.writer.time.sleep')
+    def test_retry_on_lock(self, sleep):
+        calls = []
+
+        def flaky():
+            calls.append(1)
+            if len(calls) < 3:
+                raise OperationalError('database is locked')
+            return 'ok'
+
+        self.assertEqual(retry_locked(flaky), 'ok')
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(sleep.call_count, 2)
+
+    def test_other_errors_are_not_retried(self):
+        calls = []
+
+        def broken():
+            calls.append(1)
+            raise OperationalError('no such table: posts_post')
+
+        with self.assertRaises(OperationalError):
+            retry_locked(broken)
+        self.assertEqual(len(calls), 1)
+
+    @mock.patch('yatube.sqlite.writer.time.sleep')
+    def test_gives_up_after_retries(self, sleep):
+        def locked():
+            raise OperationalError('database is locked')
+
+        with self.assertRaises(OperationalError):
+            retry_locked(locked, retries=3)
+        self.assertEqual(sleep.call_count, 2)
+
+    def test_inside_transaction_runs_inline(self):
+        with mock.patch.object(connection, 'in_atomic_block', True):
+            self.assertEqual(serialized_write(lambda: 42), 42)
@@ -0,0 +1,103 @@
+import os
+import shutil
+import tempfile
+
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.template import Context, Template
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from yatube.staticfiles import IMMUTABLE, serve
+
+SOURCES = {
+    'bootstrap/dist/css/bootstrap.min.css': 'body{margin:0}\n' * 100,
+    'bootstrap/dist/js/bootstrap.min.js': 'var bootstrap=1;\n' * 100,
+    'jquery/dist/jquery.min.js': 'var jQuery=1;\n' * 100,
+}
+
+
+class StaticBundleTagTests(SimpleTestCase):
+    template = Template(
+        "{% load static_bundles %}{% static_bundle 'bundles/yatube.js' %}"
+    )
+
+    def test_sources_without_bundles(self):
+        html = self.template.render(Context())
+        self.assertIn('/static/jquery/dist/jquery.min.js', html)
+        self.assertIn('/static/bootstrap/dist/js/bootstrap.min.js', html)
+        self.assertEqual(html.count('<script'), 2)
+
+    @override_settings(
+        STATIC_USE_BUNDLES=True,
+        STATICFILES_STORAGE='yatube.staticfiles.CompressedManifestStorage'
+    )
+    def test_missing_bundle_falls_back_to_sources(self):
+        with self.assertRaises(ValueError):
+            staticfiles_storage.url('bundles/yatube.js')
+        self.assertEqual(
+            self.template.render(Context()).count('<script'), 2
+        )
+
+
+class CompressedManifestStorageTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.tmp_dir = tempfile.mkdtemp()
+        source_dir = os.path.join(cls.tmp_dir, 'assets')
+        for name, content in SOURCES.items():
+            path = os.path.join(source_dir, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w') as source_file:
+                source_file.write(content)
+        cls.settings = override_settings(
+            STATICFILES_DIRS=[source_dir],
+            STATIC_ROOT=os.path.join(cls.tmp_dir, 'static'),
+            STATICFILES_STORAGE=(
+                'yatube.staticfiles.CompressedManifestStorage'
+            ),
+            STATIC_USE_BUNDLES=True,
+        )
+        cls.settings.enable()
+        call_command('collectstatic', interactive=False, verbosity=0)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.settings.disable()
+        shutil.rmtree(cls.tmp_dir, ignore_errors=True)
+        super().tearDownClass()
+
+    def test_bundle_is_hashed_and_compressed(self):
+        name = staticfiles_storage.stored_name('bundles/yatube.js')
+        self.assertNotEqual(name, 'bundles/yatube.js')
+        self.assertTrue(staticfiles_storage.exists(name + '.gz'))
+        with staticfiles_storage.open(name) as bundle:
+            content = bundle.read().decode()
+        self.assertIn('var jQuery=1;', content)
+        self.assertLess(content.index('jQuery'), content.index('bootstrap'))
+
+    def test_tag_renders_single_bundle(self):
+        html = Template(
+            "{% load static_bundles %}{% static_bundle 'bundles/yatube.js' %}"
+        ).render(Context())
+        self.assertEqual(html.count('<script'), 1)
+        self.assertIn(
+            staticfiles_storage.url('bundles/yatube.js'), html
+        )
+
+    def test_serve_compressed_and_immutable(self):
+        name = staticfiles_storage.stored_name('bundles/yatube.css')
+        request = RequestFactory().get(
+            '/static/' + name, HTTP_ACCEPT_ENCODING='gzip, deflate'
+        )
+        response = serve(request, name)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Content-Type'], 'text/css')
+        self.assertEqual(response['Cache-Control'], IMMUTABLE)
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+
+    def test_serve_plain_without_accept_encoding(self):
+        name = staticfiles_storage.stored_name('bundles/yatube.css')
+        response = serve(RequestFactory().get('/static/' + name), name)
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertIn(b'body{margin:0}', b''.join(response.streaming_content))
@@ -0,0 +1,48 @@
+from django.contrib.auth.models import AnonymousUser
+from django.template import Context, Template
+from django.test import TestCase
+from django.urls import reverse
+
+from ..models import Post, User
+
+
+class PostCardTagTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='test_user')
+        cls.reader = User.objects.create_user(username='test_reader')
+        cls.post = Post.objects.create(
+            text='Первая строка\n<b>вторая</b>',
+            author=cls.user
+        )
+        cls.template = Template(
+            '{% load post_cards %}{% post_card post %}'
+        )
+
+    def render(self, user):
+        return self.template.render(Context({'post': self.post, 'user': user}))
+
+    def test_links_and_text(self):
+        html = self.render(AnonymousUser())
+        kwargs = {'username': 'test_user', 'post_id': self.post.pk}
+        self.assertIn(
+            f'href="{reverse("profile", kwargs={"username": "test_user"})}"',
+            html
+        )
+        self.assertIn(f'href="{reverse("post_edit", kwargs=kwargs)}"', html)
+        self.assertIn('Первая строка<br>&lt;b&gt;вторая&lt;/b&gt;', html)
+        self.assertNotIn('Добавить комментарий', html)
+        self.assertNotIn('Редактировать', html)
+
+    def test_authenticated_reader(self):
+        html = self.render(self.reader)
+        post_url = reverse(
+            'post_view',
+            kwargs={'username': 'test_user', 'post_id': self.post.pk}
+        )
+        self.assertIn(f'href="{post_url}"', html)
+        self.assertIn('Добавить комментарий', html)
+        self.assertNotIn('Редактировать', html)
+
+    def test_author_can_edit(self):
+        self.assertIn('Редактировать', self.render(self.user))
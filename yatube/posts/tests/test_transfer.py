@@ -0,0 +1,172 @@
+import json
+import os
+import shutil
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from ..cache import INDEX_FEED, get_feed_version
+from ..models import AuthorStats, Post, Group, User
+from ..transfer import import_rows
+
+
+class PostTransferTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='test_user')
+        cls.group = Group.objects.create(
+            title='Тестовый title',
+            slug='test',
+            description='описание'
+        )
+        Post.objects.create(
+            text='Текст с "кавычками",\nзапятой и переводом строки',
+            author=cls.user,
+            group=cls.group
+        )
+        Post.objects.create(text='Текст без группы', author=cls.user)
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def snapshot(self):
+        return list(Post.objects.order_by('pk').values_list(
+            'text', 'pub_date', 'author__username', 'group__slug'
+        ))
+
+    def test_roundtrip(self):
+        for fmt in ('jsonl', 'csv'):
+            with self.subTest(fmt=fmt):
+                path = os.path.join(self.tmp_dir, f'posts.{fmt}')
+                before = self.snapshot()
+                call_command('export_posts', '-o', path, stderr=StringIO())
+                Post.objects.all().delete()
+                call_command('import_posts', path, stdout=StringIO())
+                self.assertEqual(self.snapshot(), before)
+
+    def test_export_is_json_lines(self):
+        out = StringIO()
+        call_command('export_posts', stdout=out, stderr=StringIO())
+        rows = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(
+            [(row['author'], row['group']) for row in rows],
+            [('test_user', 'test'), ('test_user', '')]
+        )
+
+    def test_unknown_authors_and_groups(self):
+        rows = [
+            {'text': 'a', 'pub_date': '2021-05-01T10:00:00+00:00',
+             'author': 'ghost', 'group': ''},
+            {'text': 'b', 'pub_date': '2021-05-01T10:00:00+00:00',
+             'author': 'test_user', 'group': 'nope'},
+            {'text': 'c', 'pub_date': 'вчера',
+             'author': 'test_user', 'group': ''},
+        ]
+        imported, skipped, _, _ = import_rows(rows)
+        self.assertEqual((imported, skipped), (0, 3))
+        imported, skipped, _, _ = import_rows(
+            rows, create_authors=True, create_groups=True
+        )
+        self.assertEqual((imported, skipped), (2, 1))
+        self.assertTrue(User.objects.filter(username='ghost').exists())
+        self.assertTrue(Group.objects.filter(slug='nope').exists())
+
+    def test_malformed_rows_are_skipped(self):
+        rows = [
+            {'pub_date': '2021-05-01T10:00:00+00:00', 'author': 'test_user'},
+            {'text': None, 'pub_date': '2021-05-01T10:00:00+00:00',
+             'author': 'test_user'},
+            {'text': 'a', 'pub_date': 5, 'author': 'test_user'},
+            {'text': 'b', 'pub_date': '2021-13-45T10:00:00',
+             'author': 'test_user'},
+            {'text': 'c', 'pub_date': '2021-05-01T10:00:00+00:00',
+             'author': ['test_user']},
+            {'text': 'd', 'pub_date': '2021-05-01T10:00:00+00:00',
+             'author': 'test_user', 'group': {'slug': 'test'}},
+            ['text'],
+            {'text': 'Годный', 'pub_date': '2021-05-01T10:00:00+00:00',
+             'author': 'test_user', 'group': 'test'},
+        ]
+        skips = []
+        imported, skipped, _, _ = import_rows(
+            rows, on_skip=lambda number, reason: skips.append(number)
+        )
+        self.assertEqual((imported, skipped), (1, 7))
+        self.assertEqual(skips, [1, 2, 3, 4, 5, 6, 7])
+        self.assertTrue(Post.objects.filter(text='Годный').exists())
+
+    def test_command_reports_broken_lines(self):
+        path = os.path.join(self.tmp_dir, 'posts.jsonl')
+        with open(path, 'w', encoding='utf-8') as output:
+            output.write(
+                '{"text": "Первый", "pub_date": "2021-05-01T10:00:00+00:00",'
+                ' "author": "test_user"}\n'
+                '{"text": "обрыв\n'
+                '{"pub_date": "2021-05-01T10:00:00+00:00",'
+                ' "author": "test_user"}\n'
+                '{"text": "Последний", "pub_date": "2021-05-01T10:00:00Z",'
+                ' "author": "test_user"}\n'
+            )
+        out, err = StringIO(), StringIO()
+        call_command('import_posts', path, stdout=out, stderr=err)
+        self.assertIn('Загружено постов: 2, пропущено: 2', out.getvalue())
+        self.assertIn('пропущено (некорректный JSON): 1', err.getvalue())
+        self.assertIn('пропущено (нет текста): 1', err.getvalue())
+        self.assertTrue(Post.objects.filter(text='Последний').exists())
+
+    def test_import_in_batches(self):
+        rows = [
+            {'text': f'Текст {i}', 'pub_date': '2021-05-01T10:00:00+00:00',
+             'author': 'test_user', 'group': 'test'}
+            for i in range(5)
+        ]
+        progress = []
+        with self.assertNumQueries(2 + 3 * 5):
+            # автор и группа — по запросу на весь импорт, на пачку —
+            # savepoint, INSERT, id вставленных, UPDATE pub_date и release
+            import_rows(
+                rows,
+                batch_size=2,
+                on_batch=lambda imported, skipped: progress.append(imported)
+            )
+        self.assertEqual(progress, [2, 4, 5])
+
+    def test_import_keeps_auto_now_add_for_other_saves(self):
+        rows = [
+            {'text': f'Импорт {i}', 'pub_date': '2021-05-01T10:00:00+00:00',
+             'author': 'test_user', 'group': ''}
+            for i in range(2)
+        ]
+        saved = []
+
+        def save_elsewhere(imported, skipped):
+            # так save() из другого потока попадает между пачками
+            saved.append(Post.objects.create(text='Обычный', author=self.user))
+
+        import_rows(rows, batch_size=1, on_batch=save_elsewhere)
+        self.assertTrue(all(post.pub_date.year > 2021 for post in saved))
+        self.assertEqual(
+            set(Post.objects.filter(text__startswith='Импорт ').values_list(
+                'pub_date__year', flat=True
+            )),
+            {2021}
+        )
+
+    def test_import_updates_counters_and_feeds(self):
+        path = os.path.join(self.tmp_dir, 'posts.jsonl')
+        call_command('export_posts', '-o', path, stderr=StringIO())
+        version = get_feed_version(INDEX_FEED)
+        out = StringIO()
+        call_command('import_posts', path, stdout=out)
+        self.assertIn('Загружено постов: 2', out.getvalue())
+        self.assertIn('строк/с', out.getvalue())
+        self.assertEqual(
+            AuthorStats.objects.get(author=self.user).post_count, 4
+        )
+        self.assertEqual(Group.objects.get(pk=self.group.pk).post_count, 2)
+        self.assertNotEqual(get_feed_version(INDEX_FEED), version)
@@ -8,8 +8,7 @@ from ..models import Post, Group, User
 
 class StaticURLTests(TestCase):
     @classmethod
-    def setUpClass(cls):
-        super().setUpClass()
+    def setUpTestData(cls):
         cls.user = User.objects.create_user(username='test_user')
         cls.user1 = User.objects.create_user(username='test_user1')
         cls.post = Post.objects.create(
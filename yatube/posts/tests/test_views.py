@@ -1,14 +1,19 @@
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
 from django.urls.base import reverse
 from django import forms
 
+from ..services import publish_posts
+from .. import groups
 from ..models import Post, Group, User
+from .factories import make_posts, make_users
 
 
 class PostViewsTests(TestCase):
     @classmethod
-    def setUpClass(cls):
-        super().setUpClass()
+    def setUpTestData(cls):
         cls.user = User.objects.create_user(username='test_user')
         cls.group = Group.objects.create(
             title='Тестовый title',
@@ -121,26 +126,22 @@ class PostViewsTests(TestCase):
 
 class PaginatorViewsTest(TestCase):
     @classmethod
-    def setUpClass(cls):
-        super().setUpClass()
+    def setUpTestData(cls):
         cls.user = User.objects.create_user(username='test_user_p')
         cls.group = Group.objects.create(
             title='Тестовый title',
             slug='test',
             description='описание'
         )
-        for i in range(13):
-            cls.post = Post.objects.create(
-                text='Тестовый текст',
-                author=cls.user,
-                group=cls.group
-            )
+        make_posts(cls.user, 13, cls.group, text='Тестовый текст')
         cls.url_names = [
             reverse('index'),
-            reverse('group_posts', kwargs={'slug': f'{cls.group.slug}'})
+            reverse('group_posts', kwargs={'slug': f'{cls.group.slug}'}),
+            reverse('profile', kwargs={'username': f'{cls.user.username}'}),
         ]
 
     def setUp(self):
+        cache.clear()
         self.authorized_client = Client()
         self.authorized_client.force_login(self.user)
 
@@ -155,16 +156,179 @@ class PaginatorViewsTest(TestCase):
     def test_second_page_contains_three_records(self):
         for adress in self.url_names:
             with self.subTest(adress=adress):
-                response = self.authorized_client.get(adress + '?page=2')
-                i = response.context.get('page')
-                # здесь та же проблема, потому оставил старый способ
-                self.assertEqual(i.paginator.page(2).object_list.count(), 3)
+                first = self.authorized_client.get(adress).context['page']
+                response = self.authorized_client.get(
+                    adress, {'cursor': first.next_cursor}
+                )
+                page = response.context.get('page')
+                self.assertEqual(len(page), 3)
+                self.assertTrue(page.has_previous())
+                self.assertFalse(page.has_next())
+
+    def test_legacy_page_redirects_to_cursor(self):
+        for adress in self.url_names:
+            with self.subTest(adress=adress):
+                first = self.authorized_client.get(adress).context['page']
+                response = self.authorized_client.get(adress, {'page': 2})
+                self.assertRedirects(
+                    response, f'{adress}?cursor={first.next_cursor}'
+                )
+                # первая, несуществующая и битая страницы ведут на начало
+                for number in ('1', '3', 'abc', '99999999999999999999',
+                               '-5'):
+                    response = self.authorized_client.get(
+                        adress, {'page': number}
+                    )
+                    self.assertRedirects(response, adress)
+
+
+class CursorPaginatorViewsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='test_user_c')
+        cls.group = Group.objects.create(
+            title='Тестовый title',
+            slug='test',
+            description='описание'
+        )
+        make_posts(cls.user, 30, cls.group)
+        cls.url_names = [
+            reverse('index'),
+            reverse('group_posts', kwargs={'slug': f'{cls.group.slug}'}),
+            reverse('profile', kwargs={'username': f'{cls.user.username}'}),
+        ]
+        cls.expected = list(
+            Post.objects.order_by('-pub_date', '-pk').values_list(
+                'pk', flat=True
+            )
+        )
+
+    def setUp(self):
+        self.guest_client = Client()
+        cache.clear()
+
+    def walk_forward(self, adress):
+        pages = []
+        cursor = ''
+        while True:
+            response = self.guest_client.get(adress, {'cursor': cursor})
+            page = response.context.get('page')
+            pages.append(page)
+            if not page.has_next():
+                return pages
+            cursor = page.next_cursor
+
+    def test_forward_walk_covers_all_posts_once(self):
+        for adress in self.url_names:
+            with self.subTest(adress=adress):
+                pages = self.walk_forward(adress)
+                seen = [post.pk for page in pages for post in page]
+                self.assertEqual(seen, self.expected)
+                self.assertEqual(len(pages), 3)
+                self.assertFalse(pages[0].has_previous())
+                self.assertTrue(pages[-1].has_previous())
+
+    def test_previous_cursor_returns_previous_page(self):
+        for adress in self.url_names:
+            with self.subTest(adress=adress):
+                first, second, third = self.walk_forward(adress)
+                response = self.guest_client.get(
+                    adress, {'cursor': third.previous_cursor}
+                )
+                page = response.context.get('page')
+                self.assertEqual(list(page), list(second))
+                response = self.guest_client.get(
+                    adress, {'cursor': page.previous_cursor}
+                )
+                page = response.context.get('page')
+                self.assertEqual(list(page), list(first))
+                self.assertFalse(page.has_previous())
+                self.assertTrue(page.has_next())
+
+    def test_broken_cursor_returns_first_page(self):
+        first = self.walk_forward(self.url_names[0])[0]
+        for cursor in ('abc', '!!!', 'WyJ4IiwgMV0'):
+            with self.subTest(cursor=cursor):
+                response = self.guest_client.get(
+                    self.url_names[0], {'cursor': cursor}
+                )
+                self.assertEqual(
+                    list(response.context.get('page')), list(first)
+                )
+
+    def test_deep_page_costs_same_as_first(self):
+        for adress in self.url_names:
+            with self.subTest(adress=adress):
+                first, second, third = self.walk_forward(adress)
+                counts = []
+                for cursor in ('', second.previous_cursor, first.next_cursor):
+                    cache.clear()
+                    with CaptureQueriesContext(connection) as queries:
+                        self.guest_client.get(adress, {'cursor': cursor})
+                    counts.append(len(queries))
+                    sql = ' '.join(q['sql'] for q in queries)
+                    self.assertNotIn('OFFSET', sql.upper())
+                self.assertEqual(len(set(counts)), 1)
+
+
+class FeedQueryCountTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.group = Group.objects.create(
+            title='Тестовый title',
+            slug='test',
+            description='описание'
+        )
+        cls.author = User.objects.create_user(username='test_author')
+        users = make_users(15, first_name='Имя', last_name='Фамилия {}')
+        for i, user in enumerate(users):
+            publish_posts(user, [
+                Post(text=f'Тестовый текст {i}', group=cls.group)
+            ])
+        make_posts(cls.author, 15, cls.group, text='Текст автора {}')
+        # адрес ленты: запросы к БД на странице; у группы при холодном
+        # справочнике — id по slug, группа после версии её ленты и посты
+        cls.feed_queries = {
+            reverse('index'): 1,
+            reverse('group_posts', kwargs={'slug': f'{cls.group.slug}'}): 3,
+            reverse('profile', kwargs={'username': f'{cls.author}'}): 2,
+        }
+
+    def setUp(self):
+        self.guest_client = Client()
+        self.clear_caches()
+
+    def clear_caches(self):
+        cache.clear()
+        groups._slugs.clear()
+        groups._groups.clear()
+
+    def test_feed_query_count_is_constant(self):
+        for adress, queries in self.feed_queries.items():
+            with self.subTest(adress=adress):
+                with self.assertNumQueries(queries):
+                    response = self.guest_client.get(adress)
+                page = response.context.get('page')
+                # и справочник групп, и фрагменты лент снова холодные
+                self.clear_caches()
+                with self.assertNumQueries(queries):
+                    self.guest_client.get(
+                        adress, {'cursor': page.next_cursor}
+                    )
+
+    def test_feed_renders_authors_and_groups(self):
+        response = self.guest_client.get(reverse('index'))
+        posts = list(response.context.get('page'))
+        with self.assertNumQueries(0):
+            for post in posts:
+                post.author.get_full_name()
+                self.assertTrue(post.author.username)
+                self.assertEqual(post.group.slug, self.group.slug)
 
 
 class CreateViewsTests(TestCase):
     @classmethod
-    def setUpClass(cls):
-        super().setUpClass()
+    def setUpTestData(cls):
         cls.user = User.objects.create_user(username='test_user')
         cls.group = Group.objects.create(
             title='Тестовый title',
@@ -0,0 +1,149 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+from .counters import add_author_stat
+from .models import AuthorStats, Follow, Post, TimelineEntry
+from .paginators import CursorPage, dump_cursor, load_cursor
+
+# Сколько последних постов автора попадает в ленту при подписке.
+BACKFILL_POSTS = 50
+
+
+def is_popular(author_id):
+    """Популярным авторам лента собирается при чтении, а не при записи."""
+    return AuthorStats.objects.filter(
+        author_id=author_id,
+        follower_count__gt=settings.POSTS_FANOUT_FOLLOWER_LIMIT
+    ).exists()
+
+
+def fan_out_posts(author_id, posts):
+    """Разложить посты автора по лентам подписчиков; вернуть число записей.
+
+    Вызывается фоновой задачей posts.fan_out, подписчики читаются один
+    раз на пачку постов.
+    """
+    if is_popular(author_id):
+        return 0
+    followers = Follow.objects.filter(
+        author_id=author_id
+    ).values_list('user_id', flat=True)
+    entries = [
+        TimelineEntry(
+            user_id=user_id, post_id=post.pk, pub_date=post.pub_date
+        )
+        for user_id in followers.iterator()
+        for post in posts
+    ]
+    TimelineEntry.objects.bulk_create(
+        entries,
+        batch_size=settings.POSTS_FANOUT_BATCH_SIZE,
+        ignore_conflicts=True
+    )
+    return len(entries)
+
+
+def follow(user, author):
+    if user == author:
+        return False
+    with transaction.atomic():
+        _, created = Follow.objects.get_or_create(user=user, author=author)
+        if not created:
+            return False
+        add_author_stat(author.pk, 'follower_count', 1)
+        add_author_stat(user.pk, 'following_count', 1)
+        if not is_popular(author.pk):
+            recent = author.posts.order_by('-pub_date', '-pk').values_list(
+                'pk', 'pub_date'
+            )[:BACKFILL_POSTS]
+            TimelineEntry.objects.bulk_create(
+                [
+                    TimelineEntry(user=user, post_id=pk, pub_date=pub_date)
+                    for pk, pub_date in recent
+                ],
+                ignore_conflicts=True
+            )
+    return True
+
+
+def unfollow(user, author):
+    with transaction.atomic():
+        # счётчики уменьшает post_delete у Follow (posts.signals): он
+        # ловит и каскад при удалении пользователя
+        deleted, _ = Follow.objects.filter(user=user, author=author).delete()
+        if not deleted:
+            return False
+        TimelineEntry.objects.filter(user=user, post__author=author).delete()
+    return True
+
+
+def _load_timeline_cursor(cursor):
+    if not cursor:
+        return None
+    try:
+        pub_date, pk = load_cursor(cursor)
+        pub_date = parse_datetime(pub_date)
+        pk = int(pk)
+    except (TypeError, ValueError):
+        return None
+    if pub_date is None:
+        return None
+    return pub_date, pk
+
+
+def _before(after, date_field, pk_field):
+    if after is None:
+        return Q()
+    pub_date, pk = after
+    return (
+        Q(**{f'{date_field}__lt': pub_date})
+        | Q(**{date_field: pub_date, f'{pk_field}__lt': pk})
+    )
+
+
+def _build_page(keys, per_page):
+    """keys — пары (pub_date, post_id), уже отсортированные по убыванию."""
+    posts = Post.objects.for_feed().in_bulk([pk for _, pk in keys[:per_page]])
+    page = [posts[pk] for _, pk in keys[:per_page] if pk in posts]
+    next_cursor = None
+    if len(keys) > per_page:
+        pub_date, pk = keys[per_page - 1]
+        next_cursor = dump_cursor([pub_date.isoformat(), pk])
+    return CursorPage(page, None, next_cursor, None)
+
+
+def follow_page(user, cursor=None, per_page=10):
+    """Лента подписок: материализованная часть плюс популярные авторы.
+
+    Посты обычных авторов читаются из TimelineEntry по индексу
+    (user, pub_date, post). Посты популярных авторов, для которых
+    fan-out при записи не делается, добираются из posts_post по индексу
+    (author, pub_date). Обе выборки ограничены per_page + 1 и сливаются.
+    """
+    after = _load_timeline_cursor(cursor)
+    pushed = TimelineEntry.objects.filter(
+        _before(after, 'pub_date', 'post_id'), user=user
+    ).order_by('-pub_date', '-post_id').values_list('pub_date', 'post_id')
+    keys = set(pushed[:per_page + 1])
+    popular = Follow.objects.filter(
+        user=user,
+        author__stats__follower_count__gt=settings.POSTS_FANOUT_FOLLOWER_LIMIT
+    ).values_list('author_id', flat=True)
+    popular = list(popular)
+    if popular:
+        pulled = Post.objects.filter(
+            _before(after, 'pub_date', 'pk'), author_id__in=popular
+        ).order_by('-pub_date', '-pk').values_list('pub_date', 'pk')
+        keys.update(pulled[:per_page + 1])
+    return _build_page(sorted(keys, reverse=True), per_page)
+
+
+def pull_follow_page(user, cursor=None, per_page=10):
+    """Лента подписок чистым fan-out-on-read: JOIN подписок с постами."""
+    after = _load_timeline_cursor(cursor)
+    keys = Post.objects.filter(
+        _before(after, 'pub_date', 'pk'), author__following__user=user
+    ).order_by('-pub_date', '-pk').values_list('pub_date', 'pk')
+    return _build_page(list(keys[:per_page + 1]), per_page)
@@ -0,0 +1,245 @@
+"""Потоковый перенос постов в JSON Lines и CSV с ограниченной памятью."""
+import csv
+import json
+import os
+import resource
+from itertools import islice
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.db import reset_queries, transaction
+from django.utils.dateparse import parse_datetime
+
+from .models import Group, Post, User
+
+FIELDS = ('text', 'pub_date', 'author', 'group')
+FORMATS = ('jsonl', 'csv')
+
+
+def guess_format(path, fmt=None):
+    if fmt:
+        return fmt
+    extension = os.path.splitext(path or '')[1].lstrip('.').lower()
+    return 'csv' if extension == 'csv' else 'jsonl'
+
+
+def peak_memory_mb():
+    """Пиковый RSS процесса (ru_maxrss в Linux — КБ, в macOS — байты)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    divisor = 1024 * 1024 if os.uname().sysname == 'Darwin' else 1024
+    return round(peak / divisor, 1)
+
+
+def export_rows(queryset=None, chunk_size=2000):
+    """Посты по одному словарю, чтение с сервера курсором по chunk_size."""
+    queryset = Post.objects.all() if queryset is None else queryset
+    rows = queryset.order_by('pk').values_list(
+        'text', 'pub_date', 'author__username', 'group__slug'
+    )
+    for text, pub_date, author, group in rows.iterator(chunk_size):
+        yield {
+            'text': text,
+            'pub_date': pub_date.isoformat(),
+            'author': author,
+            'group': group or '',
+        }
+
+
+def write_rows(rows, stream, fmt):
+    count = 0
+    if fmt == 'csv':
+        writer = csv.DictWriter(stream, fieldnames=FIELDS)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    else:
+        for row in rows:
+            stream.write(json.dumps(row, ensure_ascii=False) + '\n')
+            count += 1
+    return count
+
+
+class BadRow(ValueError):
+    """Строка файла, которую нельзя превратить в пост."""
+
+
+def read_rows(stream, fmt):
+    if fmt == 'csv':
+        yield from csv.DictReader(stream)
+        return
+    for line in stream:
+        if line.strip():
+            try:
+                yield json.loads(line)
+            except ValueError:
+                # битая строка пропускается, а не обрывает загрузку
+                yield BadRow('некорректный JSON')
+
+
+def clean_row(row):
+    """(text, pub_date, author, group) строки или BadRow с причиной."""
+    if isinstance(row, BadRow):
+        raise row
+    if not isinstance(row, dict):
+        raise BadRow('ожидается объект')
+    text = row.get('text')
+    if not isinstance(text, str) or not text.strip():
+        raise BadRow('нет текста')
+    author = row.get('author')
+    if not isinstance(author, str) or not author:
+        raise BadRow('нет автора')
+    group = row.get('group') or ''
+    if not isinstance(group, str):
+        raise BadRow('group должен быть строкой')
+    try:
+        pub_date = parse_datetime(row.get('pub_date') or '')
+    except (TypeError, ValueError):
+        pub_date = None
+    if pub_date is None:
+        raise BadRow('некорректная pub_date')
+    return text, pub_date, author, group
+
+
+def batches(rows, size):
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+
+def insert_posts(posts):
+    """bulk_create с pub_date из файла, а не now().
+
+    auto_now_add подменяет pub_date при вставке, а выключать его на
+    общем поле модели нельзя: save() в другом потоке остался бы без
+    даты. Поэтому даты записываются вторым запросом, bulk_update, в той
+    же транзакции.
+    """
+    dates = [post.pub_date for post in posts]
+    with transaction.atomic():
+        # размер INSERT Django подберёт под лимиты СУБД
+        Post.objects.bulk_create(posts)
+        if posts and posts[0].pk is None:
+            # SQLite не возвращает id из bulk_create. Транзакция держит
+            # блокировку записи с первой вставки, поэтому последние id
+            # таблицы — наши.
+            ids = Post.objects.order_by('-pk').values_list(
+                'pk', flat=True
+            )[:len(posts)]
+            for post, pk in zip(posts, reversed(ids)):
+                post.pk = pk
+        for post, pub_date in zip(posts, dates):
+            post.pub_date = pub_date
+        Post.objects.bulk_update(posts, ['pub_date'])
+
+
+class LookupCache:
+    """username/slug → id: запросы только по ещё не встреченным ключам."""
+
+    # держим IN (...) в пределах лимита переменных старых SQLite
+    CHUNK = 500
+
+    def __init__(self, model, key, create=None):
+        self.model = model
+        self.key = key
+        self.create = create
+        self.ids = {}
+        self.missing = set()
+
+    def resolve(self, keys):
+        unknown = {key for key in keys if key and key not in self.ids}
+        unknown -= self.missing
+        if not unknown:
+            return
+        self._load(unknown)
+        unknown -= self.ids.keys()
+        if unknown and self.create:
+            self.model.objects.bulk_create(
+                [self.create(key) for key in unknown], ignore_conflicts=True
+            )
+            self._load(unknown)
+            unknown -= self.ids.keys()
+        self.missing |= unknown
+
+    def _load(self, keys):
+        for chunk in batches(keys, self.CHUNK):
+            self.ids.update(self.model.objects.filter(
+                **{f'{self.key}__in': chunk}
+            ).values_list(self.key, 'pk'))
+
+    def get(self, key):
+        return self.ids.get(key)
+
+
+def new_author(username):
+    return User(username=username, password=make_password(None))
+
+
+def new_group(slug):
+    return Group(title=slug, slug=slug)
+
+
+def clean_rows(rows, skip):
+    """(номер, *clean_row()) годных строк; о негодных сообщает skip."""
+    for number, row in enumerate(rows, 1):
+        try:
+            yield (number, *clean_row(row))
+        except BadRow as error:
+            skip(number, str(error))
+
+
+def import_rows(rows, batch_size=1000, create_authors=False,
+                create_groups=False, on_batch=None, on_skip=None):
+    """Вставить посты пачками; вернуть (вставлено, пропущено, авторы, группы).
+
+    Негодные строки пропускаются, on_skip(номер, причина) узнаёт о
+    каждой (строки нумеруются с 1, пустые в JSON Lines не считаются).
+    Сигналы при bulk_create не вызываются: счётчики и кэш лент
+    вызывающий код обновляет сам по возвращённым id авторов и групп, а в
+    ленты подписок (TimelineEntry) посты намеренно не раскладываются.
+    """
+    authors = LookupCache(User, 'username', create_authors and new_author)
+    groups = LookupCache(Group, 'slug', create_groups and new_group)
+    touched_authors = set()
+    touched_groups = set()
+    imported = skipped = 0
+
+    def skip(number, reason):
+        nonlocal skipped
+        skipped += 1
+        if on_skip:
+            on_skip(number, reason)
+
+    for batch in batches(clean_rows(rows, skip), batch_size):
+        authors.resolve(row[3] for row in batch)
+        groups.resolve(row[4] for row in batch)
+        posts = []
+        for number, text, pub_date, author, group in batch:
+            author_id = authors.get(author)
+            group_id = groups.get(group)
+            if author_id is None:
+                skip(number, 'неизвестный автор')
+                continue
+            if group and group_id is None:
+                skip(number, 'неизвестная группа')
+                continue
+            posts.append(Post(
+                text=text,
+                pub_date=pub_date,
+                author_id=author_id,
+                group_id=group_id,
+            ))
+            touched_authors.add(author_id)
+            if group_id is not None:
+                touched_groups.add(group_id)
+        insert_posts(posts)
+        imported += len(posts)
+        if settings.DEBUG:
+            # с DEBUG Django копит SQL всех запросов в памяти
+            reset_queries()
+        if on_batch:
+            on_batch(imported, skipped)
+    return imported, skipped, touched_authors, touched_groups
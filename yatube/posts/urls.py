@@ -1,12 +1,45 @@
-from django.urls import path
+from django.urls import path, re_path
 
-from . import views
+from . import api, views
+from .feeds import FORMATS
+
+# только известные форматы: иначе /feed/<что угодно>/ спорил бы с
+# путями профиля пользователя feed
+FEED = r'feed/(?P<fmt>%s)/$' % '|'.join(FORMATS)
 
 urlpatterns = [
     path('', views.index, name='index'),
+    re_path(f'^{FEED}', views.index_feed, name='index_feed'),
     path('group/<slug:slug>/', views.group_posts, name='group_posts'),
+    re_path(
+        rf'^group/(?P<slug>[-\w]+)/{FEED}',
+        views.group_posts_feed,
+        name='group_posts_feed'
+    ),
     path('new/', views.new_post, name='new_post'),
+    path('search/', views.search, name='search'),
+    path('api/posts/', api.post_list, name='api_posts'),
+    path('api/posts/batch/', api.post_batch, name='api_post_batch'),
+    path('api/posts/<int:post_id>/', api.post_detail, name='api_post'),
+    path('api/groups/', api.group_list, name='api_groups'),
+    path('api/groups/<slug:slug>/', api.group_detail, name='api_group'),
+    path('follow/', views.follow_index, name='follow_index'),
     path('<str:username>/', views.profile, name='profile'),
+    re_path(
+        rf'^(?P<username>[^/]+)/{FEED}',
+        views.profile_feed,
+        name='profile_feed'
+    ),
+    path(
+        '<str:username>/follow/',
+        views.profile_follow,
+        name='profile_follow'
+    ),
+    path(
+        '<str:username>/unfollow/',
+        views.profile_unfollow,
+        name='profile_unfollow'
+    ),
     path('<str:username>/<int:post_id>/', views.post_view, name='post_view'),
     path(
         '<str:username>/<int:post_id>/edit/',
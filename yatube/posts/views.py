@@ -1,47 +1,252 @@
+from django.conf import settings
 from django.shortcuts import get_object_or_404, render, redirect
-from django.core.paginator import Paginator
+from django.urls import reverse
 from django.contrib.auth.decorators import login_required
+from django.http import StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.functional import SimpleLazyObject
+from django.utils.http import quote_etag
+from django.views.decorators.http import require_POST
 
-from .models import Group, Post, User
+from yatube.replicas import use_replica
+from yatube.sqlite.writer import serialized_write
+
+from .cache import (
+    INDEX_FEED, author_feed, feed_cache, get_feed_version, group_feed,
+    page_etag
+)
+from .feeds import SINCE_HEADER, feed_posts, stream_feed
+from .models import AuthorStats, Follow, Post, User
 from .forms import PostForm
+from .groups import get_group_or_404
+from .paginators import CursorPaginator
+from .search import search_posts
+from .timeline import follow, follow_page, unfollow
+
+
+FEED_PAGE_SIZE = 10
+
+
+def get_feed_page(request, post_list, count=None):
+    # Страница выбирается из БД только при промахе кэша фрагмента ленты.
+    paginator = CursorPaginator(post_list, FEED_PAGE_SIZE, count=count)
+    cursor = request.GET.get('cursor')
+    return SimpleLazyObject(lambda: paginator.get_cursor_page(cursor))
+
+
+def legacy_page_redirect(request, post_list, count=None):
+    """Старая ссылка ?page=N — редирект на ту же страницу по курсору.
+
+    Не постоянный: с новыми постами N-я страница сдвигается.
+    """
+    if 'page' not in request.GET:
+        return None
+    params = request.GET.copy()
+    paginator = CursorPaginator(post_list, FEED_PAGE_SIZE, count=count)
+    cursor = paginator.cursor_for_page(params.pop('page')[-1])
+    params.pop('cursor', None)
+    if cursor is not None:
+        params['cursor'] = cursor
+    query = params.urlencode()
+    return redirect(f'{request.path}?{query}' if query else request.path)
+
+
+def render_if_modified(request, etag, template, context):
+    """render() с проверкой If-None-Match до рендера шаблона."""
+    etag = quote_etag(etag)
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = render(request, template, context)
+        response['ETag'] = etag
+    return response
+
+
+def author_etag_parts(author, stats):
+    return (
+        author.get_full_name(),
+        stats.post_count,
+        stats.follower_count,
+        stats.following_count,
+    )
+
+
+def get_author_stats(author):
+    try:
+        return author.stats
+    except User.stats.RelatedObjectDoesNotExist:
+        return AuthorStats(author=author)
 
 
+@use_replica
 def index(request):
-    post_list = Post.objects.all()
-    paginator = Paginator(post_list, 10)
-    page_number = request.GET.get('page')
-    page = paginator.get_page(page_number)
-    return render(request, 'index.html', {'page': page, })
+    post_list = Post.objects.for_feed()
+    legacy = legacy_page_redirect(request, post_list)
+    if legacy is not None:
+        return legacy
+    page = get_feed_page(request, post_list)
+    return render_if_modified(
+        request,
+        page_etag(request, get_feed_version(INDEX_FEED)),
+        'index.html',
+        {'page': page, 'feed_cache': feed_cache(INDEX_FEED), }
+    )
 
 
+@use_replica
 def group_posts(request, slug):
-    group = get_object_or_404(Group, slug=slug)
-    post_list = group.posts.all()
-    paginator = Paginator(post_list, 10)
-    page_number = request.GET.get('page')
-    page = paginator.get_page(page_number)
-    return render(request, 'group.html', {'group': group, 'page': page, })
+    group = get_group_or_404(slug)
+    post_list = group.posts.for_feed()
+    legacy = legacy_page_redirect(request, post_list, group.post_count)
+    if legacy is not None:
+        return legacy
+    page = get_feed_page(request, post_list, count=group.post_count)
+    return render_if_modified(
+        request,
+        page_etag(request, get_feed_version(group_feed(group.pk))),
+        'group.html',
+        {
+            'group': group,
+            'page': page,
+            'feed_cache': feed_cache(group_feed(group.pk)),
+        }
+    )
 
 
+@use_replica
 def profile(request, username):
+    author = get_object_or_404(
+        User.objects.select_related('stats'),
+        username=username
+    )
+    stats = get_author_stats(author)
+    # версия — до чтения постов и подписок: см. get_feed_version()
+    version = get_feed_version(author_feed(author.pk))
+    following = (
+        request.user.is_authenticated
+        and Follow.objects.filter(user=request.user, author=author).exists()
+    )
+    post_list = author.posts.for_feed()
+    legacy = legacy_page_redirect(request, post_list, stats.post_count)
+    if legacy is not None:
+        return legacy
+    page = get_feed_page(request, post_list, count=stats.post_count)
+    return render_if_modified(
+        request,
+        page_etag(
+            request,
+            version,
+            following,
+            *author_etag_parts(author, stats)
+        ),
+        'profile.html',
+        {
+            'author': author,
+            'stats': stats,
+            'following': following,
+            'page': page,
+            'feed_cache': feed_cache(author_feed(author.pk)),
+        }
+    )
+
+
+def feed_limit(request):
+    """?limit=N постов, limit=0 — вся история."""
+    try:
+        limit = int(request.GET.get('limit', settings.POSTS_FEED_LIMIT))
+    except ValueError:
+        return settings.POSTS_FEED_LIMIT
+    return max(limit, 0)
+
+
+def feed_response(request, fmt, feed, post_list, title, link, description):
+    etag = quote_etag(page_etag(request, get_feed_version(feed), fmt))
+    response = get_conditional_response(request, etag=etag)
+    if response is not None:
+        return response
+    posts = feed_posts(
+        post_list, since=request.GET.get('since'), limit=feed_limit(request)
+    )
+    content_type, body, since = stream_feed(
+        request, fmt, title, link, description, posts
+    )
+    response = StreamingHttpResponse(body, content_type=content_type)
+    response['ETag'] = etag
+    response[SINCE_HEADER] = since
+    return response
+
+
+@use_replica
+def index_feed(request, fmt):
+    return feed_response(
+        request, fmt, INDEX_FEED, Post.objects.all(),
+        'Yatube', reverse('index'), 'Последние записи Yatube'
+    )
+
+
+@use_replica
+def group_posts_feed(request, slug, fmt):
+    group = get_group_or_404(slug)
+    return feed_response(
+        request, fmt, group_feed(group.pk), group.posts.all(),
+        group.title, reverse('group_posts', kwargs={'slug': slug}),
+        group.description or group.title
+    )
+
+
+@use_replica
+def profile_feed(request, username, fmt):
     author = get_object_or_404(User, username=username)
-    post_list = author.posts.all()
-    paginator = Paginator(post_list, 10)
-    page_number = request.GET.get('page')
-    page = paginator.get_page(page_number)
+    name = author.get_full_name() or author.username
+    return feed_response(
+        request, fmt, author_feed(author.pk), author.posts.all(),
+        name, reverse('profile', kwargs={'username': username}),
+        f'Записи автора {name}'
+    )
+
+
+def search(request):
+    query = request.GET.get('q', '').strip()
+    group = author = None
+    if request.GET.get('group'):
+        group = get_group_or_404(request.GET['group'])
+    if request.GET.get('author'):
+        author = get_object_or_404(User, username=request.GET['author'])
+    page = search_posts(
+        query, group=group, author=author, cursor=request.GET.get('cursor')
+    )
+    # запрос и фильтры для ссылок на соседние страницы
+    params = request.GET.copy()
+    params.pop('cursor', None)
     return render(
         request,
-        'profile.html',
-        {'author': author, 'page': page, }
+        'search.html',
+        {
+            'query': query,
+            'group': group,
+            'author': author,
+            'page': page,
+            'search_params': params.urlencode(),
+        }
     )
 
 
+@use_replica
 def post_view(request, username, post_id):
     post = get_object_or_404(
-        Post.objects.select_related('author'),
+        Post.objects.select_related('author__stats'),
         id=post_id, author__username=username
     )
-    return render(request, 'post.html', {'post': post, })
+    stats = get_author_stats(post.author)
+    return render_if_modified(
+        request,
+        page_etag(
+            request,
+            post.updated_at.isoformat(),
+            *author_etag_parts(post.author, stats)
+        ),
+        'post.html',
+        {'post': post, 'stats': stats, }
+    )
 
 
 @login_required
@@ -50,7 +255,7 @@ def new_post(request):
     if form.is_valid():
         post = form.save(commit=False)
         post.author = request.user
-        post.save()
+        serialized_write(post.save)
         return redirect('index')
     return render(request, 'new.html', {'form': form})
 
@@ -66,6 +271,28 @@ def post_edit(request, username, post_id):
     )
     form = PostForm(request.POST or None, instance=post)
     if form.is_valid():
-        form.save()
+        serialized_write(form.save)
         return redirect('post_view', username=username, post_id=post_id)
     return render(request, 'new.html', {'form': form})
+
+
+@login_required
+def follow_index(request):
+    page = follow_page(request.user, cursor=request.GET.get('cursor'))
+    return render(request, 'follow.html', {'page': page, })
+
+
+@login_required
+@require_POST
+def profile_follow(request, username):
+    author = get_object_or_404(User, username=username)
+    follow(request.user, author)
+    return redirect('profile', username=username)
+
+
+@login_required
+@require_POST
+def profile_unfollow(request, username):
+    author = get_object_or_404(User, username=username)
+    unfollow(request.user, author)
+    return redirect('profile', username=username)
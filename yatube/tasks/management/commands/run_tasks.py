@@ -0,0 +1,38 @@
+import logging
+
+from django.core.management.base import BaseCommand
+
+from tasks.queue import run_worker
+
+
+class Command(BaseCommand):
+    help = 'Выполнять фоновые задачи из очереди в базе'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Выполнить всё, что готово, и выйти.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            help='Задач за одну выборку (по умолчанию TASKS_BATCH_SIZE).',
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=1.0,
+            help='Пауза в секундах, когда очередь пуста.',
+        )
+
+    def handle(self, *args, **options):
+        if options['verbosity'] > 1:
+            logging.getLogger('tasks').addHandler(
+                logging.StreamHandler(self.stderr)
+            )
+        run_worker(
+            sleep=options['sleep'],
+            once=options['once'],
+            batch_size=options['batch_size'],
+        )
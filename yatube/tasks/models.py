@@ -0,0 +1,37 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Task(models.Model):
+    """Задача очереди в базе; выполненные задачи удаляются."""
+    PENDING = 'pending'
+    RUNNING = 'running'
+    FAILED = 'failed'
+    STATUSES = (
+        (PENDING, 'ожидает'),
+        (RUNNING, 'выполняется'),
+        (FAILED, 'не выполнена'),
+    )
+
+    name = models.CharField(max_length=100)
+    payload = models.TextField()
+    # пока задача с ключом в очереди, такие же не добавляются
+    key = models.CharField(max_length=200, unique=True, null=True)
+    status = models.CharField(max_length=10, choices=STATUSES,
+                              default=PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    run_at = models.DateTimeField(default=timezone.now)
+    locked_until = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['status', 'run_at'],
+                name='task_status_run_at_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.name} #{self.pk}'
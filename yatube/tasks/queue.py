@@ -0,0 +1,315 @@
+"""Фоновые задачи: побочные эффекты записи выносятся из запроса.
+
+    @task('posts.fan_out', batch=True)
+    def fan_out(payloads):
+        ...
+
+    enqueue(fan_out, {'post_id': post.pk}, key=f'fan-out:{post.pk}')
+
+Обработчик получает payload (JSON-совместимый словарь), а с batch=True —
+список payload'ов всех накопившихся задач этого типа. Задача с ключом
+не ставится, пока такая же ждёт или выполняется. Упавшая задача
+повторяется с экспоненциальной задержкой до max_attempts раз, поэтому
+обработчики должны быть идемпотентными.
+
+Бэкенд выбирается TASKS_BACKEND:
+
+* database — строка Task в текущей транзакции: задача появится, только
+  если запись закоммичена; выполняет её manage.py run_tasks;
+* thread — пул потоков процесса после коммита транзакции;
+* eager — сразу в вызывающем потоке. Для TestCase: потоки пула со своими
+  соединениями не видят незакоммиченных данных теста.
+"""
+import json
+import logging
+import queue
+import threading
+import time
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Task
+
+logger = logging.getLogger('tasks')
+
+registry = {}
+
+
+def task(name, batch=False, max_attempts=None):
+    """Зарегистрировать обработчик задач под именем name."""
+    def register(func):
+        func.task_name = name
+        func.batch = batch
+        func.max_attempts = max_attempts
+        registry[name] = func
+        return func
+    return register
+
+
+def handler_for(name_or_func):
+    name = getattr(name_or_func, 'task_name', name_or_func)
+    try:
+        return registry[name]
+    except KeyError:
+        raise LookupError(f'Неизвестная задача {name!r}')
+
+
+def max_attempts(handler):
+    return handler.max_attempts or settings.TASKS_MAX_ATTEMPTS
+
+
+def retry_delay(attempts):
+    return settings.TASKS_RETRY_DELAY * 2 ** (attempts - 1)
+
+
+def execute(handler, payloads):
+    """Вызвать обработчик для payload'ов одного типа."""
+    if handler.batch:
+        handler(payloads)
+    else:
+        for payload in payloads:
+            handler(payload)
+
+
+def group_by_name(jobs, name):
+    groups = {}
+    for job in jobs:
+        groups.setdefault(name(job), []).append(job)
+    return groups.items()
+
+
+class EagerBackend:
+    def enqueue(self, handler, payload, key, delay):
+        for attempt in range(1, max_attempts(handler) + 1):
+            try:
+                return execute(handler, [payload])
+            except Exception:
+                if attempt == max_attempts(handler):
+                    raise
+
+
+class Job:
+    __slots__ = ('handler', 'payload', 'key', 'attempts')
+
+    def __init__(self, handler, payload, key):
+        self.handler = handler
+        self.payload = payload
+        self.key = key
+        self.attempts = 0
+
+
+class ThreadBackend:
+    """Очередь в памяти и TASKS_THREADS потоков.
+
+    Поток берёт задачу и всё, что успело накопиться (до
+    TASKS_BATCH_SIZE), и выполняет задачи одного типа одним вызовом.
+    """
+
+    def __init__(self):
+        self.queue = queue.Queue()
+        self.keys = set()
+        self.lock = threading.Lock()
+        self.threads = []
+
+    def start(self):
+        with self.lock:
+            if self.threads:
+                return
+            self.threads = [
+                threading.Thread(
+                    target=self.work, name=f'tasks-{i}', daemon=True
+                )
+                for i in range(settings.TASKS_THREADS)
+            ]
+        for thread in self.threads:
+            thread.start()
+
+    def enqueue(self, handler, payload, key, delay):
+        job = Job(handler, payload, key)
+        transaction.on_commit(lambda: self.submit(job, delay))
+
+    def submit(self, job, delay):
+        # ключ занимается при коммите: откат не оставит его занятым
+        if job.key is not None:
+            with self.lock:
+                if job.key in self.keys:
+                    return
+                self.keys.add(job.key)
+        self.put(job, delay)
+
+    def put(self, job, delay=0):
+        self.start()
+        if delay:
+            timer = threading.Timer(delay, self.queue.put, (job,))
+            timer.daemon = True
+            timer.start()
+        else:
+            self.queue.put(job)
+
+    def take(self):
+        jobs = [self.queue.get()]
+        while len(jobs) < settings.TASKS_BATCH_SIZE:
+            try:
+                jobs.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return jobs
+
+    def work(self):
+        from django.db import connections
+
+        while True:
+            jobs = self.take()
+            try:
+                for handler, group in group_by_name(
+                        jobs, lambda job: job.handler):
+                    self.run(handler, group)
+            finally:
+                connections.close_all()
+                for _ in jobs:
+                    self.queue.task_done()
+
+    def run(self, handler, jobs):
+        try:
+            execute(handler, [job.payload for job in jobs])
+        except Exception:
+            logger.exception('Задача %s упала', handler.task_name)
+            for job in jobs:
+                job.attempts += 1
+                if job.attempts < max_attempts(handler):
+                    self.put(job, retry_delay(job.attempts))
+                else:
+                    self.release(job)
+            return
+        for job in jobs:
+            self.release(job)
+
+    def release(self, job):
+        if job.key is not None:
+            with self.lock:
+                self.keys.discard(job.key)
+
+    def join(self):
+        """Дождаться пустой очереди (отложенные повторы не ждёт)."""
+        self.queue.join()
+
+
+class DatabaseBackend:
+    def enqueue(self, handler, payload, key, delay):
+        Task.objects.bulk_create([Task(
+            name=handler.task_name,
+            payload=json.dumps(payload, cls=DjangoJSONEncoder),
+            key=key,
+            run_at=timezone.now() + timedelta(seconds=delay),
+        )], ignore_conflicts=True)
+
+
+BACKENDS = {
+    'database': DatabaseBackend,
+    'thread': ThreadBackend,
+    'eager': EagerBackend,
+}
+_backends = {}
+_backends_lock = threading.Lock()
+
+
+def get_backend(name=None):
+    name = name or settings.TASKS_BACKEND
+    with _backends_lock:
+        if name not in _backends:
+            _backends[name] = BACKENDS[name]()
+        return _backends[name]
+
+
+def enqueue(name_or_func, payload, key=None, delay=0):
+    """Поставить задачу; key делает постановку идемпотентной."""
+    handler = handler_for(name_or_func)
+    get_backend().enqueue(handler, payload, key, delay)
+
+
+def claim(batch_size, lock_seconds):
+    """Забрать до batch_size готовых задач, включая зависшие running.
+
+    UPDATE с проверкой статуса не даёт двум воркерам взять одну задачу.
+    """
+    now = timezone.now()
+    ready = Q(status=Task.PENDING, run_at__lte=now) | Q(
+        status=Task.RUNNING, locked_until__lt=now
+    )
+    ids = list(
+        Task.objects.filter(ready).order_by('run_at', 'pk').values_list(
+            'pk', flat=True
+        )[:batch_size]
+    )
+    locked_until = now + timedelta(seconds=lock_seconds)
+    Task.objects.filter(ready, pk__in=ids).update(
+        status=Task.RUNNING, locked_until=locked_until
+    )
+    return list(Task.objects.filter(
+        pk__in=ids, status=Task.RUNNING, locked_until=locked_until
+    ))
+
+
+def finish(tasks, error=None):
+    if error is None:
+        Task.objects.filter(pk__in=[task.pk for task in tasks]).delete()
+        return
+    handler = registry.get(tasks[0].name)
+    limit = max_attempts(handler) if handler else 1
+    now = timezone.now()
+    for task in tasks:
+        task.attempts += 1
+        task.last_error = error
+        task.locked_until = None
+        if task.attempts < limit:
+            task.status = Task.PENDING
+            task.run_at = now + timedelta(
+                seconds=retry_delay(task.attempts)
+            )
+        else:
+            # ключ освобождается: такую задачу можно поставить заново
+            task.status = Task.FAILED
+            task.key = None
+    Task.objects.bulk_update(
+        tasks,
+        ['attempts', 'last_error', 'locked_until', 'status', 'run_at', 'key']
+    )
+
+
+def run_pending(batch_size=None, lock_seconds=None):
+    """Выполнить одну пачку задач из базы; вернуть (выполнено, упало)."""
+    tasks = claim(
+        batch_size or settings.TASKS_BATCH_SIZE,
+        lock_seconds or settings.TASKS_LOCK_SECONDS,
+    )
+    done = failed = 0
+    for name, group in group_by_name(tasks, lambda task: task.name):
+        try:
+            execute(
+                handler_for(name),
+                [json.loads(task.payload) for task in group]
+            )
+        except Exception:
+            logger.exception('Задача %s упала', name)
+            finish(group, traceback.format_exc())
+            failed += len(group)
+        else:
+            finish(group)
+            done += len(group)
+    return done, failed
+
+
+def run_worker(sleep=1.0, once=False, batch_size=None, stop=None):
+    """Цикл воркера: пачка за пачкой, пауза sleep при пустой очереди."""
+    while stop is None or not stop.is_set():
+        done, failed = run_pending(batch_size)
+        if once and not done + failed:
+            return
+        if not done + failed:
+            time.sleep(sleep)
@@ -0,0 +1,145 @@
+import threading
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import transaction
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from ..models import Task
+from ..queue import ThreadBackend, enqueue, run_pending, task
+
+calls = []
+
+
+@task('tests.record')
+def record(payload):
+    calls.append(payload)
+
+
+@task('tests.batch', batch=True)
+def record_batch(payloads):
+    calls.append(sorted(payload['n'] for payload in payloads))
+
+
+@task('tests.flaky', max_attempts=3)
+def flaky(payload):
+    calls.append(payload)
+    if len(calls) < payload['fail']:
+        raise RuntimeError('сбой')
+
+
+class EagerBackendTests(SimpleTestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_runs_immediately(self):
+        enqueue(record, {'n': 1})
+        enqueue('tests.record', {'n': 2})
+        self.assertEqual(calls, [{'n': 1}, {'n': 2}])
+
+    def test_retries_then_raises(self):
+        enqueue(flaky, {'fail': 3})
+        self.assertEqual(len(calls), 3)
+        calls.clear()
+        with self.assertRaises(RuntimeError):
+            enqueue(flaky, {'fail': 10})
+
+    def test_unknown_task(self):
+        with self.assertRaises(LookupError):
+            enqueue('tests.missing', {})
+
+
+@override_settings(TASKS_BACKEND='database')
+class DatabaseBackendTests(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_enqueue_is_deferred_and_idempotent(self):
+        enqueue(record, {'n': 1}, key='record:1')
+        enqueue(record, {'n': 1}, key='record:1')
+        self.assertEqual(calls, [])
+        self.assertEqual(Task.objects.count(), 1)
+        self.assertEqual(run_pending(), (1, 0))
+        self.assertEqual(calls, [{'n': 1}])
+        self.assertFalse(Task.objects.exists())
+        enqueue(record, {'n': 1}, key='record:1')
+        self.assertEqual(Task.objects.count(), 1)
+
+    def test_rolled_back_write_drops_task(self):
+        with self.assertRaises(ValueError):
+            with transaction.atomic():
+                enqueue(record, {'n': 1})
+                raise ValueError
+        self.assertFalse(Task.objects.exists())
+
+    def test_same_type_jobs_are_batched(self):
+        for n in range(3):
+            enqueue(record_batch, {'n': n})
+        enqueue(record, {'n': 9})
+        self.assertEqual(run_pending(), (4, 0))
+        self.assertEqual(calls, [[0, 1, 2], {'n': 9}])
+
+    def test_delay(self):
+        enqueue(record, {'n': 1}, delay=60)
+        self.assertEqual(run_pending(), (0, 0))
+
+    def test_retry_with_backoff_then_fail(self):
+        enqueue(flaky, {'fail': 10}, key='flaky')
+        with self.assertLogs('tasks', 'ERROR'):
+            self.assertEqual(run_pending(), (0, 1))
+        failed = Task.objects.get()
+        self.assertEqual(
+            (failed.status, failed.attempts), (Task.PENDING, 1)
+        )
+        self.assertGreater(failed.run_at, timezone.now())
+        self.assertIn('RuntimeError', failed.last_error)
+        for _ in range(2):
+            Task.objects.update(run_at=timezone.now())
+            with self.assertLogs('tasks', 'ERROR'):
+                run_pending()
+        failed.refresh_from_db()
+        self.assertEqual(failed.status, Task.FAILED)
+        self.assertIsNone(failed.key)
+
+    def test_stale_running_task_is_reclaimed(self):
+        enqueue(record, {'n': 1})
+        Task.objects.update(
+            status=Task.RUNNING,
+            locked_until=timezone.now() - timedelta(seconds=1)
+        )
+        self.assertEqual(run_pending(), (1, 0))
+
+    def test_worker_command(self):
+        enqueue(record, {'n': 1})
+        enqueue(record, {'n': 2})
+        call_command('run_tasks', '--once', '--batch-size', '1',
+                     stderr=StringIO())
+        self.assertEqual(len(calls), 2)
+
+
+@override_settings(TASKS_THREADS=1, TASKS_BATCH_SIZE=10)
+class ThreadBackendTests(SimpleTestCase):
+    def setUp(self):
+        calls.clear()
+        self.backend = ThreadBackend()
+
+    def test_jobs_queued_meanwhile_run_as_one_batch(self):
+        started = threading.Event()
+        release = threading.Event()
+
+        @task('tests.blocking')
+        def blocking(payload):
+            started.set()
+            release.wait(5)
+
+        self.backend.enqueue(blocking, {}, None, 0)
+        started.wait(5)
+        for n in range(3):
+            self.backend.enqueue(record_batch, {'n': n}, f'batch:{n}', 0)
+        self.backend.enqueue(record_batch, {'n': 0}, 'batch:0', 0)
+        release.set()
+        self.backend.join()
+        self.assertEqual(calls, [[0, 1, 2]])
+        self.assertEqual(self.backend.keys, set())
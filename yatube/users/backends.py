@@ -0,0 +1,37 @@
+"""Загрузка пользователя сессии из кэша вместо SELECT на каждый запрос.
+
+AuthenticationMiddleware зовёт get_user() один раз за запрос и
+запоминает результат в request._cached_user; этот бэкенд убирает и этот
+SELECT, пока пользователь лежит в кэше (AUTH_USER_CACHE_TIMEOUT секунд).
+Запись пользователя сбрасывает кэш (users.signals), так что смена
+пароля или is_active видна со следующего запроса. QuerySet.update() на
+User сигналов не шлёт — так работают и массовые действия админки: после
+него пользователь в кэше остаётся прежним до AUTH_USER_CACHE_TIMEOUT,
+если не вызвать forget_user() для каждого id. Бэкенд нужен только с
+общим кэшем (users.E002); его включает settings_production.
+"""
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+USER_CACHE_KEY = 'users:user:{}'
+
+
+def user_cache_key(user_id):
+    return USER_CACHE_KEY.format(user_id)
+
+
+def forget_user(user_id):
+    cache.delete(user_cache_key(user_id))
+
+
+class CachedModelBackend(ModelBackend):
+    def get_user(self, user_id):
+        key = user_cache_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(user_id)
+            if user is None:
+                return None
+            cache.set(key, user, settings.AUTH_USER_CACHE_TIMEOUT)
+        return user if self.user_can_authenticate(user) else None
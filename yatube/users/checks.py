@@ -0,0 +1,39 @@
+"""Проверки настроек для manage.py check --deploy."""
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+from posts.checks import PROCESS_LOCAL_CACHES
+
+# хранилища сессий, которые держат сессию в кэше
+CACHED_SESSION_ENGINES = {
+    'django.contrib.sessions.backends.cache',
+    'django.contrib.sessions.backends.cached_db',
+}
+
+
+@register(Tags.caches, deploy=True)
+def check_cached_auth(app_configs, **kwargs):
+    """Сессии и пользователь из кэша требуют кэша, общего для процессов.
+
+    Иначе выход, смена пароля или блокировка в одном воркере не
+    сбрасывают копии в других, и там сессия живёт до истечения записи.
+    """
+    if settings.CACHES['default']['BACKEND'] not in PROCESS_LOCAL_CACHES:
+        return []
+    errors = []
+    if settings.SESSION_ENGINE in CACHED_SESSION_ENGINES:
+        errors.append(Error(
+            f'{settings.SESSION_ENGINE} с кэшем одного процесса: выход в '
+            f'одном воркере не завершит сессию в других.',
+            hint='Общий кэш или SESSION_ENGINE db / signed_cookies.',
+            id='users.E001',
+        ))
+    if 'users.backends.CachedModelBackend' in settings.AUTHENTICATION_BACKENDS:
+        errors.append(Error(
+            'CachedModelBackend с кэшем одного процесса: смена пароля или '
+            'блокировка видна другим воркерам только через '
+            'AUTH_USER_CACHE_TIMEOUT.',
+            hint='Общий кэш или django.contrib.auth.backends.ModelBackend.',
+            id='users.E002',
+        ))
+    return errors
@@ -1,10 +1,26 @@
+from django import forms
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
 
+# Первые сегменты путей сайта: профиль /<username>/ с таким именем
+# перекрыл бы их (или они — страницы пользователя).
+RESERVED_USERNAMES = frozenset({
+    'about', 'admin', 'api', 'auth', 'feed', 'follow', 'group', 'new',
+    'perf', 'search', 'static',
+})
+
 
 class CreationForm(UserCreationForm):
     class Meta(UserCreationForm.Meta):
         model = User
         fields = ('first_name', 'last_name', 'username', 'email')
+
+    def clean_username(self):
+        username = self.cleaned_data['username']
+        if username.lower() in RESERVED_USERNAMES:
+            raise forms.ValidationError(
+                'Это имя занято адресом сайта, выберите другое.'
+            )
+        return username
@@ -0,0 +1,112 @@
+"""Хешеры паролей со стоимостью из настроек.
+
+Стоимость задаётся в settings (PASSWORD_SCRYPT_*, PASSWORD_ARGON2_*), а
+не в коде, чтобы её можно было поднять или опустить без релиза. Хеш со
+старыми параметрами или от другого хешера пересчитывается при следующем
+входе: check_password() сохраняет новый хеш, если хешер не первый в
+PASSWORD_HASHERS или его must_update() вернул True.
+"""
+import base64
+import hashlib
+
+from django.conf import settings
+from django.contrib.auth.hashers import (
+    Argon2PasswordHasher, BasePasswordHasher, mask_hash
+)
+from django.utils.crypto import constant_time_compare, get_random_string
+from django.utils.translation import gettext_noop as _
+
+
+class ScryptPasswordHasher(BasePasswordHasher):
+    """scrypt из hashlib: scrypt$<n>$<r>$<p>$<соль>$<хеш>.
+
+    Память на хеш — 128 * n * r байт (16 МБ при n=2**14, r=8): она, а не
+    CPU, и ограничивает перебор на GPU.
+    """
+    algorithm = 'scrypt'
+    dklen = 64
+
+    @property
+    def work_factor(self):
+        return settings.PASSWORD_SCRYPT_N
+
+    @property
+    def block_size(self):
+        return settings.PASSWORD_SCRYPT_R
+
+    @property
+    def parallelism(self):
+        return settings.PASSWORD_SCRYPT_P
+
+    def salt(self):
+        return get_random_string(16)
+
+    def derive(self, password, salt, n, r, p):
+        return base64.b64encode(hashlib.scrypt(
+            password.encode(), salt=salt.encode(), n=n, r=r, p=p,
+            maxmem=256 * n * r * p, dklen=self.dklen,
+        )).decode('ascii')
+
+    def encode(self, password, salt, n=None, r=None, p=None):
+        assert password is not None
+        assert salt and '$' not in salt
+        n = n or self.work_factor
+        r = r or self.block_size
+        p = p or self.parallelism
+        hash = self.derive(password, salt, n, r, p)
+        return f'{self.algorithm}${n}${r}${p}${salt}${hash}'
+
+    def decode(self, encoded):
+        algorithm, n, r, p, salt, hash = encoded.split('$', 5)
+        assert algorithm == self.algorithm
+        return {'n': int(n), 'r': int(r), 'p': int(p),
+                'salt': salt, 'hash': hash}
+
+    def verify(self, password, encoded):
+        decoded = self.decode(encoded)
+        encoded_2 = self.encode(
+            password, decoded['salt'],
+            decoded['n'], decoded['r'], decoded['p']
+        )
+        return constant_time_compare(encoded, encoded_2)
+
+    def safe_summary(self, encoded):
+        decoded = self.decode(encoded)
+        return {
+            _('algorithm'): self.algorithm,
+            _('work factor'): decoded['n'],
+            _('block size'): decoded['r'],
+            _('parallelism'): decoded['p'],
+            _('salt'): mask_hash(decoded['salt']),
+            _('hash'): mask_hash(decoded['hash']),
+        }
+
+    def must_update(self, encoded):
+        decoded = self.decode(encoded)
+        return (decoded['n'], decoded['r'], decoded['p']) != (
+            self.work_factor, self.block_size, self.parallelism
+        )
+
+    def harden_runtime(self, password, encoded):
+        # стоимость записана в хеше, и verify() платит её полностью
+        pass
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """Argon2 из Django (нужен argon2-cffi) со стоимостью из настроек.
+
+    must_update() родителя сравнивает параметры хеша с этими
+    атрибутами, так что смена настроек перехеширует пароль при входе.
+    """
+
+    @property
+    def time_cost(self):
+        return settings.PASSWORD_ARGON2_TIME_COST
+
+    @property
+    def memory_cost(self):
+        return settings.PASSWORD_ARGON2_MEMORY_COST
+
+    @property
+    def parallelism(self):
+        return settings.PASSWORD_ARGON2_PARALLELISM
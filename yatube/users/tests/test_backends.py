@@ -0,0 +1,95 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from ..checks import check_cached_auth
+
+User = get_user_model()
+
+
+@override_settings(
+    AUTHENTICATION_BACKENDS=['users.backends.CachedModelBackend']
+)
+class CachedUserTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        # в каждом тесте свой объект: тесты меняют пароль и is_active
+        self.user = User.objects.create_user(username='test_user')
+        self.client = Client()
+        self.client.force_login(self.user)
+
+    def tables(self, url=None):
+        """Таблицы из FROM всех запросов к url (по умолчанию — new_post)."""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url or reverse('new_post'))
+        return response, [
+            query['sql'].split(' FROM ')[1].split()[0].strip('"')
+            for query in queries if ' FROM ' in query['sql']
+        ]
+
+    def test_user_is_loaded_from_cache(self):
+        _, tables = self.tables()
+        self.assertIn('auth_user', tables)
+        response, tables = self.tables()
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('auth_user', tables)
+        self.assertEqual(response.context['user'], self.user)
+
+    def test_saving_user_invalidates_cache(self):
+        self.tables()
+        self.user.is_active = False
+        self.user.save()
+        response, _ = self.tables()
+        self.assertEqual(response.status_code, 302)
+
+    def test_password_change_logs_out(self):
+        self.tables()
+        self.user.set_password('новый-пароль-123')
+        self.user.save()
+        response, _ = self.tables()
+        self.assertEqual(response.status_code, 302)
+
+    def test_session_engines_skip_session_table(self):
+        for engine in ('cached_db', 'signed_cookies'):
+            with self.subTest(engine=engine), override_settings(
+                SESSION_ENGINE=f'django.contrib.sessions.backends.{engine}'
+            ):
+                client = self.client = Client()
+                client.force_login(self.user)
+                self.tables()
+                response, tables = self.tables()
+                self.assertEqual(response.status_code, 200)
+                self.assertNotIn('django_session', tables)
+                self.assertNotIn('auth_user', tables)
+
+
+@override_settings(
+    AUTHENTICATION_BACKENDS=['users.backends.CachedModelBackend']
+)
+class CachedAuthCheckTests(SimpleTestCase):
+    def errors(self, backend, engine):
+        with override_settings(
+            CACHES={'default': {
+                'BACKEND': f'django.core.cache.backends.{backend}'
+            }},
+            SESSION_ENGINE=f'django.contrib.sessions.backends.{engine}',
+        ):
+            return [error.id for error in check_cached_auth(None)]
+
+    def test_process_local_cache(self):
+        self.assertEqual(
+            self.errors('locmem.LocMemCache', 'cached_db'),
+            ['users.E001', 'users.E002']
+        )
+        with self.settings(AUTHENTICATION_BACKENDS=[
+            'django.contrib.auth.backends.ModelBackend'
+        ]):
+            self.assertEqual(self.errors('locmem.LocMemCache', 'db'), [])
+
+    def test_shared_cache(self):
+        self.assertEqual(
+            self.errors('memcached.MemcachedCache', 'cached_db'), []
+        )
@@ -0,0 +1,38 @@
+from django.test import TestCase
+from django.urls import URLResolver, get_resolver
+
+from ..forms import RESERVED_USERNAMES, CreationForm
+
+
+def first_segments(patterns, prefix=''):
+    """Первые сегменты путей сайта, заданные строкой, а не параметром."""
+    for pattern in patterns:
+        route = prefix + str(pattern.pattern).lstrip('^')
+        if isinstance(pattern, URLResolver) and not route:
+            yield from first_segments(pattern.url_patterns)
+            continue
+        segment = route.split('/', 1)[0]
+        if segment and segment.isidentifier():
+            yield segment
+
+
+class CreationFormTests(TestCase):
+    def form(self, username):
+        return CreationForm(data={
+            'username': username,
+            'password1': 'Ne-prostoi-parol-42',
+            'password2': 'Ne-prostoi-parol-42',
+        })
+
+    def test_reserved_usernames_rejected(self):
+        for username in ('feed', 'Search', 'api'):
+            with self.subTest(username=username):
+                form = self.form(username)
+                self.assertFalse(form.is_valid())
+                self.assertIn('username', form.errors)
+        self.assertTrue(self.form('feeder').is_valid())
+
+    def test_every_site_prefix_is_reserved(self):
+        segments = set(first_segments(get_resolver().url_patterns))
+        self.assertIn('feed', segments)
+        self.assertEqual(segments - RESERVED_USERNAMES, set())
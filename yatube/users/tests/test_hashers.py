@@ -0,0 +1,49 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import (
+    check_password, identify_hasher, make_password
+)
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+User = get_user_model()
+
+SCRYPT = 'users.hashers.ScryptPasswordHasher'
+PBKDF2 = 'django.contrib.auth.hashers.PBKDF2PasswordHasher'
+# дешёвые параметры: тестам важен формат, а не стойкость
+CHEAP_SCRYPT = {'PASSWORD_SCRYPT_N': 2 ** 4, 'PASSWORD_SCRYPT_R': 1}
+
+
+@override_settings(PASSWORD_HASHERS=[SCRYPT, PBKDF2], **CHEAP_SCRYPT)
+class ScryptHasherTests(TestCase):
+    def test_roundtrip(self):
+        encoded = make_password('пароль-123')
+        self.assertTrue(encoded.startswith('scrypt$16$1$1$'))
+        self.assertTrue(check_password('пароль-123', encoded))
+        self.assertFalse(check_password('пароль-124', encoded))
+
+    def test_cost_change_requires_update(self):
+        encoded = make_password('пароль-123')
+        hasher = identify_hasher(encoded)
+        self.assertFalse(hasher.must_update(encoded))
+        with self.settings(PASSWORD_SCRYPT_N=2 ** 5):
+            self.assertTrue(hasher.must_update(encoded))
+            # старый хеш по-прежнему проверяется
+            self.assertTrue(check_password('пароль-123', encoded))
+
+    def test_login_upgrades_hash(self):
+        user = User.objects.create_user(username='test_user')
+        with self.settings(PASSWORD_HASHERS=[PBKDF2, SCRYPT]):
+            user.set_password('пароль-123')
+            user.save()
+        self.assertTrue(user.password.startswith('pbkdf2_sha256$'))
+        response = Client().post(
+            reverse('login'),
+            {'username': 'test_user', 'password': 'пароль-123'}
+        )
+        self.assertEqual(response.status_code, 302)
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith('scrypt$16$'))
+        with self.settings(PASSWORD_SCRYPT_N=2 ** 5):
+            self.assertTrue(user.check_password('пароль-123'))
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith('scrypt$32$'))
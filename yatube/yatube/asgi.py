@@ -0,0 +1,146 @@
+"""ASGI-точка входа yatube.
+
+Django 2.2 не поддерживает ASGI и async-представления, поэтому
+приложение WSGI обслуживается из ограниченного пула потоков. Чтение
+запроса и отправка ответа медленным клиентам идут в цикле событий,
+а поток занят только пока работает представление.
+
+    uvicorn yatube.asgi:application
+"""
+import asyncio
+import io
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.wsgi import get_wsgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yatube.settings')
+
+
+class WsgiToAsgi:
+    def __init__(self, wsgi_application, max_workers):
+        self.wsgi_application = wsgi_application
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix='asgi'
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self.lifespan(receive, send)
+        elif scope['type'] == 'http':
+            await self.http(scope, receive, send)
+        else:
+            raise ValueError(f'Unsupported ASGI scope: {scope["type"]}')
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def read_body(self, receive):
+        chunks = []
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                return None
+            chunks.append(message.get('body', b''))
+            if not message.get('more_body'):
+                return b''.join(chunks)
+
+    async def http(self, scope, receive, send):
+        body = await self.read_body(receive)
+        if body is None:
+            return
+        loop = asyncio.get_running_loop()
+        response = {}
+
+        def start_response(status, headers, exc_info=None):
+            response['status'] = int(status.split(' ', 1)[0])
+            response['headers'] = [
+                (name.lower().encode('latin1'), value.encode('latin1'))
+                for name, value in headers
+            ]
+
+        def reply(message):
+            asyncio.run_coroutine_threadsafe(send(message), loop).result()
+
+        def run():
+            # запрос целиком обрабатывается в одном потоке: соединения
+            # с БД и курсоры потоковых ответов привязаны к потоку
+            chunks = self.wsgi_application(
+                self.environ(scope, body), start_response
+            )
+            try:
+                if not getattr(chunks, 'streaming', False):
+                    # обычный ответ собирается сразу, и поток
+                    # освобождается до отправки клиенту
+                    return b''.join(chunks)
+                reply({
+                    'type': 'http.response.start',
+                    'status': response['status'],
+                    'headers': response['headers'],
+                })
+                for chunk in chunks:
+                    if chunk:
+                        reply({
+                            'type': 'http.response.body',
+                            'body': chunk,
+                            'more_body': True,
+                        })
+                reply({'type': 'http.response.body'})
+                return None
+            finally:
+                close = getattr(chunks, 'close', None)
+                if close:
+                    close()
+
+        content = await loop.run_in_executor(self.executor, run)
+        if content is not None:
+            await send({
+                'type': 'http.response.start',
+                'status': response['status'],
+                'headers': response['headers'],
+            })
+            await send({'type': 'http.response.body', 'body': content})
+
+    def environ(self, scope, body):
+        server = scope.get('server') or ('localhost', 80)
+        client = scope.get('client') or ('', 0)
+        environ = {
+            'REQUEST_METHOD': scope['method'],
+            'SCRIPT_NAME': scope.get('root_path', ''),
+            'PATH_INFO': scope['path'].encode('utf-8').decode('latin1'),
+            'QUERY_STRING': scope['query_string'].decode('latin1'),
+            'SERVER_NAME': server[0],
+            'SERVER_PORT': str(server[1]),
+            'REMOTE_ADDR': client[0],
+            'SERVER_PROTOCOL': f'HTTP/{scope["http_version"]}',
+            'wsgi.version': (1, 0),
+            'wsgi.url_scheme': scope.get('scheme', 'http'),
+            'wsgi.input': io.BytesIO(body),
+            'wsgi.errors': sys.stderr,
+            'wsgi.multithread': True,
+            'wsgi.multiprocess': True,
+            'wsgi.run_once': False,
+        }
+        for name, value in scope['headers']:
+            name = name.decode('latin1').upper().replace('-', '_')
+            value = value.decode('latin1')
+            if name not in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+                name = f'HTTP_{name}'
+            if name in environ:
+                # куки из нескольких заголовков Cookie склеиваются через
+                # «; » (RFC 6265), остальные повторы — через запятую
+                separator = '; ' if name == 'HTTP_COOKIE' else ','
+                value = f'{environ[name]}{separator}{value}'
+            environ[name] = value
+        return environ
+
+
+application = WsgiToAsgi(get_wsgi_application(), settings.ASGI_THREADS)
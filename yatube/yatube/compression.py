@@ -0,0 +1,171 @@
+"""Сжатие ответов: brotli или gzip по Accept-Encoding.
+
+В отличие от django.middleware.gzip.GZipMiddleware умеет brotli (если
+он установлен) и сжимает потоковые ответы по частям со сбросом буфера
+после каждой части, так что клиент получает начало ленты сразу. Сжатые
+и пропущенные ответы учитываются в perf.metrics.registry: по степени
+сжатия и CPU на килобайт подбирается COMPRESSION_MIN_SIZE и уровни.
+
+Страницы с CSRF-токеном (шаблон вызвал {% csrf_token %}) не сжимаются:
+секрет рядом с отражённым вводом в сжатом ответе — это BREACH, и по
+длине ответов токен подбирается по символу.
+"""
+import time
+import zlib
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+from perf.metrics import registry
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_TYPES = (
+    'text/', 'application/json', 'application/javascript',
+    'application/xml', 'application/rss+xml', 'application/atom+xml',
+    'application/feed+json', 'image/svg+xml',
+)
+
+
+class GzipStream:
+    def __init__(self):
+        self.compressor = zlib.compressobj(
+            settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS
+        )
+
+    def compress(self, data, flush):
+        chunk = self.compressor.compress(data)
+        if flush:
+            chunk += self.compressor.flush(zlib.Z_SYNC_FLUSH)
+        return chunk
+
+    def finish(self):
+        return self.compressor.flush()
+
+
+class BrotliStream:
+    def __init__(self):
+        self.compressor = brotli.Compressor(
+            quality=settings.COMPRESSION_BROTLI_QUALITY
+        )
+
+    def compress(self, data, flush):
+        chunk = self.compressor.process(data)
+        if flush:
+            chunk += self.compressor.flush()
+        return chunk
+
+    def finish(self):
+        return self.compressor.finish()
+
+
+def available_encodings():
+    if brotli is not None:
+        yield 'br', BrotliStream
+    yield 'gzip', GzipStream
+
+
+def accepted_encodings(header):
+    """Кодировки из Accept-Encoding с ненулевым q."""
+    accepted = set()
+    for token in header.split(','):
+        name, _, params = token.strip().partition(';')
+        quality = params.strip()
+        if quality.startswith('q='):
+            try:
+                if float(quality[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(name.strip().lower())
+    return accepted
+
+
+def negotiate(request):
+    accepted = accepted_encodings(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+    for encoding, stream in available_encodings():
+        if encoding in accepted or '*' in accepted:
+            return encoding, stream
+    return None, None
+
+
+def skip_reason(request, response):
+    if response.has_header('Content-Encoding'):
+        return 'encoded'
+    if request.META.get('CSRF_COOKIE_USED'):
+        return 'csrf'
+    content_type = response.get('Content-Type', '').lower()
+    if not content_type.startswith(COMPRESSIBLE_TYPES):
+        return 'type'
+    if (not response.streaming
+            and len(response.content) < settings.COMPRESSION_MIN_SIZE):
+        return 'small'
+    return None
+
+
+class CompressionMiddleware:
+    """Ставится сразу после PerfMiddleware, до всего, что читает тело."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding, stream = negotiate(request)
+        reason = (
+            skip_reason(request, response) if encoding else 'not_accepted'
+        )
+        if reason:
+            registry.record_compression(None, skipped=reason)
+            return response
+        if response.streaming:
+            response.streaming_content = self.compress_stream(
+                response.streaming_content, encoding, stream()
+            )
+            del response['Content-Length']
+        else:
+            content = response.content
+            started = time.thread_time()
+            compressor = stream()
+            compressed = (
+                compressor.compress(content, flush=False) + compressor.finish()
+            )
+            registry.record_compression(
+                encoding, len(content), len(compressed),
+                time.thread_time() - started
+            )
+            if len(compressed) >= len(content):
+                return response
+            response.content = compressed
+            response['Content-Length'] = str(len(compressed))
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            # сжатое тело не совпадает побайтно с несжатым
+            response['ETag'] = 'W/' + etag
+        response['Content-Encoding'] = encoding
+        return response
+
+    @staticmethod
+    def compress_stream(chunks, encoding, compressor):
+        raw = compressed = 0
+        cpu = 0.0
+        try:
+            for chunk in chunks:
+                started = time.thread_time()
+                data = compressor.compress(chunk, flush=True)
+                cpu += time.thread_time() - started
+                raw += len(chunk)
+                compressed += len(data)
+                if data:
+                    yield data
+            started = time.thread_time()
+            data = compressor.finish()
+            cpu += time.thread_time() - started
+            compressed += len(data)
+            yield data
+        finally:
+            registry.record_compression(encoding, raw, compressed, cpu)
@@ -0,0 +1,96 @@
+"""Чтение лент с реплик, запись — в основную базу.
+
+Представления, помеченные use_replica, читают из DATABASE_REPLICAS — из
+одной реплики на весь запрос. После запроса, который писал в базу (или
+просто POST), клиент на DATABASE_REPLICA_PIN_SECONDS секунд получает
+куку и читает из основной базы, пока реплики догоняют его запись.
+read_primary() переводит на основную базу остаток запроса: так делают
+ленты, которые менялись недавно (posts.cache), чтобы не закэшировать
+старые строки реплики под новой версией.
+"""
+import random
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+PIN_COOKIE = 'db_primary'
+# сессии и пользователи запроса читаются из основной базы: отставшая
+# реплика не должна разлогинивать только что вошедшего пользователя
+REPLICA_APPS = ('posts',)
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+# реплика, из которой читает текущий запрос, или None
+replica_alias = ContextVar('replica_alias', default=None)
+# словарь текущего запроса; роутер отмечает в нём запись в базу
+request_writes = ContextVar('request_writes', default=None)
+
+
+def use_replica(view):
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if (request.method not in SAFE_METHODS
+                or PIN_COOKIE in request.COOKIES
+                or not settings.DATABASE_REPLICAS):
+            return view(request, *args, **kwargs)
+        token = replica_alias.set(random.choice(settings.DATABASE_REPLICAS))
+        try:
+            return view(request, *args, **kwargs)
+        finally:
+            replica_alias.reset(token)
+    return wrapper
+
+
+def read_primary():
+    """Дальше в этом запросе читать из основной базы."""
+    replica_alias.set(None)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        alias = replica_alias.get()
+        if alias is not None and model._meta.app_label in REPLICA_APPS:
+            return alias
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        writes = request_writes.get()
+        if writes is not None:
+            writes['primary'] = True
+        # объект, прочитанный с реплики, всё равно пишется в основную базу
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # все базы из DATABASES — копии основной: и реплики, и ещё не
+        # объявленные репликами (migrate новой реплики ставит права и
+        # типы контента, прочитанные из неё самой)
+        return (obj1._state.db in settings.DATABASES
+                and obj2._state.db in settings.DATABASES)
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # схема приезжает на реплики вместе с данными
+        return db not in settings.DATABASE_REPLICAS
+
+
+class PinPrimaryMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        writes = {}
+        token = request_writes.set(writes)
+        try:
+            response = self.get_response(request)
+        finally:
+            request_writes.reset(token)
+        if not settings.DATABASE_REPLICAS:
+            return response
+        if request.method not in SAFE_METHODS or writes:
+            response.set_cookie(
+                PIN_COOKIE, '1',
+                max_age=settings.DATABASE_REPLICA_PIN_SECONDS,
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
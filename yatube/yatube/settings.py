@@ -20,8 +20,10 @@ ALLOWED_HOSTS = [
 
 INSTALLED_APPS = [
     'about',
+    'perf',
     'users',
     'posts',
+    'tasks',
     'django.contrib.admin',
     'django.contrib.auth',
     'django.contrib.contenttypes',
@@ -32,11 +34,14 @@ INSTALLED_APPS = [
 
 
 MIDDLEWARE = [
+    'perf.middleware.PerfMiddleware',
+    'yatube.compression.CompressionMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'yatube.replicas.PinPrimaryMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -58,6 +63,9 @@ TEMPLATES = [
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
             ],
+            'libraries': {
+                'static_bundles': 'yatube.templatetags.static_bundles',
+            },
         },
     },
 ]
@@ -65,6 +73,9 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'yatube.wsgi.application'
 
+# Потоки, в которых yatube.asgi выполняет синхронные представления.
+ASGI_THREADS = 16
+
 
 DATABASES = {
     'default': {
@@ -73,6 +84,79 @@ DATABASES = {
     }
 }
 
+# Алиасы реплик из DATABASES для чтения лент (см. yatube.replicas).
+DATABASE_REPLICAS = []
+DATABASE_REPLICA_PIN_SECONDS = 10
+DATABASE_ROUTERS = ['yatube.replicas.ReplicaRouter']
+
+
+# Кэш одного процесса — для runserver. check --deploy здесь честно
+# сообщает posts.E001: развёртывается settings_production с memcached.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+POSTS_FEED_CACHE_TIMEOUT = 60 * 5
+# Записи справочника групп (posts.groups) в общем кэше; актуальность
+# держит версия ленты группы, срок лишь освобождает память.
+POSTS_GROUPS_CACHE_TIMEOUT = 60 * 60
+
+# Авторам с большим числом подписчиков лента подписок собирается при
+# чтении, а не раскладывается при публикации.
+POSTS_FANOUT_FOLLOWER_LIMIT = 1000
+POSTS_FANOUT_BATCH_SIZE = 500
+
+# RSS/Atom/JSON-ленты: постов без ?limit, строк на выборку из курсора БД
+# и объём, после которого накопленный вывод уходит клиенту.
+POSTS_FEED_LIMIT = 50
+POSTS_FEED_CHUNK_SIZE = 500
+POSTS_FEED_FLUSH_SIZE = 16 * 1024
+
+# Фоновые задачи (tasks.queue): eager выполняет их сразу в запросе,
+# thread — в пуле потоков процесса, database — воркер manage.py run_tasks.
+TASKS_BACKEND = 'eager'
+TASKS_THREADS = 4
+TASKS_BATCH_SIZE = 100
+TASKS_MAX_ATTEMPTS = 5
+# задержка первого повтора, секунд; дальше удваивается
+TASKS_RETRY_DELAY = 2
+# через сколько секунд задачу упавшего воркера заберёт другой
+TASKS_LOCK_SECONDS = 300
+
+# JSON API: записей на страницу по умолчанию и предел для ?limit и ?ids,
+# постов в одном запросе /api/posts/batch/.
+POSTS_API_PAGE_SIZE = 20
+POSTS_API_MAX_PAGE_SIZE = 100
+POSTS_API_MAX_BATCH_SIZE = 500
+
+# Заголовок Server-Timing с разбивкой времени ответа (total, db, tpl).
+PERF_SERVER_TIMING = True
+
+# Ответы меньше порога не сжимаются: выигрыш съедают заголовки и CPU.
+# Степень сжатия и CPU на КБ видны в perf:stats (раздел compression).
+COMPRESSION_MIN_SIZE = 512
+COMPRESSION_GZIP_LEVEL = 6
+COMPRESSION_BROTLI_QUALITY = 5
+
+
+# Пользователь сессии из базы: кэш здесь у каждого процесса свой
+# (users.E002). settings_production с общим кэшем берёт его из кэша —
+# users.backends.CachedModelBackend.
+AUTHENTICATION_BACKENDS = ['django.contrib.auth.backends.ModelBackend']
+AUTH_USER_CACHE_TIMEOUT = 60
+
+# Стоимость хешеров users.hashers (включаются в settings_production).
+# scrypt: n — степень двойки, память на хеш 128 * n * r байт.
+PASSWORD_SCRYPT_N = 2 ** 14
+PASSWORD_SCRYPT_R = 8
+PASSWORD_SCRYPT_P = 1
+# argon2: проходы, память в КиБ, потоки
+PASSWORD_ARGON2_TIME_COST = 2
+PASSWORD_ARGON2_MEMORY_COST = 512
+PASSWORD_ARGON2_PARALLELISM = 2
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -105,6 +189,20 @@ STATIC_URL = '/static/'
 
 STATIC_ROOT = os.path.join(BASE_DIR, 'static')
 
+# Сборки для {% static_bundle %}: с STATIC_USE_BUNDLES страница грузит
+# один файл вместо нескольких (собирается при collectstatic).
+STATIC_BUNDLES = {
+    'bundles/yatube.css': ['bootstrap/dist/css/bootstrap.min.css'],
+    'bundles/yatube.js': [
+        'jquery/dist/jquery.min.js',
+        'bootstrap/dist/js/bootstrap.min.js',
+    ],
+}
+STATIC_USE_BUNDLES = False
+# Отдавать статику самим Django (yatube.staticfiles.serve), если перед
+# приложением нет nginx или CDN.
+SERVE_STATIC = False
+
 
 LOGIN_URL = '/auth/login/'
 LOGIN_REDIRECT_URL = 'index'
@@ -0,0 +1,133 @@
+"""Профиль для продакшена: постоянные соединения и реплики для чтения.
+
+    DJANGO_SETTINGS_MODULE=yatube.settings_production \
+    YATUBE_DB_NAME=/srv/yatube/primary.sqlite3 \
+    YATUBE_REPLICA_NAMES=/srv/yatube/replica1.sqlite3 \
+    gunicorn yatube.wsgi
+
+Для PostgreSQL движок задаётся через YATUBE_DB_ENGINE; пул соединений
+подключается тем же способом — бэкендом с пулом или pgbouncer перед
+базой, Django 2.2 своего пула не имеет.
+"""
+import os
+
+from .settings import *  # noqa: F401,F403
+from .settings import DATABASES, TEMPLATES
+
+DEBUG = False
+
+# Шаблоны разбираются один раз на процесс, а не на каждый запрос.
+TEMPLATES = [{
+    **TEMPLATES[0],
+    'APP_DIRS': False,
+    'OPTIONS': {
+        **TEMPLATES[0]['OPTIONS'],
+        'loaders': [(
+            'django.template.loaders.cached.Loader', [
+                'django.template.loaders.filesystem.Loader',
+                'django.template.loaders.app_directories.Loader',
+            ]
+        )],
+    },
+}]
+
+# Кэш общий для всех воркеров: в нём версии лент, по которым строятся
+# фрагменты и ETag (posts.E001), и поднимать их нужно атомарным incr
+# (posts.E002) — поэтому memcached. FileBasedCache не годится: его incr —
+# это get и set, а каждый set листает весь каталог кэша. locmem у каждого
+# процесса свой: check --deploy сообщит posts.E001, а сессии и
+# пользователь будут читаться из базы (см. ниже).
+CACHE_BACKENDS = {
+    'memcached': {
+        'BACKEND': 'django.core.cache.backends.memcached.MemcachedCache',
+        'LOCATION': '127.0.0.1:11211',
+    },
+    'locmem': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+}
+CACHES = {
+    'default': CACHE_BACKENDS[os.environ.get('YATUBE_CACHE', 'memcached')],
+}
+if os.environ.get('YATUBE_CACHE_LOCATION'):
+    CACHES['default']['LOCATION'] = os.environ['YATUBE_CACHE_LOCATION']
+
+# Хранилище сессий: cached_db читает сессию из кэша и пишет в обе
+# стороны; signed_cookies вообще не ходит в базу, но сессию нельзя
+# отозвать на сервере, а кука растёт вместе с её содержимым. С кэшем
+# одного процесса cached_db и кэш пользователя (users.backends) не
+# годятся: выход или смена пароля в одном воркере не дошли бы до копий
+# в других, поэтому по умолчанию тогда db и ModelBackend.
+SHARED_CACHE = CACHES['default']['BACKEND'] != (
+    'django.core.cache.backends.locmem.LocMemCache'
+)
+SESSION_ENGINES = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+}
+SESSION_ENGINE = SESSION_ENGINES[os.environ.get(
+    'YATUBE_SESSIONS', 'cached_db' if SHARED_CACHE else 'db'
+)]
+if SHARED_CACHE:
+    AUTHENTICATION_BACKENDS = ['users.backends.CachedModelBackend']
+
+# Хешер новых паролей: scrypt (hashlib) или argon2 (нужен argon2-cffi).
+# Остальные в списке только проверяют старые хеши; при входе такой хеш,
+# как и хеш с прежней стоимостью, пересчитывается выбранным хешером.
+PASSWORD_HASHER_CHOICES = {
+    'scrypt': 'users.hashers.ScryptPasswordHasher',
+    'argon2': 'users.hashers.TunedArgon2PasswordHasher',
+    'pbkdf2': 'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+}
+PASSWORD_HASHERS = [
+    PASSWORD_HASHER_CHOICES[os.environ.get('YATUBE_PASSWORD_HASHER', 'scrypt')]
+]
+PASSWORD_HASHERS += [
+    hasher for hasher in PASSWORD_HASHER_CHOICES.values()
+    if hasher not in PASSWORD_HASHERS
+]
+PASSWORD_SCRYPT_N = 2 ** int(os.environ.get('YATUBE_SCRYPT_LOG_N', 14))
+PASSWORD_ARGON2_TIME_COST = int(os.environ.get('YATUBE_ARGON2_TIME_COST', 2))
+PASSWORD_ARGON2_MEMORY_COST = int(
+    os.environ.get('YATUBE_ARGON2_MEMORY_COST', 512)
+)
+
+# побочные эффекты публикации выполняет manage.py run_tasks
+TASKS_BACKEND = os.environ.get('YATUBE_TASKS_BACKEND', 'database')
+
+STATICFILES_STORAGE = 'yatube.staticfiles.CompressedManifestStorage'
+STATIC_USE_BUNDLES = True
+SERVE_STATIC = os.environ.get('YATUBE_SERVE_STATIC') == '1'
+
+# соединение живёт между запросами вместо connect() на каждый запрос
+CONN_MAX_AGE = int(os.environ.get('YATUBE_CONN_MAX_AGE', 600))
+
+
+def database(name):
+    return {
+        # yatube.sqlite — SQLite с WAL и очередью записи
+        'ENGINE': os.environ.get('YATUBE_DB_ENGINE', 'yatube.sqlite'),
+        'NAME': name,
+        'USER': os.environ.get('YATUBE_DB_USER', ''),
+        'PASSWORD': os.environ.get('YATUBE_DB_PASSWORD', ''),
+        'HOST': os.environ.get('YATUBE_DB_HOST', ''),
+        'PORT': os.environ.get('YATUBE_DB_PORT', ''),
+        'CONN_MAX_AGE': CONN_MAX_AGE,
+    }
+
+
+DATABASES = {
+    'default': database(os.environ.get(
+        'YATUBE_DB_NAME', DATABASES['default']['NAME']
+    )),
+}
+DATABASE_REPLICAS = []
+for index, name in enumerate(
+    filter(None, os.environ.get('YATUBE_REPLICA_NAMES', '').split(',')), 1
+):
+    alias = f'replica{index}'
+    DATABASES[alias] = database(name)
+    # в тестах реплика — та же тестовая база, что и default
+    DATABASES[alias]['TEST'] = {'MIRROR': 'default'}
+    DATABASE_REPLICAS.append(alias)
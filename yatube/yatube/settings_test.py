@@ -0,0 +1,26 @@
+"""Профиль для тестов: manage.py test и pytest подключают его сами.
+
+PBKDF2 по умолчанию тратит сотни миллисекунд CPU на каждый
+create_user(password=...) и вход по паролю; стойкость хеша тестам не
+нужна, поэтому здесь MD5.
+"""
+import os
+
+from .settings import *  # noqa: F401,F403
+from .settings import BASE_DIR, DATABASES
+
+PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+# Процесс на ядро и схема тестовой базы из снимка (см. yatube.test_runner).
+TEST_RUNNER = 'yatube.test_runner.TestRunner'
+TEST_SCHEMA_CACHE_DIR = os.path.join(BASE_DIR, '.test-cache')
+
+# Вторая база для проверки чтения с реплики (posts.tests.test_replicas):
+# своя SQLite в памяти, нужна только тестам с databases = {..., 'replica'}.
+DATABASES = {
+    **DATABASES,
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.path.join(BASE_DIR, 'replica.sqlite3'),
+    },
+}
@@ -0,0 +1,45 @@
+"""SQLite с WAL и настроенными PRAGMA для небольших инсталляций.
+
+    'ENGINE': 'yatube.sqlite',
+    'OPTIONS': {'pragmas': {...}, 'write_queue': True},
+
+'pragmas' дополняют PRAGMAS и переопределяют совпавшие: чтобы отказаться
+от WAL, journal_mode задаётся явно. С 'write_queue' записи через
+yatube.sqlite.writer.serialized_write идут через один поток.
+"""
+from django.db.backends.sqlite3 import base
+
+PRAGMAS = {
+    # читатели не ждут писателя, писатель не ждёт читателей
+    'journal_mode': 'wal',
+    # в WAL fsync только на контрольной точке; при сбое питания
+    # теряются последние транзакции, но не целостность файла
+    'synchronous': 'normal',
+    'mmap_size': 256 * 1024 * 1024,
+    # отрицательное значение — в КБ, т.е. 64 МБ страничного кэша
+    'cache_size': -64 * 1024,
+    'temp_store': 'memory',
+    'busy_timeout': 5000,
+}
+
+OPTIONS = ('pragmas', 'write_queue')
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def __init__(self, settings_dict, *args, **kwargs):
+        super().__init__(settings_dict, *args, **kwargs)
+        options = self.settings_dict['OPTIONS']
+        self.pragmas = {**PRAGMAS, **options.get('pragmas', {})}
+        self.write_queue = options.get('write_queue', True)
+
+    def get_connection_params(self):
+        kwargs = super().get_connection_params()
+        for option in OPTIONS:
+            kwargs.pop(option, None)
+        return kwargs
+
+    def get_new_connection(self, conn_params):
+        connection = super().get_new_connection(conn_params)
+        for name, value in self.pragmas.items():
+            connection.execute(f'PRAGMA {name} = {value}')
+        return connection
@@ -0,0 +1,70 @@
+"""Запись в SQLite через один поток на процесс с повтором при блокировке.
+
+SQLite допускает одного писателя: параллельные транзакции из потоков
+запросов ждут друг друга и падают с «database is locked». Очередь
+выстраивает записи процесса в ряд, а повтор с экспоненциальной
+задержкой разбирается с писателями из других процессов.
+"""
+import contextvars
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import (
+    DEFAULT_DB_ALIAS, OperationalError, connections, transaction
+)
+
+RETRIES = 6
+BACKOFF = 0.02
+
+_writers = {}
+_writers_lock = threading.Lock()
+
+
+def is_locked(error):
+    message = str(error).lower()
+    return 'locked' in message or 'busy' in message
+
+
+def retry_locked(func, retries=RETRIES, backoff=BACKOFF):
+    for attempt in range(retries):
+        try:
+            return func()
+        except OperationalError as error:
+            if not is_locked(error) or attempt == retries - 1:
+                raise
+            time.sleep(backoff * 2 ** attempt * (1 + random.random()))
+
+
+def writer(using):
+    with _writers_lock:
+        if using not in _writers:
+            _writers[using] = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix=f'sqlite-writer-{using}'
+            )
+        return _writers[using]
+
+
+def atomic_call(func, using):
+    with transaction.atomic(using=using):
+        return func()
+
+
+def write_in_thread(func, using):
+    connections[using].close_if_unusable_or_obsolete()
+    return retry_locked(lambda: atomic_call(func, using))
+
+
+def serialized_write(func, using=DEFAULT_DB_ALIAS):
+    """Выполнить func() в транзакции на запись и вернуть результат."""
+    connection = connections[using]
+    if connection.in_atomic_block:
+        # внешняя транзакция уже держит соединение этого потока
+        return func()
+    if not getattr(connection, 'write_queue', False):
+        return retry_locked(lambda: atomic_call(func, using))
+    context = contextvars.copy_context()
+    return writer(using).submit(
+        context.run, write_in_thread, func, using
+    ).result()
@@ -0,0 +1,111 @@
+"""Статика с хешем в имени, сборками и заранее сжатыми копиями.
+
+collectstatic с CompressedManifestStorage:
+
+* склеивает файлы из STATIC_BUNDLES в один файл на сборку;
+* даёт всем файлам имена с хешем содержимого (ManifestStaticFilesStorage);
+* кладёт рядом с текстовыми файлами .gz и, если установлен brotli, .br.
+
+serve() отдаёт такие файлы со сжатой копией по Accept-Encoding и
+Cache-Control: immutable — имя меняется вместе с содержимым.
+"""
+import gzip
+import mimetypes
+import posixpath
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import (
+    ManifestStaticFilesStorage, staticfiles_storage
+)
+from django.core.files.base import ContentFile
+from django.views import static
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE = ('.css', '.js', '.svg', '.json', '.map', '.txt', '.xml')
+# меньше этого сжатие не окупает лишний файл и заголовки
+MIN_COMPRESS_SIZE = 256
+IMMUTABLE = 'public, max-age=31536000, immutable'
+
+
+def compressors():
+    yield '.gz', lambda data: gzip.compress(data, 9, mtime=0)
+    if brotli is not None:
+        yield '.br', lambda data: brotli.compress(data, quality=11)
+
+
+class CompressedManifestStorage(ManifestStaticFilesStorage):
+    def post_process(self, paths, dry_run=False, **options):
+        if not dry_run:
+            for bundle in self.build_bundles(paths):
+                paths[bundle] = (self, bundle)
+        yield from super().post_process(paths, dry_run, **options)
+        if not dry_run:
+            for name in self.hashed_files.values():
+                yield from self.compress(name)
+
+    def build_bundles(self, paths):
+        for bundle, sources in settings.STATIC_BUNDLES.items():
+            if not all(source in paths for source in sources):
+                # без исходников страница подключит файлы по одному
+                continue
+            parts = []
+            for source in sources:
+                storage, path = paths[source]
+                with storage.open(path) as source_file:
+                    parts.append(source_file.read())
+            separator = b';\n' if bundle.endswith('.js') else b'\n'
+            self.replace(bundle, separator.join(parts))
+            yield bundle
+
+    def compress(self, name):
+        if not name.endswith(COMPRESSIBLE):
+            return
+        with self.open(name) as original:
+            data = original.read()
+        if len(data) < MIN_COMPRESS_SIZE:
+            return
+        for suffix, compress in compressors():
+            compressed = compress(data)
+            if len(compressed) < len(data):
+                self.replace(name + suffix, compressed)
+                yield name, name + suffix, True
+
+    def replace(self, name, content):
+        if self.exists(name):
+            self.delete(name)
+        self._save(name, ContentFile(content))
+
+
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+
+def serve(request, path):
+    """Статика из STATIC_ROOT для развёртываний без nginx перед Django."""
+    path = posixpath.normpath(path).lstrip('/')
+    accepted = {
+        token.split(';')[0].strip()
+        for token in request.META.get('HTTP_ACCEPT_ENCODING', '').split(',')
+    }
+    for encoding, suffix in ENCODINGS:
+        if encoding in accepted and staticfiles_storage.exists(path + suffix):
+            break
+    else:
+        encoding = suffix = ''
+    response = static.serve(
+        request, path + suffix, document_root=settings.STATIC_ROOT
+    )
+    if encoding and response.status_code == 200:
+        # .br mimetypes знает не во всех версиях Python
+        response['Content-Type'] = (
+            mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        )
+        response['Content-Encoding'] = encoding
+    response['Vary'] = 'Accept-Encoding'
+    hashed_files = getattr(staticfiles_storage, 'hashed_files', {})
+    if path in hashed_files.values():
+        response['Cache-Control'] = IMMUTABLE
+    return response
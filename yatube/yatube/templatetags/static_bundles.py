@@ -0,0 +1,39 @@
+from django import template
+from django.conf import settings
+from django.templatetags.static import static
+from django.utils.html import format_html_join
+
+register = template.Library()
+
+TAGS = {
+    '.css': '<link rel="stylesheet" href="{}">',
+    '.js': '<script src="{}"></script>',
+}
+
+
+def source_url(name):
+    try:
+        return static(name)
+    except ValueError:
+        # файла нет в манифесте (не было при collectstatic): страница
+        # должна открыться и без него, как с обычным хранилищем
+        return settings.STATIC_URL + name
+
+
+def bundle_urls(bundle):
+    if settings.STATIC_USE_BUNDLES:
+        try:
+            return [static(bundle)]
+        except ValueError:
+            # сборки нет: её исходники не нашлись при collectstatic
+            pass
+    return [source_url(source) for source in settings.STATIC_BUNDLES[bundle]]
+
+
+@register.simple_tag
+def static_bundle(bundle):
+    """Теги <link>/<script> для сборки из STATIC_BUNDLES."""
+    tag = TAGS[bundle[bundle.rindex('.'):]]
+    return format_html_join(
+        '\n', tag, ((url,) for url in bundle_urls(bundle))
+    )
@@ -0,0 +1,145 @@
+"""Запуск тестов: процесс на ядро и схема БД из снимка вместо migrate.
+
+manage.py test по умолчанию запускает default_test_processes() процессов
+(DJANGO_TEST_PROCESSES или число ядер); --parallel 1 — последовательно.
+Тестовая SQLite живёт в памяти, и у каждого процесса своя копия: fork
+копирует базу вместе с процессом.
+
+Дольше всего при старте идут миграции пустой базы. После первого
+запуска готовая схема сохраняется в TEST_SCHEMA_CACHE_DIR файлом с
+хешем миграций в имени, и следующие запуски копируют её в память
+(sqlite3 backup), а не мигрируют заново. Изменённая или новая миграция
+меняет хеш (как и правка DDL полнотекстового поиска), и снимок
+строится снова; --fresh-db строит его всегда.
+pytest пользуется тем же снимком через schema_snapshots() (tests/conftest.py).
+"""
+import hashlib
+import os
+import sqlite3
+import sys
+from contextlib import closing, contextmanager
+
+import django
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connections
+from django.db.migrations.loader import MigrationLoader
+from django.test.runner import DiscoverRunner, default_test_processes
+
+
+def migrations_hash():
+    """Хеш исходников всех миграций проекта, версии Django и DDL поиска.
+
+    Миграции ставят полнотекстовый индекс из posts.search.FTS_SQL, а не
+    из своего текста: правка этого SQL тоже должна пересобрать снимок.
+    """
+    from posts.search import FTS_SQL
+
+    digest = hashlib.sha1(django.get_version().encode())
+    for statement in FTS_SQL:
+        digest.update(statement.encode())
+    loader = MigrationLoader(None, ignore_no_migrations=True)
+    for key in sorted(loader.disk_migrations):
+        module = sys.modules[type(loader.disk_migrations[key]).__module__]
+        digest.update(repr(key).encode())
+        with open(module.__file__, 'rb') as source:
+            digest.update(source.read())
+    return digest.hexdigest()[:12]
+
+
+def uses_memory_db(connection):
+    creation = connection.creation
+    return connection.vendor == 'sqlite' and creation.is_in_memory_db(
+        creation._get_test_db_name()
+    )
+
+
+def save_snapshot(connection, path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    prefix = f'{connection.alias}-'
+    for name in os.listdir(os.path.dirname(path)):
+        if name.startswith(prefix):
+            os.remove(os.path.join(os.path.dirname(path), name))
+    # через временный файл: параллельный запуск не прочтёт половину
+    partial = f'{path}.{os.getpid()}'
+    with closing(sqlite3.connect(partial)) as target:
+        connection.connection.backup(target)
+    os.replace(partial, path)
+
+
+def restore_snapshot(connection, path, serialize):
+    """То же, что create_test_db() с migrate, но схема — из снимка."""
+    name = connection.creation._get_test_db_name()
+    connection.close()
+    settings.DATABASES[connection.alias]['NAME'] = name
+    connection.settings_dict['NAME'] = name
+    connection.ensure_connection()
+    with closing(sqlite3.connect(path)) as source:
+        source.backup(connection.connection)
+    if serialize:
+        connection._test_serialized_contents = (
+            connection.creation.serialize_db_to_string()
+        )
+    call_command('createcachetable', database=connection.alias)
+    return name
+
+
+def snapshot_creator(connection, key):
+    create_test_db = connection.creation.create_test_db
+    path = os.path.join(
+        settings.TEST_SCHEMA_CACHE_DIR, f'{connection.alias}-{key}.sqlite3'
+    )
+
+    def create(verbosity=1, autoclobber=False, serialize=True,
+               keepdb=False):
+        if os.path.exists(path):
+            return restore_snapshot(connection, path, serialize)
+        name = create_test_db(verbosity, autoclobber, serialize, keepdb)
+        save_snapshot(connection, path)
+        return name
+    return create
+
+
+@contextmanager
+def schema_snapshots(fresh=False):
+    """Подменить create_test_db у баз SQLite в памяти на время входа."""
+    aliases = [
+        alias for alias in connections if uses_memory_db(connections[alias])
+    ]
+    if not settings.TEST_SCHEMA_CACHE_DIR or not aliases:
+        yield
+        return
+    key = migrations_hash()
+    for alias in aliases:
+        creation = connections[alias].creation
+        if fresh:
+            path = os.path.join(
+                settings.TEST_SCHEMA_CACHE_DIR, f'{alias}-{key}.sqlite3'
+            )
+            if os.path.exists(path):
+                os.remove(path)
+        creation.create_test_db = snapshot_creator(connections[alias], key)
+    try:
+        yield
+    finally:
+        for alias in aliases:
+            del connections[alias].creation.create_test_db
+
+
+class TestRunner(DiscoverRunner):
+    def __init__(self, fresh_db=False, **kwargs):
+        super().__init__(**kwargs)
+        self.fresh_db = fresh_db
+
+    @classmethod
+    def add_arguments(cls, parser):
+        super().add_arguments(parser)
+        parser.set_defaults(parallel=default_test_processes())
+        parser.add_argument(
+            '--fresh-db', action='store_true',
+            help='Мигрировать тестовую базу заново, а не брать снимок схемы.'
+        )
+
+    def setup_databases(self, **kwargs):
+        with schema_snapshots(self.fresh_db):
+            return super().setup_databases(**kwargs)
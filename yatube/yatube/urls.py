@@ -1,5 +1,8 @@
+from django.conf import settings
 from django.contrib import admin
-from django.urls import include, path
+from django.urls import include, path, re_path
+
+from .staticfiles import serve
 
 urlpatterns = [
     path('', include('posts.urls')),
@@ -7,4 +10,11 @@ urlpatterns = [
     path('auth/', include('django.contrib.auth.urls')),
     path('admin/', admin.site.urls),
     path('about/', include('about.urls', namespace='about')),
+    path('perf/', include('perf.urls', namespace='perf')),
 ]
+
+if settings.SERVE_STATIC:
+    # до posts: его <username>/<post_id>/ перехватил бы пути статики
+    urlpatterns.insert(0, re_path(
+        r'^%s(?P<path>.*)$' % settings.STATIC_URL.lstrip('/'), serve
+    ))